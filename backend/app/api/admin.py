@@ -4,14 +4,23 @@ Admin API — 문서유형/케이스유형/룰 관리.
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import io
+import json
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.document_type import DocumentType
 from app.models.case_type import CaseType, CaseTag
 from app.models.rule import Rule
 from app.models.audit_log import AuditLog
+from app.engine.rule_snapshot import apply_rule_change, invalidate_rule_set, read_generation, stage_compiled
+from app.engine.rule_validation import CheckedCondition, RuleValidationError, validate_rule
+from app.api.response_cache import admin_cache, conditional_response
+from app.seed.matrix_importer import apply_import, plan_import
 from app.schemas.admin import (
     DocumentTypeOut,
     DocumentTypeUpdate,
@@ -20,15 +29,30 @@ from app.schemas.admin import (
     RuleCreate,
     RuleUpdate,
 )
+from app.profiling import ProfiledRoute
+
+router = APIRouter(prefix="/admin", route_class=ProfiledRoute)
+
+# 조회 응답은 admin_cache 에 직렬화된 상태로 보관하고, 쓰기 핸들러가 커밋 후 무효화한다.
+# rules / document_types 는 다른 프로세스의 쓰기도 보이도록 rule_set_generation 세대를 version 으로 넘긴다.
+_document_types_json = TypeAdapter(list[DocumentTypeOut])
+_case_types_json = TypeAdapter(list[CaseTypeOut])
+_rules_json = TypeAdapter(list[RuleOut])
+
 
-router = APIRouter(prefix="/admin")
+def _dump(adapter: TypeAdapter, rows: list) -> bytes:
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
 
 
 # ── Document Types ──
 
 @router.get("/document-types", response_model=list[DocumentTypeOut])
-def list_document_types(db: Session = Depends(get_db)):
-    return db.query(DocumentType).order_by(DocumentType.category, DocumentType.code).all()
+def list_document_types(request: Request, db: Session = Depends(get_read_db)):
+    entry = admin_cache.get("document_types", "list", lambda: _dump(
+        _document_types_json,
+        db.query(DocumentType).order_by(DocumentType.category, DocumentType.code).all(),
+    ), version=read_generation(db))
+    return conditional_response(request, entry)
 
 
 @router.patch("/document-types/{doc_id}", response_model=DocumentTypeOut)
@@ -39,6 +63,7 @@ def update_document_type(doc_id: int, update: DocumentTypeUpdate, db: Session =
     for k, v in update.model_dump(exclude_unset=True).items():
         setattr(dt, k, v)
     db.commit()
+    admin_cache.invalidate("document_types")
     db.refresh(dt)
     return dt
 
@@ -46,26 +71,53 @@ def update_document_type(doc_id: int, update: DocumentTypeUpdate, db: Session =
 # ── Case Types ──
 
 @router.get("/case-types", response_model=list[CaseTypeOut])
-def list_case_types(db: Session = Depends(get_db)):
-    return db.query(CaseType).order_by(CaseType.code).all()
+def list_case_types(request: Request, db: Session = Depends(get_read_db)):
+    entry = admin_cache.get("case_types", "list", lambda: _dump(
+        _case_types_json,
+        db.query(CaseType).order_by(CaseType.code).all(),
+    ))
+    return conditional_response(request, entry)
 
 
 @router.get("/case-tags")
-def list_case_tags(db: Session = Depends(get_db)):
-    tags = db.query(CaseTag).order_by(CaseTag.code).all()
-    return [{"id": t.id, "code": t.code, "name": t.name} for t in tags]
+def list_case_tags(request: Request, db: Session = Depends(get_read_db)):
+    def build() -> bytes:
+        tags = db.query(CaseTag).order_by(CaseTag.code).all()
+        return json.dumps(
+            [{"id": t.id, "code": t.code, "name": t.name} for t in tags],
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8")
+    return conditional_response(request, admin_cache.get("case_tags", "list", build))
 
 
 # ── Rules ──
 
 @router.get("/rules", response_model=list[RuleOut])
-def list_rules(db: Session = Depends(get_db)):
-    return db.query(Rule).order_by(Rule.priority, Rule.id).all()
+def list_rules(request: Request, db: Session = Depends(get_read_db)):
+    entry = admin_cache.get("rules", "list", lambda: _dump(
+        _rules_json,
+        db.query(Rule).order_by(Rule.priority, Rule.id).all(),
+    ), version=read_generation(db))
+    return conditional_response(request, entry)
+
+
+def _validated(db: Session, values: dict) -> CheckedCondition | None:
+    """룰 본문을 검증하고 conditions_json 을 정규화한다. 문제가 있으면 422."""
+    known_codes = [code for (code,) in db.query(DocumentType.code).all()]
+    try:
+        checked = validate_rule(values, known_codes)
+    except RuleValidationError as exc:
+        raise HTTPException(422, {"errors": exc.problems}) from None
+    if checked is not None:
+        values["conditions_json"] = checked.canonical_json
+    return checked
 
 
 @router.post("/rules", response_model=RuleOut)
 def create_rule(body: RuleCreate, db: Session = Depends(get_db)):
-    rule = Rule(**body.model_dump())
+    values = body.model_dump()
+    checked = _validated(db, values)
+    rule = Rule(**values)
     db.add(rule)
     db.flush()
     # Audit
@@ -77,6 +129,9 @@ def create_rule(body: RuleCreate, db: Session = Depends(get_db)):
         reason="관리자가 새 룰을 생성했습니다.",
     ))
     db.commit()
+    stage_compiled(rule.id, checked.condition, checked.node)
+    apply_rule_change(db, rule.id)
+    admin_cache.invalidate("rules")
     db.refresh(rule)
     return rule
 
@@ -86,7 +141,9 @@ def update_rule(rule_id: int, body: RuleUpdate, db: Session = Depends(get_db)):
     rule = db.query(Rule).get(rule_id)
     if not rule:
         raise HTTPException(404, "Rule not found")
-    for k, v in body.model_dump(exclude_unset=True).items():
+    values = body.model_dump(exclude_unset=True)
+    checked = _validated(db, values)
+    for k, v in values.items():
         setattr(rule, k, v)
     db.flush()
     # Audit
@@ -98,6 +155,10 @@ def update_rule(rule_id: int, body: RuleUpdate, db: Session = Depends(get_db)):
         reason="관리자가 룰을 수정했습니다.",
     ))
     db.commit()
+    if checked is not None:
+        stage_compiled(rule.id, checked.condition, checked.node)
+    apply_rule_change(db, rule.id)
+    admin_cache.invalidate("rules")
     db.refresh(rule)
     return rule
 
@@ -115,4 +176,32 @@ def delete_rule(rule_id: int, db: Session = Depends(get_db)):
     ))
     db.delete(rule)
     db.commit()
+    apply_rule_change(db, rule_id)
+    admin_cache.invalidate("rules")
     return {"status": "deleted"}
+
+
+# ── Requirement Matrix Import ──
+
+@router.post("/import/matrix")
+def import_matrix(
+    workbook: bytes = Body(..., media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    dry_run: bool = False,
+    prune: bool = False,
+    filename: str = "upload.xlsx",
+    actor_id: int | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    구비서류 매트릭스 XLSX 를 본문(raw bytes)으로 받아 서류유형/룰에 일괄 반영한다.
+    dry_run 이면 변경 내역만 반환한다. 검증 오류가 있으면 아무것도 반영하지 않고 422.
+    """
+    report, plan = plan_import(db, io.BytesIO(workbook), prune=prune, name=filename)
+    if not report.ok:
+        return JSONResponse(status_code=422, content=report.to_dict())
+    if not dry_run:
+        apply_import(db, report, plan, actor_id=actor_id)
+        if report.applied:
+            invalidate_rule_set()
+            admin_cache.invalidate("rules", "document_types")
+    return report.to_dict()
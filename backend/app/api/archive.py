@@ -0,0 +1,42 @@
+"""
+Archive API — 판정 아카이브 상태 조회 / 백그라운드 실행 (app.archive)
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.archive import archive, job_status, start_background
+from app.database import get_read_db
+
+router = APIRouter(prefix="/admin/archive")
+
+
+@router.get("")
+def archive_status(db: Session = Depends(get_read_db)):
+    """파티션 목록과 마지막 실행 결과."""
+    return {
+        "job": job_status(),
+        "partitions": [
+            {
+                "month": p.month,
+                "request_count": p.request_count,
+                "audit_count": p.audit_count,
+                "min_request_id": p.min_request_id,
+                "max_request_id": p.max_request_id,
+                "first_created_at": p.first_created_at.isoformat() if p.first_created_at else None,
+                "last_created_at": p.last_created_at.isoformat() if p.last_created_at else None,
+                "compacted_at": p.compacted_at.isoformat() if p.compacted_at else None,
+            }
+            for p in archive.partitions(db)
+        ],
+    }
+
+
+@router.post("/run", status_code=202)
+def run_archive(limit: int | None = None, batch: int | None = None):
+    """대상 판정을 배치 단위로 아카이브에 옮기는 작업을 백그라운드로 시작한다."""
+    if not start_background(limit=limit, batch=batch):
+        raise HTTPException(409, "Archive job already running")
+    return job_status()
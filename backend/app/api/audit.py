@@ -7,11 +7,13 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.archive import archive
+from app.database import get_read_db
 from app.models.audit_log import AuditLog
 from app.schemas.admin import AuditLogOut
+from app.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
 @router.get("/audit-logs", response_model=list[AuditLogOut])
@@ -20,25 +22,29 @@ def list_audit_logs(
     target_type: str | None = None,
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    q = db.query(AuditLog)
-    if event_type:
-        q = q.filter(AuditLog.event_type == event_type)
-    if target_type:
-        q = q.filter(AuditLog.target_type == target_type)
-    rows = q.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
-    return [
-        AuditLogOut(
-            id=r.id,
-            event_type=r.event_type,
-            actor_id=r.actor_id,
-            target_type=r.target_type,
-            target_id=r.target_id,
-            old_value=r.old_value,
-            new_value=r.new_value,
-            reason=r.reason,
-            created_at=r.created_at.isoformat() if r.created_at else "",
-        )
-        for r in rows
-    ]
+    def query(session: Session):
+        q = session.query(AuditLog)
+        if event_type:
+            q = q.filter(AuditLog.event_type == event_type)
+        if target_type:
+            q = q.filter(AuditLog.target_type == target_type)
+        return q.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+
+    # 아카이브된 판정의 감사 로그까지 포함
+    return archive.latest(db, query, _audit_out, skip, limit)
+
+
+def _audit_out(r: AuditLog) -> AuditLogOut:
+    return AuditLogOut(
+        id=r.id,
+        event_type=r.event_type,
+        actor_id=r.actor_id,
+        target_type=r.target_type,
+        target_id=r.target_id,
+        old_value=r.old_value,
+        new_value=r.new_value,
+        reason=r.reason,
+        created_at=r.created_at.isoformat() if r.created_at else "",
+    )
@@ -0,0 +1,355 @@
+"""
+Checklist API — 서류 접수 원장 (§9, §18)
+판정 결과의 요구 서류를 요청별 체크리스트로 펼쳐 두고, 접수/철회 델타만큼만
+카운터를 갱신한다. 판정 엔진은 다시 실행하지 않는다.
+
+- 체크리스트는 판정 저장과 같은 트랜잭션에서 생성 (`create_checklist`, determine).
+  체크리스트 없이 저장된 판정(이전 버전·일괄 재심사)은 첫 접수 때 `INSERT ... ON CONFLICT DO NOTHING`
+  으로 만들고, 조회는 저장하지 않고 판정 결과로 펼쳐 보여 준다 (조회는 읽기 전용)
+- 갱신 비용은 변경된 서류 수에 비례 (해당 서류 행 + 영향받은 그룹 행만 조회)
+- 완결 여부가 바뀌면 NEEDS_SUPPLEMENT ↔ READY_FOR_REVIEW 상태 전이
+- 동시 접수: 서류 행은 조건부 UPDATE(received_at IS NULL / IS NOT NULL)로 실제로 바꾼 행만 세고,
+  카운터는 읽어서 다시 쓰지 않고 SQL 식(`outstanding_required = outstanding_required - :n`)으로 갱신한다
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.database import get_db, get_read_db
+from app.enums import RequestStatus
+from app.models.account_request import AccountRequest
+from app.models.audit_log import AuditLog
+from app.models.document_checklist import ChecklistGroup, ChecklistItem, DocumentChecklist
+from app.rollups import record_status_change
+from app.schemas.checklist import (
+    ChecklistGroupOut,
+    ChecklistItemOut,
+    ChecklistOut,
+    ChecklistUpdateOut,
+    DocumentSubmissionRequest,
+)
+from app.profiling import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+REQUIRED = "REQUIRED"
+OPTIONAL = "OPTIONAL"
+GROUP = "GROUP"
+EXTRA = "EXTRA"
+
+# 완결 여부 변화에 따른 상태 전이. 그 외 상태(BLOCKED, ESCALATION_REQUIRED 등)는 유지.
+_ON_COMPLETE = {RequestStatus.NEEDS_SUPPLEMENT.value: RequestStatus.READY_FOR_REVIEW.value}
+_ON_INCOMPLETE = {RequestStatus.READY_FOR_REVIEW.value: RequestStatus.NEEDS_SUPPLEMENT.value}
+
+
+# ── 체크리스트 생성 ──
+
+def _build(acct_req: AccountRequest) -> tuple[DocumentChecklist, list[ChecklistItem], list[ChecklistGroup]]:
+    """저장된 판정 결과(determination_result_json)로 체크리스트 행을 만든다 (세션에는 넣지 않음)."""
+    result = json.loads(acct_req.determination_result_json or "{}")
+    items = [
+        ChecklistItem(account_request_id=acct_req.id, document_code=code, requirement=REQUIRED)
+        for code in result.get("required_documents", [])
+    ]
+    items += [
+        ChecklistItem(account_request_id=acct_req.id, document_code=code, requirement=OPTIONAL)
+        for code in result.get("optional_documents", [])
+    ]
+    groups = []
+    for g in result.get("document_groups", []):
+        groups.append(ChecklistGroup(
+            account_request_id=acct_req.id,
+            group_code=g["group_code"],
+            min_required=g.get("min_required", 1),
+            received_count=0,
+            description=g.get("description"),
+        ))
+        items += [
+            ChecklistItem(
+                account_request_id=acct_req.id, document_code=code,
+                requirement=GROUP, group_code=g["group_code"],
+            )
+            for code in g.get("documents", [])
+        ]
+    checklist = DocumentChecklist(
+        account_request_id=acct_req.id,
+        outstanding_required=sum(1 for i in items if i.requirement == REQUIRED),
+        unsatisfied_groups=sum(1 for g in groups if g.min_required > 0),
+    )
+    return checklist, items, groups
+
+
+def create_checklist(db: Session, acct_req: AccountRequest) -> None:
+    """새 판정의 체크리스트를 만든다 (커밋은 호출자 — 판정 저장과 같은 트랜잭션)."""
+    checklist, items, groups = _build(acct_req)
+    db.add(checklist)
+    db.add_all(items)
+    db.add_all(groups)
+
+
+def _insert_ignore(db: Session):
+    """방언별 `INSERT ... ON CONFLICT DO NOTHING` 문. 지원하지 않는 DB 면 None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert(DocumentChecklist).on_conflict_do_nothing(index_elements=["account_request_id"])
+
+
+def _get_request(db: Session, request_id: int) -> AccountRequest:
+    acct_req = db.query(AccountRequest).filter_by(id=request_id).first()
+    if not acct_req:
+        raise HTTPException(404, "Request not found")
+    return acct_req
+
+
+def _get_checklist(db: Session, acct_req: AccountRequest) -> DocumentChecklist:
+    """
+    체크리스트를 돌려준다. 없으면(체크리스트 없이 저장된 판정) 만든다 — 동시 첫 접수는
+    ON CONFLICT DO NOTHING 으로 한쪽만 행을 넣고, 나머지는 그 행을 다시 읽는다.
+    """
+    checklist = db.query(DocumentChecklist).filter_by(account_request_id=acct_req.id).first()
+    if checklist is not None:
+        return checklist
+    checklist, items, groups = _build(acct_req)
+    stmt = _insert_ignore(db)
+    if stmt is None:
+        db.add(checklist)
+        db.add_all(items)
+        db.add_all(groups)
+        db.flush()
+        return checklist
+    values = {
+        "account_request_id": acct_req.id,
+        "outstanding_required": checklist.outstanding_required,
+        "unsatisfied_groups": checklist.unsatisfied_groups,
+    }
+    if db.execute(stmt.values(**values)).rowcount:
+        db.add_all(items)
+        db.add_all(groups)
+        db.flush()
+    return db.query(DocumentChecklist).filter_by(account_request_id=acct_req.id).one()
+
+
+def _mark(db: Session, rows: list[ChecklistItem], received: bool, now: datetime, actor_id: int | None) -> set[int]:
+    """
+    rows 를 접수(received=True)/철회 처리하고 실제로 바뀐 행 id 를 돌려준다.
+    조건부 UPDATE 라 동시 요청이 같은 행을 바꾸면 한쪽만 센다.
+    """
+    if not rows:
+        return set()
+    pending = ChecklistItem.received_at.is_(None) if received else ChecklistItem.received_at.is_not(None)
+    values = {"received_at": now, "received_by": actor_id} if received else {"received_at": None, "received_by": None}
+    stmt = (
+        update(ChecklistItem)
+        .where(ChecklistItem.id.in_([r.id for r in rows]), pending)
+        .values(**values)
+        .returning(ChecklistItem.id)
+        .execution_options(synchronize_session=False)
+    )
+    won = set(db.execute(stmt).scalars())
+    for row in rows:
+        if row.id in won:
+            for key, value in values.items():
+                set_committed_value(row, key, value)
+    return won
+
+
+def _item_out(item: ChecklistItem) -> ChecklistItemOut:
+    return ChecklistItemOut(
+        document_code=item.document_code,
+        requirement=item.requirement,
+        group_code=item.group_code,
+        received=item.received_at is not None,
+        received_at=item.received_at,
+    )
+
+
+def _group_out(group: ChecklistGroup) -> ChecklistGroupOut:
+    return ChecklistGroupOut(
+        group_code=group.group_code,
+        min_required=group.min_required,
+        received_count=group.received_count,
+        satisfied=group.satisfied,
+        description=group.description,
+    )
+
+
+# ── Endpoints ──
+
+@router.get("/requests/{request_id}/checklist", response_model=ChecklistOut)
+def get_checklist(request_id: int, db: Session = Depends(get_read_db)):
+    """요청의 서류 접수 현황."""
+    acct_req = _get_request(db, request_id)
+    checklist = db.query(DocumentChecklist).filter_by(account_request_id=request_id).first()
+    if checklist is None:
+        # 아직 체크리스트가 없는 판정 — 저장하지 않고 판정 결과로 펼친 빈 원장을 보여 준다
+        checklist, items, groups = _build(acct_req)
+    else:
+        items = db.query(ChecklistItem).filter_by(account_request_id=request_id).order_by(ChecklistItem.id).all()
+        groups = db.query(ChecklistGroup).filter_by(account_request_id=request_id).order_by(ChecklistGroup.id).all()
+    return ChecklistOut(
+        request_id=request_id,
+        status=acct_req.status,
+        outstanding_required=checklist.outstanding_required,
+        unsatisfied_groups=checklist.unsatisfied_groups,
+        complete=checklist.complete,
+        items=[_item_out(i) for i in items],
+        groups=[_group_out(g) for g in groups],
+    )
+
+
+@router.post("/requests/{request_id}/documents", response_model=ChecklistUpdateOut)
+def submit_documents(request_id: int, req: DocumentSubmissionRequest, db: Session = Depends(get_db)):
+    """서류 접수/철회를 반영하고 미충족 카운터와 상태를 증분 갱신한다."""
+    received = list(dict.fromkeys(req.received))
+    withdrawn = list(dict.fromkeys(req.withdrawn))
+    overlap = set(received) & set(withdrawn)
+    if overlap:
+        raise HTTPException(422, f"Documents both received and withdrawn: {sorted(overlap)}")
+
+    acct_req = _get_request(db, request_id)
+    checklist = _get_checklist(db, acct_req)
+
+    codes = received + withdrawn
+    items = (
+        db.query(ChecklistItem)
+        .filter(ChecklistItem.account_request_id == request_id, ChecklistItem.document_code.in_(codes))
+        .all()
+    ) if codes else []
+    by_code: dict[str, list[ChecklistItem]] = {}
+    for item in items:
+        by_code.setdefault(item.document_code, []).append(item)
+
+    now = datetime.utcnow()
+    changed: list[ChecklistItem] = []
+    ignored: list[str] = []
+
+    for code in received:
+        if code not in by_code:
+            # 요구 목록 밖의 서류도 원장에는 남긴다
+            extra = ChecklistItem(
+                account_request_id=request_id, document_code=code, requirement=EXTRA,
+                received_at=now, received_by=req.actor_id,
+            )
+            db.add(extra)
+            changed.append(extra)
+    # 원장에 없는 서류는 철회할 것이 없다 — 무시 목록으로 돌려주고 감사 로그에도 남기지 않는다
+    ignored.extend(code for code in withdrawn if code not in by_code)
+    receiving = [r for code in received for r in by_code.get(code, ()) if r.received_at is None]
+    withdrawing = [r for code in withdrawn for r in by_code.get(code, ()) if r.received_at is not None]
+    won = _mark(db, receiving, True, now, req.actor_id) | _mark(db, withdrawing, False, now, req.actor_id)
+
+    required_delta = 0
+    group_delta: dict[str, int] = {}
+    for requested, rows, sign in ((received, receiving, -1), (withdrawn, withdrawing, 1)):
+        for code in requested:
+            if code in by_code and not any(r.id in won for r in by_code[code]):
+                ignored.append(code)  # 이미 접수됨 / 접수된 적 없음 (또는 동시 요청이 먼저 반영)
+        for row in rows:
+            if row.id not in won:
+                continue
+            changed.append(row)
+            if row.requirement == REQUIRED:
+                required_delta += sign
+            elif row.requirement == GROUP:
+                group_delta[row.group_code] = group_delta.get(row.group_code, 0) - sign
+
+    # ── 카운터: SQL 식으로 델타 적용 ──
+    group_delta = {code: d for code, d in group_delta.items() if d}
+    for code, delta in group_delta.items():
+        db.execute(
+            update(ChecklistGroup)
+            .where(ChecklistGroup.account_request_id == request_id, ChecklistGroup.group_code == code)
+            .values(received_count=ChecklistGroup.received_count + delta)
+        )
+    counters = {}
+    if required_delta:
+        counters["outstanding_required"] = DocumentChecklist.outstanding_required + required_delta
+    if group_delta:
+        counters["unsatisfied_groups"] = (
+            select(func.count())
+            .where(
+                ChecklistGroup.account_request_id == request_id,
+                ChecklistGroup.received_count < ChecklistGroup.min_required,
+            )
+            .scalar_subquery()
+        )
+    if counters:
+        db.execute(
+            update(DocumentChecklist)
+            .where(DocumentChecklist.account_request_id == request_id)
+            .values(**counters)
+            .execution_options(synchronize_session=False)
+        )
+
+    # 쓰기 잠금을 잡은 뒤의 최신 값 — 완결 여부 변화는 이 요청의 델타만큼 되돌려 판단한다
+    db.flush()
+    db.refresh(checklist)
+    db.refresh(acct_req)
+    groups = (
+        db.query(ChecklistGroup)
+        .populate_existing()
+        .filter(ChecklistGroup.account_request_id == request_id, ChecklistGroup.group_code.in_(list(group_delta)))
+        .all()
+    ) if group_delta else []
+    unsatisfied_before = checklist.unsatisfied_groups + sum(
+        (g.received_count - group_delta[g.group_code] < g.min_required) - (not g.satisfied) for g in groups
+    )
+    was_complete = checklist.outstanding_required - required_delta == 0 and unsatisfied_before == 0
+    previous_status = acct_req.status
+
+    # ── 상태 전이 ──
+    is_complete = checklist.complete
+    if is_complete != was_complete:
+        transitions = _ON_COMPLETE if is_complete else _ON_INCOMPLETE
+        acct_req.status = transitions.get(acct_req.status, acct_req.status)
+
+    if changed:
+        db.add(AuditLog(
+            event_type="DOCUMENTS_UPDATED",
+            actor_id=req.actor_id,
+            target_type="account_request",
+            target_id=request_id,
+            new_value=json.dumps({
+                "received": [c for c in received if c not in ignored],
+                "withdrawn": [c for c in withdrawn if c not in ignored],
+                "outstanding_required": checklist.outstanding_required,
+                "unsatisfied_groups": checklist.unsatisfied_groups,
+            }, ensure_ascii=False),
+            reason=req.reason,
+        ))
+    if acct_req.status != previous_status:
+        record_status_change(db, acct_req, previous_status, acct_req.status)
+        db.add(AuditLog(
+            event_type="STATUS_CHANGED",
+            actor_id=req.actor_id,
+            target_type="account_request",
+            target_id=request_id,
+            old_value=previous_status,
+            new_value=acct_req.status,
+            reason="서류 접수 현황 변경",
+        ))
+    db.commit()
+
+    return ChecklistUpdateOut(
+        request_id=request_id,
+        previous_status=previous_status,
+        status=acct_req.status,
+        outstanding_required=checklist.outstanding_required,
+        unsatisfied_groups=checklist.unsatisfied_groups,
+        complete=is_complete,
+        changed_items=[_item_out(i) for i in changed],
+        changed_groups=[_group_out(g) for g in groups],
+        ignored=ignored,
+    )
@@ -6,42 +6,43 @@ Determination API — POST /api/v1/determine
 from __future__ import annotations
 
 import json
+import random
 from datetime import datetime
+from functools import lru_cache
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.archive import archive
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.schemas.determination import (
+    DeterminationInput,
     DeterminationRequest,
     DeterminationResponse,
-    DocumentGroupResponse,
     AccountRequestSummary,
 )
-from app.engine.case_classifier import classify_case
-from app.engine.rule_engine import evaluate_rules, compile_determination
-from app.engine.document_resolver import resolve_documents
-from app.models.rule import Rule
+from app.api.response_cache import CachedResponse, conditional_response
+from app.engine.bundle import build_bundle
+from app.engine.pipeline import run_determination, run_traced_determination
+from app.engine.result_codec import EncodedResult, dumps, result_payload
+from app.engine.rule_compiler import CompiledRuleSet
+from app.engine.rule_snapshot import get_rule_set
+from app.customers import upsert_customer
 from app.models.customer import Customer
 from app.models.account_request import AccountRequest
 from app.models.audit_log import AuditLog
 from app.enums import BusinessStatus
+from app.rollups import branch_of, record_determination
+from app.api.checklist import create_checklist
+from app.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 
-@router.post("/determine", response_model=DeterminationResponse)
-def determine(req: DeterminationRequest, db: Session = Depends(get_db)):
-    """
-    법인 계좌개설 서류 판정.
-    1. 입력 컨텍스트 구성
-    2. 케이스 분류 (case_classifier)
-    3. DB 룰 평가 (rule_engine)
-    4. 서류 패키지 보완 (document_resolver — fallback)
-    5. 결과 반환 + DB 저장 + 감사 로그
-    """
-    # ── 1. 컨텍스트 구성 ──
-    context = {
+def build_context(req: DeterminationInput) -> dict:
+    """요청 본문 → 엔진 컨텍스트."""
+    return {
         "customer_type": req.customer_type.value,
         "account_type": req.account_type.value,
         "applicant_type": req.applicant_type.value,
@@ -55,71 +56,108 @@ def determine(req: DeterminationRequest, db: Session = Depends(get_db)):
         "risk_flags": req.risk_flags.model_dump(),
     }
 
-    # ── 2. 케이스 분류 ──
-    case_code, case_tags = classify_case(context)
-
-    # ── 3. DB 룰 평가 ──
-    active_rules = db.query(Rule).filter(Rule.enabled == True).all()  # noqa: E712
-    rules_data = []
-    for r in active_rules:
-        rules_data.append({
-            "id": r.id,
-            "rule_name": r.rule_name,
-            "priority": r.priority,
-            "conditions": r.conditions,
-            "required_documents": r.required_documents,
-            "optional_documents": r.optional_documents,
-            "blocked_if_missing": r.blocked_if_missing,
-            "escalate_if_true": r.escalate_if_true,
-            "output_status": r.output_status,
-            "output_case_tags": json.loads(r.output_case_tags_json) if r.output_case_tags_json else [],
-            "explanation_template": r.explanation_template,
-            "enabled": r.enabled,
-        })
-
-    matches = evaluate_rules(rules_data, context)
-    result = compile_determination(case_code, case_tags, matches)
-
-    # ── 4. fallback: document_resolver로 서류 패키지 보완 ──
-    doc_pkg = resolve_documents(case_code, case_tags, req.account_type.value)
-
-    # 룰 결과의 서류에 resolver 서류를 병합 (중복 제거)
-    merged_required = list(dict.fromkeys(result.required_documents + doc_pkg.required))
-    merged_optional = list(dict.fromkeys(
-        [d for d in (result.optional_documents + doc_pkg.conditional) if d not in merged_required]
-    ))
 
-    result.required_documents = merged_required
-    result.optional_documents = merged_optional
-    result.explanations = list(dict.fromkeys(result.explanations + doc_pkg.explanations))
-
-    # document groups
-    doc_groups = [
-        DocumentGroupResponse(
-            group_code=g.group_code,
-            documents=g.documents,
-            min_required=g.min_required,
-            description=g.description,
-        )
-        for g in doc_pkg.groups
-    ]
+# ── 미리보기 (what-if) ──
+# 룰 스냅샷과 입력값이 같으면 결과도 같으므로 인코딩된 응답을 LRU 로 재사용한다.
+# 스냅샷이 교체되면(룰 수정·무효화·다른 프로세스의 변경) 캐시를 비운다 — 키가 스냅샷 객체이므로
+# 비우지 않으면 교체된 스냅샷(컴파일 룰·통계 전체)이 캐시 항목이 밀려날 때까지 살아 있다.
+
+@lru_cache(maxsize=4096)
+def _preview_body(rule_set: CompiledRuleSet, key: tuple) -> bytes:
+    *fields, risk_flags = key
+    context = dict(fields)
+    context["risk_flags"] = dict(risk_flags)
+    return EncodedResult(run_determination(context, rule_set)).body
+
+
+_preview_snapshot: CompiledRuleSet | None = None
+
+
+def _preview(rule_set: CompiledRuleSet, key: tuple) -> bytes:
+    global _preview_snapshot
+    if rule_set is not _preview_snapshot:
+        _preview_snapshot = rule_set
+        _preview_body.cache_clear()
+    return _preview_body(rule_set, key)
+
+
+def _traced_body(result, trace: dict) -> bytes:
+    return dumps({**result_payload(result), "trace": trace})
+
+
+@router.post("/determine/preview", response_model=DeterminationResponse)
+def preview_determination(req: DeterminationInput, trace: bool = False, db: Session = Depends(get_read_db)):
+    """
+    저장 없는 판정 미리보기.
+    /determine 과 같은 엔진·응답 형식이지만 고객/신청/감사 로그를 쓰지 않는다.
+    DB 는 룰 스냅샷이 없을 때만 읽는다. trace=true 이면 캐시를 거치지 않고 추적 결과를 붙인다.
+    """
+    context = build_context(req)
+    if trace:
+        result, trace_data = run_traced_determination(context, get_rule_set(db))
+        return Response(content=_traced_body(result, trace_data), media_type="application/json")
+    risk_flags = context.pop("risk_flags")
+    key = (*context.items(), tuple(risk_flags.items()))
+    body = _preview(get_rule_set(db), key)
+    return Response(content=body, media_type="application/json")
+
+
+# ── 오프라인 번들 ──
+# 스냅샷마다 한 번 만든다 (룰 하나만 바뀐 스냅샷은 나머지 룰의 진리표를 재사용한다).
+# ETag 가 번들 version(내용 해시)이므로 룰이 바뀌지 않았으면 304.
+
+@lru_cache(maxsize=2)
+def _bundle_entry(rule_set: CompiledRuleSet) -> CachedResponse:
+    bundle = build_bundle(rule_set)
+    return CachedResponse(dumps(bundle), f'"{bundle["version"]}"')
+
+
+@router.get("/determine/bundle")
+def determination_bundle(request: Request, db: Session = Depends(get_read_db)):
+    """
+    프론트엔드 오프라인 판정 번들 (app.engine.bundle).
+    클라이언트는 한 번 받아 ETag 로 캐시하고 판정을 로컬에서 계산한다.
+    """
+    return conditional_response(request, _bundle_entry(get_rule_set(db)))
+
+
+@router.post("/determine", response_model=DeterminationResponse)
+def determine(req: DeterminationRequest, trace: bool = False, db: Session = Depends(get_db)):
+    """
+    법인 계좌개설 서류 판정.
+    1. 입력 컨텍스트 구성
+    2. 케이스 분류 (case_table)
+    3. DB 룰 평가 (rule_engine)
+    4. 서류 패키지 보완 (document_resolver — fallback)
+    5. 결과 반환 + DB 저장 + 감사 로그
+    trace=true 이거나 TRACE_SAMPLE_RATE 표본에 걸리면 설명 추적을 감사 로그에 남기고,
+    trace=true 이면 응답에도 붙인다.
+    """
+    # ── 1. 컨텍스트 구성 ──
+    context = build_context(req)
+
+    # ── 2~4. 케이스 분류 → 룰 평가 → 서류 패키지 보완 ──
+    trace_data = None
+    if trace or (settings.TRACE_SAMPLE_RATE and random.random() < settings.TRACE_SAMPLE_RATE):
+        result, trace_data = run_traced_determination(context, get_rule_set(db))
+    else:
+        result = run_determination(context, get_rule_set(db))
+    case_code = result.case_code
+    # 응답 · DB 컬럼 · 감사 로그가 같은 인코딩을 공유한다
+    encoded = EncodedResult(result)
 
     # ── 5. DB 저장 ──
-    # Customer upsert
-    customer = db.query(Customer).filter_by(business_reg_no=req.business_reg_no).first()
-    if not customer:
-        customer = Customer(
-            business_reg_no=req.business_reg_no,
-            corp_name=req.corp_name,
-            customer_type=req.customer_type,
-            domestic_flag=req.domestic_flag,
-            business_status=req.business_status,
-        )
-        db.add(customer)
-        db.flush()
+    # Customer upsert — 한 문장 (동시 신규 등록 경쟁 없음)
+    customer_id = upsert_customer(db, {
+        "business_reg_no": req.business_reg_no,
+        "corp_name": req.corp_name,
+        "customer_type": req.customer_type.value,
+        "domestic_flag": req.domestic_flag,
+        "business_status": req.business_status.value,
+    })
 
     acct_req = AccountRequest(
-        customer_id=customer.id,
+        customer_id=customer_id,
         account_type=req.account_type,
         applicant_type=req.applicant_type,
         case_code=case_code,
@@ -130,22 +168,16 @@ def determine(req: DeterminationRequest, db: Session = Depends(get_db)):
         account_purpose=req.account_purpose,
         fund_source=req.fund_source,
         status=result.status,
+        created_by=req.created_by,
+        branch=branch_of(db, req.created_by),
     )
     acct_req.case_tags = result.case_tags
     acct_req.risk_flags = req.risk_flags.model_dump()
-    acct_req.determination_result_json = json.dumps({
-        "case_code": result.case_code,
-        "case_tags": result.case_tags,
-        "status": result.status,
-        "required_documents": result.required_documents,
-        "optional_documents": result.optional_documents,
-        "blocked": result.blocked,
-        "escalate": result.escalate,
-        "explanations": result.explanations,
-        "matched_rules": result.matched_rules,
-    }, ensure_ascii=False)
+    acct_req.determination_result_json = encoded.text
     db.add(acct_req)
     db.flush()
+    record_determination(db, acct_req, result.blocked, result.escalate)
+    create_checklist(db, acct_req)
 
     # Audit log
     db.add(AuditLog(
@@ -155,64 +187,73 @@ def determine(req: DeterminationRequest, db: Session = Depends(get_db)):
         new_value=acct_req.determination_result_json,
         reason="자동 판정 생성",
     ))
+    if trace_data is not None:
+        db.add(AuditLog(
+            event_type="DETERMINATION_TRACED",
+            target_type="account_request",
+            target_id=acct_req.id,
+            new_value=dumps(trace_data).decode("utf-8"),
+            reason="판정 설명 추적" if trace else "판정 설명 추적 (표본)",
+        ))
     db.commit()
 
-    return DeterminationResponse(
-        case_code=result.case_code,
-        case_tags=result.case_tags,
-        status=result.status,
-        required_documents=result.required_documents,
-        optional_documents=result.optional_documents,
-        document_groups=doc_groups,
-        blocked=result.blocked,
-        escalate=result.escalate,
-        explanations=result.explanations,
-        matched_rules=result.matched_rules,
-    )
+    if trace:
+        return Response(content=_traced_body(result, trace_data), media_type="application/json")
+    return Response(content=encoded.body, media_type="application/json")
 
 
 @router.get("/requests")
-def list_requests(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
-    """판정 내역 목록."""
-    rows = (
-        db.query(AccountRequest)
-        .join(Customer)
-        .order_by(AccountRequest.created_at.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
+def list_requests(skip: int = 0, limit: int = 20, db: Session = Depends(get_read_db)):
+    """판정 내역 목록 (아카이브된 판정 포함)."""
+    return archive.latest(
+        db,
+        lambda session: (
+            session.query(AccountRequest)
+            .join(Customer)
+            .order_by(AccountRequest.created_at.desc(), AccountRequest.id.desc())
+        ),
+        _request_summary,
+        skip,
+        limit,
     )
-    return [
-        {
-            "id": r.id,
-            "business_reg_no": r.customer.business_reg_no,
-            "corp_name": r.customer.corp_name,
-            "case_code": r.case_code,
-            "status": r.status.value if r.status else None,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-        }
-        for r in rows
-    ]
 
 
-@router.get("/requests/{request_id}")
-def get_request(request_id: int, db: Session = Depends(get_db)):
-    """판정 상세 조회."""
-    r = db.query(AccountRequest).filter_by(id=request_id).first()
-    if not r:
-        from fastapi import HTTPException
-        raise HTTPException(404, "Request not found")
+def _request_summary(r: AccountRequest) -> dict:
+    return {
+        "id": r.id,
+        "business_reg_no": r.customer.business_reg_no,
+        "corp_name": r.customer.corp_name,
+        "case_code": r.case_code,
+        "status": r.status,
+        "created_at": r.created_at.isoformat() if r.created_at else None,
+    }
+
+
+def _request_detail(r: AccountRequest) -> dict:
     return {
         "id": r.id,
         "customer": {
             "business_reg_no": r.customer.business_reg_no,
             "corp_name": r.customer.corp_name,
-            "customer_type": r.customer.customer_type.value,
+            "customer_type": r.customer.customer_type,
         },
         "case_code": r.case_code,
         "case_tags": r.case_tags,
-        "status": r.status.value,
+        "status": r.status,
         "risk_flags": r.risk_flags,
         "determination_result": json.loads(r.determination_result_json) if r.determination_result_json else None,
         "created_at": r.created_at.isoformat() if r.created_at else None,
     }
+
+
+@router.get("/requests/{request_id}")
+def get_request(request_id: int, db: Session = Depends(get_read_db)):
+    """판정 상세 조회. hot DB 에 없으면 아카이브에서 찾는다."""
+    r = db.query(AccountRequest).filter_by(id=request_id).first()
+    if r:
+        return _request_detail(r)
+    detail = archive.find_request(db, request_id, _request_detail)
+    if detail is None:
+        from fastapi import HTTPException
+        raise HTTPException(404, "Request not found")
+    return detail
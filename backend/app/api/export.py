@@ -0,0 +1,196 @@
+"""
+Export API — 판정 내역 / 감사 로그 대량 추출 (CSV, XLSX)
+서버 측 커서로 청크 단위로 읽고, JSON 컬럼을 즉석에서 풀어 응답에 바로 쓴다.
+추출 건수와 무관하게 메모리 사용량은 일정하다. 아카이브 파티션도 id 순으로 병합해 함께 추출한다.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import Iterator
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.archive import archive
+from app.database import ReadSessionLocal
+from app.models.account_request import AccountRequest
+from app.models.audit_log import AuditLog
+from app.models.customer import Customer
+from app.tabular.csv_stream import iter_csv
+from app.tabular.xlsx_writer import iter_xlsx
+from app.profiling import ProfiledRoute
+
+router = APIRouter(prefix="/exports", route_class=ProfiledRoute)
+
+# 서버 측 커서 청크 크기
+CHUNK_ROWS = 1000
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+REQUEST_COLUMNS = [
+    "id", "created_at", "business_reg_no", "corp_name", "customer_type",
+    "account_type", "applicant_type", "case_code", "case_tags", "status",
+    "required_documents", "optional_documents", "document_groups",
+    "blocked", "escalate", "matched_rules", "explanations", "risk_flags",
+]
+
+AUDIT_COLUMNS = [
+    "id", "created_at", "event_type", "actor_id", "target_type", "target_id",
+    "old_value", "new_value", "reason",
+]
+
+
+def _join(values) -> str:
+    return "; ".join(str(v) for v in values) if values else ""
+
+
+def _bounds(date_from: date | None, date_to: date | None) -> tuple[datetime | None, datetime | None]:
+    """[date_from 00:00, date_to 다음날 00:00) — 양 끝 날짜 포함."""
+    return (
+        datetime.combine(date_from, time.min) if date_from else None,
+        datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None,
+    )
+
+
+def _created_between(column, bounds: tuple[datetime | None, datetime | None]) -> list:
+    lo, hi = bounds
+    clauses = []
+    if lo:
+        clauses.append(column >= lo)
+    if hi:
+        clauses.append(column < hi)
+    return clauses
+
+
+def _stream_rows(stmt, convert, bounds: tuple[datetime | None, datetime | None]) -> Iterator[list]:
+    """응답 스트리밍 중에 쓰는 전용 세션 (요청 의존성 세션은 응답 전에 닫힌다)."""
+    db = ReadSessionLocal()
+    try:
+        lo, hi = bounds
+        for row in archive.rows(db, stmt, chunk=CHUNK_ROWS, created_from=lo, created_to=hi):
+            yield convert(row)
+    finally:
+        db.close()
+
+
+def _request_row(row) -> list:
+    result = json.loads(row.determination_result_json) if row.determination_result_json else {}
+    tags = json.loads(row.case_tags_json) if row.case_tags_json else []
+    flags = json.loads(row.risk_flags_json) if row.risk_flags_json else {}
+    return [
+        row.id,
+        row.created_at,
+        row.business_reg_no,
+        row.corp_name,
+        row.customer_type,
+        row.account_type,
+        row.applicant_type,
+        row.case_code,
+        _join(tags),
+        row.status,
+        _join(result.get("required_documents")),
+        _join(result.get("optional_documents")),
+        _join(
+            f"{g['group_code']}({g.get('min_required', 1)}): {'|'.join(g.get('documents', []))}"
+            for g in result.get("document_groups", [])
+        ),
+        result.get("blocked"),
+        result.get("escalate"),
+        _join(result.get("matched_rules")),
+        _join(result.get("explanations")),
+        _join(k for k, v in flags.items() if v),
+    ]
+
+
+def _audit_row(row) -> list:
+    return [
+        row.id, row.created_at, row.event_type, row.actor_id, row.target_type,
+        row.target_id, row.old_value, row.new_value, row.reason,
+    ]
+
+
+def _respond(name: str, fmt: ExportFormat, header: list[str], rows: Iterator[list]) -> StreamingResponse:
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if fmt is ExportFormat.XLSX:
+        body = iter_xlsx(header, rows, sheet_name=name, chunk_rows=CHUNK_ROWS)
+        media_type = XLSX_MEDIA_TYPE
+    else:
+        body = iter_csv(header, rows, chunk_rows=CHUNK_ROWS)
+        media_type = "text/csv; charset=utf-8"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}_{stamp}.{fmt.value}"'},
+    )
+
+
+@router.get("/requests")
+def export_requests(
+    format: ExportFormat = ExportFormat.CSV,
+    date_from: date | None = Query(None, description="생성일 시작 (포함)"),
+    date_to: date | None = Query(None, description="생성일 끝 (포함)"),
+    status: str | None = None,
+    case_code: str | None = None,
+):
+    """판정 내역 추출 — determination_result_json 을 열로 풀어 쓴다."""
+    bounds = _bounds(date_from, date_to)
+    stmt = (
+        select(
+            AccountRequest.id,
+            AccountRequest.created_at,
+            Customer.business_reg_no,
+            Customer.corp_name,
+            Customer.customer_type,
+            AccountRequest.account_type,
+            AccountRequest.applicant_type,
+            AccountRequest.case_code,
+            AccountRequest.case_tags_json,
+            AccountRequest.status,
+            AccountRequest.risk_flags_json,
+            AccountRequest.determination_result_json,
+        )
+        .join(Customer, Customer.id == AccountRequest.customer_id)
+        .where(*_created_between(AccountRequest.created_at, bounds))
+        .order_by(AccountRequest.id)
+    )
+    if status:
+        stmt = stmt.where(AccountRequest.status == status)
+    if case_code:
+        stmt = stmt.where(AccountRequest.case_code == case_code)
+    return _respond("account_requests", format, REQUEST_COLUMNS, _stream_rows(stmt, _request_row, bounds))
+
+
+@router.get("/audit-logs")
+def export_audit_logs(
+    format: ExportFormat = ExportFormat.CSV,
+    date_from: date | None = Query(None, description="기록일 시작 (포함)"),
+    date_to: date | None = Query(None, description="기록일 끝 (포함)"),
+    event_type: str | None = None,
+    target_type: str | None = None,
+):
+    """감사 로그 추출."""
+    bounds = _bounds(date_from, date_to)
+    stmt = (
+        select(
+            AuditLog.id, AuditLog.created_at, AuditLog.event_type, AuditLog.actor_id,
+            AuditLog.target_type, AuditLog.target_id, AuditLog.old_value,
+            AuditLog.new_value, AuditLog.reason,
+        )
+        .where(*_created_between(AuditLog.created_at, bounds))
+        .order_by(AuditLog.id)
+    )
+    if event_type:
+        stmt = stmt.where(AuditLog.event_type == event_type)
+    if target_type:
+        stmt = stmt.where(AuditLog.target_type == target_type)
+    return _respond("audit_logs", format, AUDIT_COLUMNS, _stream_rows(stmt, _audit_row, bounds))
@@ -0,0 +1,37 @@
+"""
+Profiles API — 온디맨드 요청 프로파일 결과 조회 (app.profiling)
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from app.profiling import store
+
+router = APIRouter(prefix="/admin/profiles")
+
+
+@router.get("")
+def list_profiles():
+    """저장된 프로파일 목록 (최신순)."""
+    return store.list()
+
+
+@router.get("/{request_id}")
+def get_profile(request_id: str):
+    """요청 메타데이터, SQL 목록, 누적 시간순 cProfile 요약."""
+    try:
+        return store.get(request_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+
+@router.get("/{request_id}/pstats")
+def download_pstats(request_id: str):
+    """원본 pstats 파일 — `python -m pstats`, snakeviz 등으로 분석."""
+    try:
+        path = store.pstats_path(request_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{request_id}.pstats")
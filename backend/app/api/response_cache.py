@@ -0,0 +1,89 @@
+"""
+Response Cache — 마스터 데이터 조회 응답 캐시
+자주 바뀌지 않는 관리자 조회 응답을 직렬화된 바이트와 강한 ETag 로 보관한다.
+
+- 캐시 항목은 네임스페이스(document_types, rules 등)별 세대 번호로 무효화
+- 쓰기 핸들러가 커밋 후 `invalidate(namespace)` 호출
+- 다른 워커·CLI·시드 적재의 쓰기는 `invalidate` 로 전해지지 않으므로, 호출자가 DB 쪽 버전
+  (rules / document_types 는 `rule_set_generation` 세대)을 `version` 으로 넘기면 그 값이 바뀐 항목은 다시 만든다
+- `If-None-Match` 가 일치하면 본문 없이 304 반환
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import Request, Response
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str  # 따옴표 포함 강한 ETag
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """If-None-Match 비교 (RFC 9110 §13.1.2 — 약한 비교)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in header.split(","))
+
+
+class ResponseCache:
+    """키 → CachedResponse. 키는 (네임스페이스, 세부 키) 쌍."""
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], tuple[int, int, CachedResponse]] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str, build: Callable[[], bytes], version: int = 0) -> CachedResponse:
+        """version: 프로세스 밖의 변경을 나타내는 값 (DB 세대 등). 저장 시점과 다르면 다시 만든다."""
+        generation = self._generations.get(namespace, 0)
+        hit = self._entries.get((namespace, key))
+        if hit is not None and hit[0] == generation and hit[1] == version:
+            return hit[2]
+        body = build()
+        entry = CachedResponse(body, _etag(body))
+        with self._lock:
+            # 빌드 중에 무효화되었으면 저장하지 않는다 (이번 응답에만 사용)
+            if self._generations.get(namespace, 0) == generation:
+                self._entries[(namespace, key)] = (generation, version, entry)
+        return entry
+
+    def invalidate(self, *namespaces: str) -> None:
+        with self._lock:
+            for ns in namespaces:
+                self._generations[ns] = self._generations.get(ns, 0) + 1
+                for k in [k for k in self._entries if k[0] == ns]:
+                    del self._entries[k]
+
+    def clear(self) -> None:
+        with self._lock:
+            for ns in list(self._generations):
+                self._generations[ns] += 1
+            self._entries.clear()
+
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    """ETag 헤더를 붙인 200 응답, 또는 클라이언트 사본이 최신이면 304."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+# 프로세스 전역 캐시
+admin_cache = ResponseCache()
@@ -0,0 +1,17 @@
+"""
+Scheduler API — 우선순위 레인 상태 조회 (app.scheduler)
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.scheduler import scheduler
+
+router = APIRouter(prefix="/admin/scheduler")
+
+
+@router.get("")
+def scheduler_stats():
+    """레인별 실행·대기 수, 누적 진입/거절 수, 평균 처리 시간."""
+    return scheduler.snapshot()
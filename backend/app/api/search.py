@@ -0,0 +1,184 @@
+"""
+Search API — 고객/판정 검색 (법인명 부분·접두 검색, 사업자번호 접두 검색)
+FTS5 인덱스(app.search_index)로 순위가 매겨진 고객 목록과 각 고객의 최근 판정을 반환한다.
+"""
+
+from __future__ import annotations
+
+import re
+from enum import Enum
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.search_index import fts_available
+from app.profiling import ProfiledRoute
+
+router = APIRouter(route_class=ProfiledRoute)
+
+# 고객별로 함께 반환할 최근 판정 수
+REQUESTS_PER_CUSTOMER = 5
+
+# 일치 건수가 이보다 많으면 bm25 순위 계산(전체 일치 행 점수화)을 생략하고 최신순으로 반환
+RANK_CANDIDATE_CAP = 5000
+
+_REG_NO = re.compile(r"^[\d-]+$")
+
+
+class SearchMode(str, Enum):
+    AUTO = "auto"            # 숫자/하이픈 → 사업자번호 접두, 3자 이상 → 부분 문자열, 그 외 → 접두
+    SUBSTRING = "substring"  # trigram 부분 문자열
+    PREFIX = "prefix"        # 어절 접두
+    REG_NO = "reg_no"        # 사업자번호 접두
+
+
+def _quote(term: str) -> str:
+    """FTS5 문자열 리터럴 — 연산자/특수문자를 그대로 검색어로 취급."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _resolve_mode(q: str, mode: SearchMode) -> SearchMode:
+    if mode is not SearchMode.AUTO:
+        return mode
+    if _REG_NO.match(q):
+        return SearchMode.REG_NO
+    return SearchMode.SUBSTRING if len(q) >= 3 else SearchMode.PREFIX
+
+
+def _request_filter(case_code: str | None, status: str | None, alias: str = "r") -> tuple[str, dict]:
+    clauses, params = [], {}
+    if case_code:
+        clauses.append(f"{alias}.case_code = :case_code")
+        params["case_code"] = case_code
+    if status:
+        clauses.append(f"{alias}.status = :status")
+        params["status"] = status
+    return " AND ".join(clauses), params
+
+
+def _match_customers(db: Session, q: str, mode: SearchMode, filters: str, params: dict, limit: int) -> list[tuple[int, float | None]]:
+    """
+    (customer_id, rank) — rank 는 bm25 (작을수록 관련도 높음).
+    사업자번호 검색, LIKE 대체 검색, 일치 건수가 RANK_CANDIDATE_CAP 이상인 검색은 None.
+    """
+    exists = (
+        f" AND EXISTS (SELECT 1 FROM account_requests r WHERE r.customer_id = c.id AND {filters})"
+        if filters else ""
+    )
+    params = {**params, "limit": limit}
+
+    if mode is SearchMode.REG_NO:
+        # B-tree 범위 검색 (고유 인덱스 사용)
+        params["lo"] = q
+        params["hi"] = q[:-1] + chr(ord(q[-1]) + 1)
+        sql = (
+            "SELECT c.id, NULL FROM customers c "
+            f"WHERE c.business_reg_no >= :lo AND c.business_reg_no < :hi{exists} "
+            "ORDER BY c.business_reg_no LIMIT :limit"
+        )
+    elif not fts_available(db.get_bind()):
+        params["like"] = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = (
+            "SELECT c.id, NULL FROM customers c "
+            f"WHERE (c.corp_name LIKE :like ESCAPE '\\' OR c.business_reg_no LIKE :like ESCAPE '\\'){exists} "
+            "ORDER BY c.id DESC LIMIT :limit"
+        )
+    else:
+        if mode is SearchMode.SUBSTRING:
+            table = "customer_fts"
+            params["match"] = _quote(q)
+        else:
+            table = "customer_prefix_fts"
+            params["match"] = " ".join(_quote(term) + "*" for term in q.split())
+        broad = db.execute(
+            text(f"SELECT count(*) FROM (SELECT rowid FROM {table} WHERE {table} MATCH :match LIMIT :cap)"),
+            {"match": params["match"], "cap": RANK_CANDIDATE_CAP},
+        ).scalar() >= RANK_CANDIDATE_CAP
+        # 너무 흔한 검색어는 순위 대신 최신 고객순 (rowid 역순은 FTS 인덱스 순서라 저렴)
+        order = "f.rowid DESC" if broad else "f.rank"
+        rank = "NULL" if broad else "f.rank"
+        sql = (
+            f"SELECT c.id, {rank} FROM {table} f JOIN customers c ON c.id = f.rowid "
+            f"WHERE {table} MATCH :match{exists} ORDER BY {order} LIMIT :limit"
+        )
+    return [(row[0], row[1]) for row in db.execute(text(sql), params)]
+
+
+@router.get("/search")
+def search(
+    q: str | None = Query(None, max_length=200, description="법인명 또는 사업자번호"),
+    mode: SearchMode = SearchMode.AUTO,
+    case_code: str | None = None,
+    status: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+):
+    """고객 검색. case_code/status 를 주면 해당 판정이 있는 고객만, 판정 목록도 그 조건으로 거른다."""
+    q = (q or "").strip()
+    filters, params = _request_filter(case_code, status)
+    if not q and not filters:
+        return {"query": q, "mode": None, "results": []}
+
+    if q:
+        used_mode = _resolve_mode(q, mode)
+        matches = _match_customers(db, q, used_mode, filters, params, limit)
+    else:
+        # 검색어 없이 판정 조건만 — (case_code, status) 인덱스를 최신순으로 훑으며 고객 limit 명을 모은다
+        used_mode = None
+        rows = db.execute(text(
+            f"SELECT r.customer_id FROM account_requests r WHERE {filters} ORDER BY r.id DESC"
+        ), params)
+        seen: dict[int, None] = {}
+        for (customer_id,) in rows:
+            seen.setdefault(customer_id)
+            if len(seen) >= limit:
+                break
+        rows.close()
+        matches = [(cid, None) for cid in seen]
+
+    if not matches:
+        return {"query": q, "mode": used_mode, "results": []}
+
+    ids = [cid for cid, _ in matches]
+    id_params = {f"id{i}": cid for i, cid in enumerate(ids)}
+    id_list = ", ".join(f":id{i}" for i in range(len(ids)))
+    customers = {
+        row.id: row
+        for row in db.execute(text(
+            f"SELECT id, business_reg_no, corp_name, customer_type FROM customers WHERE id IN ({id_list})"
+        ), id_params)
+    }
+    request_rows = db.execute(text(
+        "SELECT id, customer_id, case_code, status, created_at FROM ("
+        "  SELECT r.*, row_number() OVER (PARTITION BY r.customer_id ORDER BY r.id DESC) AS n"
+        f"  FROM account_requests r WHERE r.customer_id IN ({id_list})"
+        + (f" AND {filters}" if filters else "")
+        + f") WHERE n <= {REQUESTS_PER_CUSTOMER} ORDER BY customer_id, id DESC"
+    ), {**id_params, **params})
+    requests: dict[int, list[dict]] = {}
+    for row in request_rows:
+        requests.setdefault(row.customer_id, []).append({
+            "id": row.id,
+            "case_code": row.case_code,
+            "status": row.status,
+            "created_at": str(row.created_at) if row.created_at else None,
+        })
+
+    return {
+        "query": q,
+        "mode": used_mode,
+        "results": [
+            {
+                "customer_id": cid,
+                "business_reg_no": customers[cid].business_reg_no,
+                "corp_name": customers[cid].corp_name,
+                "customer_type": customers[cid].customer_type,
+                "rank": rank,
+                "requests": requests.get(cid, []),
+            }
+            for cid, rank in matches
+            if cid in customers
+        ],
+    }
@@ -0,0 +1,96 @@
+"""
+Stats API — 운영 대시보드 판정 통계
+집계 테이블(determination_rollups)만 읽으므로 응답 비용은 원본 판정 수와 무관하다.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from enum import Enum
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import get_read_db
+from app.models.determination_rollup import DeterminationRollup
+from app.rollups import ALL_TAGS
+from app.profiling import ProfiledRoute
+
+router = APIRouter(prefix="/stats", route_class=ProfiledRoute)
+
+
+class Dimension(str, Enum):
+    DAY = "day"
+    BRANCH = "branch"
+    CASE_CODE = "case_code"
+    STATUS = "status"
+    TAG = "tag"
+
+
+def _rates(count: int, blocked: int, escalated: int) -> dict:
+    return {
+        "count": count,
+        "blocked": blocked,
+        "escalated": escalated,
+        "blocked_rate": round(blocked / count, 4) if count else 0.0,
+        "escalation_rate": round(escalated / count, 4) if count else 0.0,
+    }
+
+
+@router.get("/determinations")
+def determination_stats(
+    group_by: list[Dimension] = Query(default=[Dimension.DAY]),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    branch: str | None = None,
+    case_code: str | None = None,
+    status: str | None = None,
+    tag: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """
+    판정 건수·차단율·에스컬레이션율.
+    group_by 에 tag 가 있거나 tag 로 거르면 태그별 행(한 판정이 여러 태그에 집계됨)을,
+    아니면 판정 단위 합계 행을 사용한다. total 은 항상 판정 단위 합계다.
+    """
+    R = DeterminationRollup
+    dims = list(dict.fromkeys(group_by))
+    filters = []
+    if date_from:
+        filters.append(R.day >= date_from.isoformat())
+    if date_to:
+        filters.append(R.day <= date_to.isoformat())
+    if branch is not None:
+        filters.append(R.branch == branch)
+    if case_code:
+        filters.append(R.case_code == case_code)
+    if status:
+        filters.append(R.status == status)
+
+    by_tag = Dimension.TAG in dims or tag is not None
+    row_filters = list(filters)
+    if by_tag:
+        row_filters.append(R.tag != ALL_TAGS)
+        if tag is not None:
+            row_filters.append(R.tag == tag)
+    else:
+        row_filters.append(R.tag == ALL_TAGS)
+
+    columns = [getattr(R, d.value) for d in dims]
+    sums = (func.sum(R.count), func.sum(R.blocked), func.sum(R.escalated))
+    stmt = select(*columns, *sums).where(*row_filters)
+    if columns:
+        stmt = stmt.group_by(*columns).order_by(*columns)
+    rows = [
+        {**{d.value: row[i] for i, d in enumerate(dims)}, **_rates(*(int(v or 0) for v in row[len(dims):]))}
+        for row in db.execute(stmt)
+    ]
+    rows = [r for r in rows if r["count"]]
+
+    total_row = db.execute(select(*sums).where(*filters, R.tag == ALL_TAGS)).one()
+    return {
+        "group_by": [d.value for d in dims],
+        "rows": rows,
+        "total": _rates(*(int(v or 0) for v in total_row)),
+    }
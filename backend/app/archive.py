@@ -0,0 +1,512 @@
+"""
+Request Archive — 오래된 판정의 hot/cold 분리 (§14 감사 보존)
+
+종결 상태(APPROVED_FOR_RECEPTION, BLOCKED)로 ARCHIVE_CLOSED_AFTER_DAYS 동안 변경이 없거나,
+생성 후 ARCHIVE_MAX_AGE_DAYS 가 지난 판정을 체크리스트·감사 로그와 함께
+ARCHIVE_DIR/requests_YYYY-MM.db (생성 월 기준) 로 옮긴다.
+
+- 배치(ARCHIVE_BATCH_ROWS)마다 아카이브 파일에 먼저 쓰고, hot DB 에서는 파티션 색인 갱신과
+  삭제만 짧은 트랜잭션으로 한다. 배치 사이에는 ARCHIVE_BATCH_PAUSE 만큼 쉬고, 같은 프로세스의
+  대화형 요청이 실행 중이면 끝날 때까지(최대 SCHED_YIELD_MAX_WAIT 초) 기다려 판정 쓰기에 양보한다.
+- 아카이브 쓰기는 이미 같은 행이 있으면 건너뛰므로 중간에 끊겨도 다시 실행하면 이어서 정리된다.
+  (끊긴 배치의 행은 잠시 양쪽에 있을 수 있고, 읽기는 hot 쪽을 우선한다.) 같은 id 에 다른 내용이
+  있으면 덮어쓰지 않고 ArchiveConflict 로 멈춘다.
+- 판정·감사 로그 id 는 재사용되면 안 된다. AUTOINCREMENT 없이 만든 기존 hot DB 는 첫 이동 전에
+  테이블을 AUTOINCREMENT 로 다시 만들고, sqlite_sequence 를 아카이브로 옮긴 최대 id 이상으로 올린다.
+- 실행이 끝나면 손댄 파일의 통계를 다시 세고 VACUUM 으로 압축한다.
+- 아카이브 파일에는 고객 행도 이동 시점 스냅샷으로 넣어 파일 하나로 조회가 완결된다.
+- 집계(determination_rollups)는 옮기지 않으므로 통계 API 는 영향이 없다.
+
+읽기: `find_request` / `latest` / `rows` 가 hot DB 다음에 파티션 색인(archive_partitions)으로
+고른 파일을 같은 ORM 모델로 조회한다.
+
+    python -m app.archive run [--batch 500] [--limit N] [--dry-run]
+    python -m app.archive list
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import Engine, and_, create_engine, delete, func, or_, select, text
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.schema import CreateTable
+
+from app.config import settings
+from app.enums import RequestStatus
+from app.models.account_request import AccountRequest
+from app.models.archive_partition import ArchivePartition
+from app.models.audit_log import AuditLog
+from app.models.base import Base
+from app.models.customer import Customer
+from app.models.document_checklist import ChecklistGroup, ChecklistItem, DocumentChecklist
+from app.rollups import ensure_branch_column
+from app.scheduler import scheduler
+
+CLOSED_STATUSES = (RequestStatus.APPROVED_FOR_RECEPTION.value, RequestStatus.BLOCKED.value)
+
+# 판정 1건에 딸려 이동하는 테이블 (삭제는 역순)
+_CHILD_TABLES = (DocumentChecklist.__table__, ChecklistItem.__table__, ChecklistGroup.__table__)
+_ARCHIVE_TABLES = (Customer.__table__, AccountRequest.__table__, *_CHILD_TABLES, AuditLog.__table__)
+
+
+def _month(created_at: datetime | None) -> str:
+    return created_at.strftime("%Y-%m") if created_at else "0000-00"
+
+
+def _request_audits(ids) -> Any:
+    return and_(AuditLog.target_type == "account_request", AuditLog.target_id.in_(ids))
+
+
+class ArchiveConflict(Exception):
+    """아카이브 파일에 같은 id 의 다른 행이 이미 있다 (id 재사용)."""
+
+
+# 지운 id 를 다시 주면 안 되는 hot 테이블
+_MONOTONIC_TABLES = (AccountRequest.__table__, AuditLog.__table__)
+
+
+class ArchiveStore:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._engines: dict[str, Engine] = {}
+        self._lock = threading.Lock()
+
+    # ── 파일 ──
+
+    def path(self, month: str) -> Path:
+        return self.directory / f"requests_{month}.db"
+
+    def engine(self, path: str) -> Engine:
+        engine = self._engines.get(path)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(path)
+                if engine is None:
+                    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+                    # 이전 버전이 만든 파일은 판정 지점 컬럼이 없다 (새 파일은 create_all 이 만든다)
+                    with engine.begin() as conn:
+                        ensure_branch_column(conn)
+                    self._engines[path] = engine
+        return engine
+
+    def _writable(self, month: str) -> Engine:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        engine = self.engine(str(self.path(month)))
+        Base.metadata.create_all(engine, tables=list(_ARCHIVE_TABLES))
+        return engine
+
+    @contextmanager
+    def session(self, partition: ArchivePartition) -> Iterator[Session]:
+        session = Session(self.engine(partition.path))
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def partitions(self, db: Session) -> list[ArchivePartition]:
+        """최근 판정이 있는 파티션부터."""
+        return (
+            db.query(ArchivePartition)
+            .order_by(ArchivePartition.last_created_at.desc(), ArchivePartition.month.desc())
+            .all()
+        )
+
+    # ── 읽기 폴스루 ──
+
+    def find_request(self, db: Session, request_id: int, convert: Callable[[AccountRequest], Any]) -> Any | None:
+        """hot DB 에 없는 판정을 id 범위가 맞는 파티션에서 찾는다. convert 는 세션이 열린 동안 호출된다."""
+        parts = (
+            db.query(ArchivePartition)
+            .filter(ArchivePartition.min_request_id <= request_id, ArchivePartition.max_request_id >= request_id)
+            .order_by(ArchivePartition.month.desc())
+            .all()
+        )
+        for part in parts:
+            with self.session(part) as adb:
+                row = adb.get(AccountRequest, request_id)
+                if row is not None:
+                    return convert(row)
+        return None
+
+    def latest(
+        self,
+        db: Session,
+        query: Callable[[Session], Query],
+        convert: Callable[[Any], Any],
+        skip: int,
+        limit: int,
+    ) -> list:
+        """
+        created_at 내림차순 목록의 [skip, skip+limit) 구간을 hot + 아카이브에서 병합해 만든다.
+        query(session) 은 필터·정렬(created_at desc)까지 적용한 Query. 대상 모델은 id, created_at 을 가진다.
+        남은 파티션의 최신 생성일이 이미 모은 구간보다 오래되면 더 열지 않는다.
+        """
+        need = skip + limit
+        if need <= 0:
+            return []
+        keyed: dict[int, tuple[tuple, Any]] = {}
+
+        def collect(session: Session) -> None:
+            for row in query(session).limit(need):
+                if row.id not in keyed:  # hot 우선 (이동 도중 끊긴 배치)
+                    keyed[row.id] = ((row.created_at or datetime.min, row.id), convert(row))
+
+        collect(db)
+        for part in self.partitions(db):
+            if len(keyed) >= need and part.last_created_at is not None:
+                cutoff = heapq.nlargest(need, (k for k, _ in keyed.values()))[-1]
+                if part.last_created_at < cutoff[0]:
+                    break
+            with self.session(part) as adb:
+                collect(adb)
+        ordered = sorted(keyed.values(), key=lambda kv: kv[0], reverse=True)
+        return [row for _, row in ordered[skip:need]]
+
+    def rows(
+        self,
+        db: Session,
+        stmt,
+        *,
+        chunk: int = 1000,
+        ordered_by_id: bool = True,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> Iterator:
+        """
+        같은 select 문을 hot DB 와 (생성일 범위가 겹치는) 파티션에서 실행해 흘려보낸다.
+        ordered_by_id 이면 stmt 가 id 오름차순이라고 보고 id 순으로 병합하며 중복 id 는 한 번만 낸다.
+        """
+        parts = [
+            p for p in self.partitions(db)
+            if not (created_from and p.last_created_at and p.last_created_at < created_from)
+            and not (created_to and p.first_created_at and p.first_created_at >= created_to)
+        ]
+        sessions = [Session(self.engine(p.path)) for p in parts]
+        try:
+            stmt = stmt.execution_options(yield_per=chunk)
+            streams = [db.execute(stmt), *(s.execute(stmt) for s in sessions)]
+            if not ordered_by_id:
+                yield from chain.from_iterable(streams)
+                return
+            last = None
+            for row in heapq.merge(*streams, key=lambda r: r.id):
+                if row.id != last:
+                    last = row.id
+                    yield row
+        finally:
+            for s in sessions:
+                s.close()
+
+    # ── 이동 ──
+
+    def eligible_ids(self, db: Session, now: datetime, limit: int) -> list[int]:
+        closed_before = now - timedelta(days=settings.ARCHIVE_CLOSED_AFTER_DAYS)
+        created_before = now - timedelta(days=settings.ARCHIVE_MAX_AGE_DAYS)
+        stmt = (
+            select(AccountRequest.id)
+            .where(or_(
+                and_(AccountRequest.status.in_(CLOSED_STATUSES), AccountRequest.updated_at < closed_before),
+                AccountRequest.created_at < created_before,
+            ))
+            .order_by(AccountRequest.id)
+            .limit(limit)
+        )
+        return list(db.execute(stmt).scalars())
+
+    def archive_batch(self, db: Session, ids: list[int]) -> tuple[int, int, set[str]]:
+        """판정 ids 를 월별 파일로 옮긴다. 반환: (판정 수, 감사 로그 수, 파티션 월)."""
+        req_table = AccountRequest.__table__
+        requests = [dict(r) for r in db.execute(select(req_table).where(req_table.c.id.in_(ids))).mappings()]
+        month_of = {r["id"]: _month(r["created_at"]) for r in requests}
+        cust_table = Customer.__table__
+        customers = {
+            r["id"]: dict(r)
+            for r in db.execute(
+                select(cust_table).where(cust_table.c.id.in_({r["customer_id"] for r in requests}))
+            ).mappings()
+        }
+        children = {
+            table: [dict(r) for r in db.execute(select(table).where(table.c.account_request_id.in_(ids))).mappings()]
+            for table in _CHILD_TABLES
+        }
+        audits = [dict(r) for r in db.execute(select(AuditLog.__table__).where(_request_audits(ids))).mappings()]
+
+        # 1. 아카이브 파일 (월별 트랜잭션)
+        months = sorted(set(month_of.values()))
+        for month in months:
+            mine = [r for r in requests if month_of[r["id"]] == month]
+            batches = [
+                (cust_table, list({r["customer_id"]: customers[r["customer_id"]] for r in mine}.values())),
+                (req_table, mine),
+                *((t, [c for c in rows if month_of[c["account_request_id"]] == month]) for t, rows in children.items()),
+                (AuditLog.__table__, [a for a in audits if month_of.get(a["target_id"]) == month]),
+            ]
+            with self._writable(month).begin() as conn:
+                for table, rows in batches:
+                    if not rows:
+                        continue
+                    if table is cust_table:
+                        # 고객은 hot 에서 지우지 않으므로 id 가 재사용되지 않는다 — 최신 스냅샷으로 갱신
+                        conn.execute(table.insert().prefix_with("OR REPLACE"), rows)
+                    else:
+                        _insert_new(conn, table, rows)
+
+        # 2. hot DB — 파티션 색인 갱신 + 삭제를 한 트랜잭션으로
+        for month in months:
+            mine = [r for r in requests if month_of[r["id"]] == month]
+            n_audit = sum(1 for a in audits if month_of.get(a["target_id"]) == month)
+            created = [r["created_at"] for r in mine if r["created_at"]]
+            part = db.get(ArchivePartition, month)
+            if part is None:
+                part = ArchivePartition(
+                    month=month, path=str(self.path(month)),
+                    min_request_id=mine[0]["id"], max_request_id=mine[0]["id"],
+                    request_count=0, audit_count=0,
+                )
+                db.add(part)
+            part.min_request_id = min(part.min_request_id, *(r["id"] for r in mine))
+            part.max_request_id = max(part.max_request_id, *(r["id"] for r in mine))
+            if created:
+                part.first_created_at = min(filter(None, (part.first_created_at, *created)))
+                part.last_created_at = max(filter(None, (part.last_created_at, *created)))
+            part.request_count += len(mine)
+            part.audit_count += n_audit
+        for table in reversed(_CHILD_TABLES):
+            db.execute(delete(table).where(table.c.account_request_id.in_(ids)))
+        db.execute(delete(AuditLog).where(_request_audits(ids)))
+        db.execute(delete(req_table).where(req_table.c.id.in_(ids)))
+        db.commit()
+        return len(requests), len(audits), set(months)
+
+    def ensure_monotonic_ids(self, db: Session) -> None:
+        """
+        AUTOINCREMENT 없이 만든 판정·감사 로그 테이블을 AUTOINCREMENT 로 다시 만든다.
+        AUTOINCREMENT 가 없으면 SQLite 는 가장 큰 id 가 지워졌을 때 그 id 를 새 행에 준다.
+        sqlite_sequence 는 아카이브 파일의 최대 id 이상으로 올린다 (이미 옮긴 id 도 다시 나오지 않게).
+        """
+        if db.get_bind().dialect.name != "sqlite":
+            return
+        for table in _MONOTONIC_TABLES:
+            sql = db.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table.name}
+            ).scalar()
+            if sql is not None and "AUTOINCREMENT" not in sql.upper():
+                _rebuild_autoincrement(db, table)
+            archived = max(
+                (self._max_id(part, table) for part in self.partitions(db)),
+                default=0,
+            )
+            hot = db.execute(select(func.max(table.c.id))).scalar() or 0
+            high = max(archived, hot)
+            if not db.execute(text("SELECT 1 FROM sqlite_sequence WHERE name = :name"), {"name": table.name}).first():
+                db.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, 0)"), {"name": table.name})
+            db.execute(
+                text("UPDATE sqlite_sequence SET seq = :high WHERE name = :name AND seq < :high"),
+                {"name": table.name, "high": high},
+            )
+        db.commit()
+
+    def _max_id(self, part: ArchivePartition, table) -> int:
+        if table is AccountRequest.__table__:
+            return part.max_request_id or 0
+        with self.engine(part.path).connect() as conn:
+            return conn.execute(select(func.max(table.c.id))).scalar() or 0
+
+    def compact(self, db: Session, month: str) -> None:
+        """파티션 통계를 파일 기준으로 다시 세고 VACUUM 한다."""
+        part = db.get(ArchivePartition, month)
+        if part is None:
+            return
+        engine = self.engine(part.path)
+        with engine.connect() as conn:
+            lo, hi, first, last, n = conn.execute(select(
+                func.min(AccountRequest.id), func.max(AccountRequest.id),
+                func.min(AccountRequest.created_at), func.max(AccountRequest.created_at),
+                func.count(),
+            )).one()
+            n_audit = conn.execute(select(func.count()).select_from(AuditLog)).scalar()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        part.min_request_id, part.max_request_id = lo, hi
+        part.first_created_at, part.last_created_at = first, last
+        part.request_count, part.audit_count = n, n_audit
+        part.compacted_at = datetime.utcnow()
+        db.commit()
+
+    def run(
+        self,
+        db: Session,
+        *,
+        batch: int | None = None,
+        pause: float | None = None,
+        limit: int | None = None,
+        now: datetime | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """대상 판정이 없어질 때까지 (또는 limit 건까지) 배치로 옮긴 뒤 손댄 파일을 압축한다."""
+        batch = batch or settings.ARCHIVE_BATCH_ROWS
+        pause = settings.ARCHIVE_BATCH_PAUSE if pause is None else pause
+        now = now or datetime.utcnow()
+        if dry_run:
+            eligible = self.eligible_ids(db, now, limit or 2**31)
+            db.rollback()
+            return {"dry_run": True, "requests": len(eligible), "months": []}
+        self.ensure_monotonic_ids(db)
+        moved = audits = 0
+        touched: set[str] = set()
+        while limit is None or moved < limit:
+            size = batch if limit is None else min(batch, limit - moved)
+            ids = self.eligible_ids(db, now, size)
+            if not ids:
+                break
+            n, a, months = self.archive_batch(db, ids)
+            moved += n
+            audits += a
+            touched |= months
+            if pause:
+                time.sleep(pause)
+            scheduler.yield_to_interactive()
+        for month in sorted(touched):
+            self.compact(db, month)
+        return {"dry_run": False, "requests": moved, "audit_logs": audits, "months": sorted(touched)}
+
+
+def _insert_new(conn, table, rows: list[dict]) -> None:
+    """
+    아카이브 파일에 rows 를 넣는다. 같은 id 의 같은 행(끊긴 배치 재실행)은 건너뛰고,
+    다른 행이면 ArchiveConflict — 덮어쓰면 먼저 옮긴 판정이 사라진다.
+    """
+    existing = {
+        r["id"]: dict(r)
+        for r in conn.execute(select(table).where(table.c.id.in_([row["id"] for row in rows]))).mappings()
+    }
+    fresh = []
+    for row in rows:
+        old = existing.get(row["id"])
+        if old is None:
+            fresh.append(row)
+        elif old != row:
+            raise ArchiveConflict(f"{table.name} id {row['id']} 가 아카이브에 다른 내용으로 이미 있습니다")
+    if fresh:
+        conn.execute(table.insert(), fresh)
+
+
+def _rebuild_autoincrement(db: Session, table) -> None:
+    """
+    SQLite 권장 절차로 table 을 AUTOINCREMENT 정의로 다시 만든다:
+    새 테이블 생성 → 복사 → 기존 테이블 삭제 → 새 테이블 이름 변경 → 인덱스·트리거 복원, 한 트랜잭션 안에서.
+    기존 테이블 이름을 먼저 바꾸면 SQLite(3.26+)가 다른 테이블의 외래 키까지 임시 이름으로 고쳐 써서
+    지운 테이블을 가리키게 되고, 그 테이블의 트리거도 함께 사라진다.
+    """
+    name = table.name
+    staging = f"new_{name}"
+    dialect = db.get_bind().dialect
+    ddl = str(CreateTable(table).compile(dialect=dialect)).strip()
+    prefix = f"CREATE TABLE {dialect.identifier_preparer.format_table(table)} "
+    if not ddl.startswith(prefix):
+        raise RuntimeError(f"{name} 의 CREATE TABLE 문을 해석하지 못했습니다: {ddl[:80]}")
+    # 인덱스·트리거는 테이블과 함께 지워지므로 정의를 챙겨 두었다가 되살린다 (모델 밖에서 만든 것 포함)
+    extras = db.execute(
+        text(
+            "SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = :name "
+            "AND sql IS NOT NULL ORDER BY type = 'trigger'"
+        ),
+        {"name": name},
+    ).scalars().all()
+    columns = ", ".join(f'"{c.name}"' for c in table.columns)
+    with db.begin_nested():
+        conn = db.connection()
+        conn.exec_driver_sql(f'CREATE TABLE "{staging}" ' + ddl[len(prefix):])
+        conn.exec_driver_sql(f'INSERT INTO "{staging}" ({columns}) SELECT {columns} FROM "{name}"')
+        conn.exec_driver_sql(f'DROP TABLE "{name}"')
+        # 새 이름은 다른 테이블이 이미 가리키는 이름 그대로이므로 다른 스키마는 고쳐 쓰지 않게 한다
+        conn.exec_driver_sql("PRAGMA legacy_alter_table = ON")
+        try:
+            conn.exec_driver_sql(f'ALTER TABLE "{staging}" RENAME TO "{name}"')
+        finally:
+            conn.exec_driver_sql("PRAGMA legacy_alter_table = OFF")
+        for sql in extras:
+            conn.exec_driver_sql(sql)
+
+
+archive = ArchiveStore(settings.ARCHIVE_DIR)
+
+
+# ── 백그라운드 실행 (관리 API) ──
+
+_job_lock = threading.Lock()
+_job: dict = {"running": False, "started_at": None, "finished_at": None, "result": None, "error": None}
+
+
+def job_status() -> dict:
+    return dict(_job)
+
+
+def start_background(**kwargs) -> bool:
+    """별도 스레드에서 `archive.run` 을 시작한다. 이미 실행 중이면 False."""
+    if not _job_lock.acquire(blocking=False):
+        return False
+    _job.update(running=True, started_at=datetime.utcnow().isoformat(), finished_at=None, result=None, error=None)
+
+    def work():
+        from app.database import SessionLocal
+        db = SessionLocal()
+        try:
+            _job["result"] = archive.run(db, **kwargs)
+        except Exception as exc:  # 상태 조회로 확인
+            db.rollback()
+            _job["error"] = repr(exc)
+        finally:
+            db.close()
+            _job.update(running=False, finished_at=datetime.utcnow().isoformat())
+            _job_lock.release()
+
+    threading.Thread(target=work, name="request-archive", daemon=True).start()
+    return True
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="판정 아카이브 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("run", help="대상 판정을 월별 아카이브 파일로 이동")
+    p.add_argument("--batch", type=int, help=f"배치 크기 (기본 {settings.ARCHIVE_BATCH_ROWS})")
+    p.add_argument("--pause", type=float, help=f"배치 사이 휴지 초 (기본 {settings.ARCHIVE_BATCH_PAUSE})")
+    p.add_argument("--limit", type=int, help="이번 실행에서 옮길 최대 판정 수")
+    p.add_argument("--dry-run", action="store_true", help="대상 건수만 센다")
+    sub.add_parser("list", help="아카이브 파티션 목록")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine, tables=[ArchivePartition.__table__])
+    with engine.begin() as conn:
+        ensure_branch_column(conn)
+    db = SessionLocal()
+    try:
+        if args.command == "list":
+            for p in archive.partitions(db):
+                print(f"{p.month}  requests={p.request_count:,} audit={p.audit_count:,} "
+                      f"ids={p.min_request_id}..{p.max_request_id}  {p.path}")
+            return 0
+        result = archive.run(db, batch=args.batch, pause=args.pause, limit=args.limit, dry_run=args.dry_run)
+        if result["dry_run"]:
+            print(f"대상 판정 {result['requests']:,} 건")
+        else:
+            print(f"✅ 판정 {result['requests']:,} 건, 감사 로그 {result['audit_logs']:,} 건 이동 "
+                  f"({', '.join(result['months']) or '없음'})")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
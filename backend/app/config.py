@@ -9,6 +9,52 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     API_V1_PREFIX: str = "/api/v1"
 
+    # 저장소 프로파일: "default" | "production" (SQLite WAL + 단일 쓰기 연결 + 읽기 풀, database.py)
+    DB_PROFILE: str = "default"
+    DB_READ_POOL_SIZE: int = 8            # 초과 시 같은 수만큼 임시 연결 허용
+    DB_WRITE_QUEUE_TIMEOUT: float = 30.0   # 쓰기 연결 대기 상한(초)
+    SQLITE_SYNCHRONOUS: str = "NORMAL"     # WAL + NORMAL: DB 손상은 없고, 전원 장애 시 최근 커밋만 유실될 수 있다
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # 판정 아카이브 (app.archive) — 종결 후 오래되었거나 아주 오래된 판정을 월별 파일로 이동
+    ARCHIVE_DIR: str = "./archive"
+    ARCHIVE_CLOSED_AFTER_DAYS: int = 90    # 종결 상태로 이 기간 변경이 없으면 이동
+    ARCHIVE_MAX_AGE_DAYS: int = 365        # 상태와 무관하게 생성 후 이 기간이 지나면 이동
+    ARCHIVE_BATCH_ROWS: int = 500          # 한 쓰기 트랜잭션에서 옮기는 판정 수
+    ARCHIVE_BATCH_PAUSE: float = 0.05      # 배치 사이 휴지(초) — 판정 쓰기에 잠금을 양보
+
+    # 룰 평가 순서: "adaptive" (실트래픽 통계로 all/any 재정렬) | "deterministic" (작성 순서, 감사용)
+    RULE_ORDERING_MODE: str = "adaptive"
+    RULE_REORDER_INTERVAL: int = 1000
+    # 룰 조건 복잡도 예산 — 관리자 쓰기 시점에 초과하면 거부한다
+    RULE_MAX_NODES: int = 64
+    RULE_MAX_DEPTH: int = 8
+    # 다른 워커 프로세스의 룰 변경 확인 간격(초) — rule_set_generation 한 행 조회. 0 이면 매 요청
+    RULE_SET_CHECK_SECONDS: float = 1.0
+
+    # 판정 설명 추적 (§11.4) — ?trace=true 요청 또는 표본. 표본 추적은 감사 로그에 남긴다
+    TRACE_SAMPLE_RATE: float = 0.0
+
+    # 요청 프로파일링 — 꺼져 있으면 라우트에 훅을 설치하지 않는다
+    PROFILING_ENABLED: bool = False
+    PROFILE_TOKEN: str = ""             # X-Profile 헤더 값이 일치하는 요청을 프로파일
+    PROFILE_SAMPLE_RATE: float = 0.0    # 0~1, 무작위 표본 비율
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_MAX_ARTIFACTS: int = 200    # 초과 시 오래된 것부터 삭제
+
+    # 작업 스케줄러 — 대화형 / 대량 레인 (app.scheduler)
+    SCHEDULER_ENABLED: bool = True
+    SCHED_INTERACTIVE_CONCURRENCY: int = 32
+    SCHED_INTERACTIVE_QUEUE: int = 512
+    SCHED_INTERACTIVE_WAIT: float = 30.0   # 대기 상한(초) — 넘으면 503
+    SCHED_BULK_CONCURRENCY: int = 2
+    SCHED_BULK_QUEUE: int = 16
+    SCHED_BULK_WAIT: float = 10.0          # 대기 상한(초) — 넘으면 429
+    SCHED_BULK_YIELD_AT: int = 16          # 대화형 실행 수가 이 이상이면 대량 요청을 새로 시작하지 않는다
+    SCHED_YIELD_MAX_WAIT: float = 0.5      # 대량 작업이 청크·배치마다 대화형 요청에 양보하는 최대 시간(초)
+
     class Config:
         env_file = ".env"
 
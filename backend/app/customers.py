@@ -0,0 +1,106 @@
+"""
+Customer Upsert — 사업자등록번호 기준 고객 upsert (§6.1, §6.2)
+
+판정 경로는 `INSERT ... ON CONFLICT (business_reg_no) DO UPDATE ... RETURNING id`
+한 문장으로 고객을 확정한다. 조회 후 삽입(2회 왕복) 사이에 같은 신규 법인에 대한
+동시 요청이 끼어들어 유니크 제약 위반이 나던 경쟁이 없다.
+이미 있는 고객은 법인명·사업 상태만 최신 입력으로 갱신하고, 나머지 속성은 최초 등록값을 유지한다.
+일괄 경로는 `upsert_customers` 로 수천 건을 한 문장에 처리한다.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.customer import Customer
+
+_INSERT_COLUMNS = ("business_reg_no", "corp_name", "customer_type", "domestic_flag", "business_status")
+_REFRESH_COLUMNS = ("corp_name", "business_status")
+
+# SQLite 바인드 변수 한도(32766) 안에서 한 문장에 넣을 행 수
+BULK_CHUNK = 5000
+
+
+def _upsert_statement(db: Session):
+    """방언별 ON CONFLICT 문. 지원하지 않는 DB 면 None."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    table = Customer.__table__
+    stmt = insert(table)
+    changed = None
+    for col in _REFRESH_COLUMNS:
+        differs = table.c[col].is_distinct_from(stmt.excluded[col])
+        changed = differs if changed is None else changed | differs
+    # 값이 같아도 DO UPDATE 로 행을 잠가 RETURNING 이 항상 id 를 돌려주게 한다.
+    # 검색 인덱스 트리거는 법인명이 실제로 바뀔 때만 동작한다 (search_index).
+    return stmt.on_conflict_do_update(
+        index_elements=["business_reg_no"],
+        set_={
+            **{col: stmt.excluded[col] for col in _REFRESH_COLUMNS},
+            "updated_at": case((changed, func.now()), else_=table.c.updated_at),
+        },
+    ).returning(table.c.business_reg_no, table.c.id)
+
+
+def _row(values: dict) -> dict:
+    return {col: values.get(col) for col in _INSERT_COLUMNS}
+
+
+def upsert_customer(db: Session, values: dict) -> int:
+    """고객 1건을 upsert 하고 id 를 반환한다 (커밋은 호출자)."""
+    stmt = _upsert_statement(db)
+    if stmt is not None:
+        return db.execute(stmt, _row(values)).one().id
+    return _fallback(db, [_row(values)])[values["business_reg_no"]]
+
+
+def upsert_customers(db: Session, rows: Iterable[dict], chunk: int = BULK_CHUNK) -> dict[str, int]:
+    """
+    고객 여러 건을 upsert 하고 {사업자등록번호: id} 를 반환한다 (커밋은 호출자).
+    같은 번호가 여러 번 나오면 마지막 값을 쓴다 — 한 문장에서 같은 행을 두 번 갱신할 수 없다.
+    """
+    unique = {r["business_reg_no"]: _row(r) for r in rows}
+    if not unique:
+        return {}
+    stmt = _upsert_statement(db)
+    if stmt is None:
+        return _fallback(db, list(unique.values()))
+    ids: dict[str, int] = {}
+    values = list(unique.values())
+    for start in range(0, len(values), chunk):
+        # 다중 VALUES 한 문장 (executemany 가 아니라 insertmanyvalues 페이지 하나)
+        result = db.execute(
+            stmt, values[start:start + chunk],
+            execution_options={"insertmanyvalues_page_size": chunk},
+        )
+        ids.update((reg_no, id_) for reg_no, id_ in result)
+    return ids
+
+
+def _fallback(db: Session, rows: list[dict]) -> dict[str, int]:
+    """ON CONFLICT 가 없는 DB: 조회 후 삽입/갱신."""
+    existing = {
+        c.business_reg_no: c
+        for c in db.execute(
+            select(Customer).where(Customer.business_reg_no.in_([r["business_reg_no"] for r in rows]))
+        ).scalars()
+    }
+    for row in rows:
+        customer = existing.get(row["business_reg_no"])
+        if customer is None:
+            customer = existing[row["business_reg_no"]] = Customer(**row)
+            db.add(customer)
+        else:
+            for col in _REFRESH_COLUMNS:
+                if getattr(customer, col) != row[col]:
+                    setattr(customer, col, row[col])
+    db.flush()
+    return {reg_no: c.id for reg_no, c in existing.items()}
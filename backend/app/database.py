@@ -1,17 +1,91 @@
-"""Database engine and session management."""
+"""
+Database engine and session management.
 
-from sqlalchemy import create_engine
+DB_PROFILE
+- "default"    : 엔진 하나 (기존 동작). 읽기 세션도 같은 엔진을 쓴다.
+- "production" : SQLite 운영 프로파일
+    · WAL 저널 + synchronous / cache_size / mmap_size / busy_timeout 튜닝
+    · 쓰기 엔진은 연결 1개 — 프로세스 안의 쓰기는 풀에서 줄을 서고 SQLite 잠금을 다투지 않는다
+    · 읽기 엔진은 query_only 연결 풀 (DB_READ_POOL_SIZE) — WAL 이므로 쓰기 중에도 막히지 않는다
+  읽기 전용 엔드포인트는 `get_read_db` 로 읽기 풀에 배정한다.
+  SQLite 가 아니면 프로파일과 무관하게 엔진 하나를 공유한다.
+"""
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-engine = create_engine(
+
+def _sqlite_pragmas(query_only: bool) -> list[str]:
+    pragmas = [
+        f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA cache_size = -{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if query_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+
+def _apply_on_connect(engine, pragmas: list[str]) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_engines(url: str, profile: str = "default", echo: bool = False):
+    """(쓰기 엔진, 읽기 엔진). default 프로파일이거나 SQLite 가 아니면 둘은 같은 객체."""
+    is_sqlite = url.startswith("sqlite")
+    connect_args = {"check_same_thread": False} if is_sqlite else {}
+    if profile != "production" or not is_sqlite or ":memory:" in url:
+        engine = create_engine(url, connect_args=connect_args, echo=echo)
+        return engine, engine
+
+    # 쓰기: 연결 1개. busy_timeout 은 다른 프로세스(배치 CLI 등)와의 잠금 대기용
+    write_engine = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DB_WRITE_QUEUE_TIMEOUT,
+        echo=echo,
+    )
+    _apply_on_connect(write_engine, _sqlite_pragmas(query_only=False))
+    # WAL 전환은 DB 파일에 기록되므로 읽기 연결을 열기 전에 한 번 연결해 둔다
+    with write_engine.connect():
+        pass
+
+    read_engine = create_engine(
+        url,
+        connect_args=connect_args,
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_POOL_SIZE,
+        echo=echo,
+    )
+    _apply_on_connect(read_engine, _sqlite_pragmas(query_only=True))
+    return write_engine, read_engine
+
+
+engine, read_engine = create_engines(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    echo=settings.DEBUG,
+    settings.DB_PROFILE,
+    # 운영 프로파일에서는 DEBUG 여도 SQL 로그를 찍지 않는다 (부하 시 병목)
+    echo=settings.DEBUG and settings.DB_PROFILE != "production",
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = (
+    SessionLocal if read_engine is engine
+    else sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+)
 
 
 def get_db():
@@ -21,3 +95,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """읽기 전용 엔드포인트용 세션. 운영 프로파일에서는 읽기 풀 연결을 쓴다."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,249 @@
+"""
+Batch Evaluator — §11 일괄 판정
+N개의 컨텍스트를 열 단위 NumPy 배열로 패킹하고, 컴파일된 조건 트리를 배열 연산으로
+평가하여 룰별 N 길이 매치 마스크를 만든다. 대량 재심사/백필 용도.
+
+열은 필드 경로별로 값을 정수 코드로 인코딩(팩터라이즈)한 배열이다. 조건 리프는
+필드 값 하나에만 의존하므로, 서로 다른 값마다 한 번씩만 평가해 조회표(LUT)를
+만들고 `lut[codes]` 로 N 행에 펼친다. 따라서 리프 의미는 단건 엔진과 정확히 같다.
+
+판정 병합은 나눠서 중복을 줄인다: `compile_determination` 은 서로 다른 룰 매치
+패턴마다, 서류 패키지는 (케이스 분류 결과, 계좌유형)마다 한 번씩 계산한 뒤
+둘의 조합마다 한 번 합친다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import numpy as np
+
+from app.engine.case_table import DIMENSIONS, CaseTable, get_case_table
+from app.engine.document_resolver import resolve_documents
+from app.engine.pipeline import merge_documents
+from app.engine.rule_compiler import CompiledRuleSet, _All, _Any, _Leaf, _Node, _Not
+from app.engine.rule_engine import DeterminationResult, RuleMatch, compile_determination
+
+# 키 자체가 없음 (None 과 구분 — 기본값 처리가 다르다)
+MISSING: Any = type("Missing", (), {"__repr__": lambda self: "MISSING"})()
+
+
+class Column:
+    """필드 경로 하나의 팩터라이즈된 열."""
+    __slots__ = ("path", "codes", "values")
+
+    def __init__(self, path: str, raw: list):
+        try:
+            values = list(dict.fromkeys(raw))
+            index = {v: i for i, v in enumerate(values)}
+            codes = np.fromiter(map(index.__getitem__, raw), dtype=np.int32, count=len(raw))
+        except TypeError:  # 해시 불가 값이 섞이면 행마다 별도 코드
+            values = list(raw)
+            codes = np.arange(len(raw), dtype=np.int32)
+        self.path = path
+        self.codes = codes
+        self.values = values
+
+    def lut(self, fn, dtype=bool) -> np.ndarray:
+        """서로 다른 값마다 `fn(단일 필드 컨텍스트)` 를 평가한 조회표."""
+        return np.array([fn(_synthetic(self.path, v)) for v in self.values], dtype=dtype)
+
+
+def _synthetic(path: str, value: Any) -> dict:
+    """필드 하나만 가진 컨텍스트. MISSING 이면 키를 만들지 않는다."""
+    if value is MISSING:
+        return {}
+    ctx: dict = {}
+    obj = ctx
+    parts = path.split(".")
+    for part in parts[:-1]:
+        obj[part] = {}
+        obj = obj[part]
+    obj[parts[-1]] = value
+    return ctx
+
+
+def _extract(contexts: list[dict], path: str, cache: dict[str, list]) -> list:
+    """경로의 값 목록. 공통 접두 경로(risk_flags 등)의 중간 결과는 cache 로 공유한다."""
+    if path in cache:
+        return cache[path]
+    head, _, tail = path.rpartition(".")
+    if head:
+        parent = _extract(contexts, head, cache)
+        vals = [v.get(tail, MISSING) if isinstance(v, dict) else MISSING for v in parent]
+    else:
+        vals = [c.get(tail, MISSING) for c in contexts]
+    cache[path] = vals
+    return vals
+
+
+class ColumnarContexts:
+    """필드 경로 → Column. 원본 컨텍스트는 형식 오류 조건의 행 단위 평가에만 쓴다."""
+
+    def __init__(self, contexts: Iterable[dict], paths: Iterable[str]):
+        self.contexts = list(contexts)
+        self.n = len(self.contexts)
+        cache: dict[str, list] = {}
+        self.columns = {p: Column(p, _extract(self.contexts, p, cache)) for p in dict.fromkeys(paths)}
+
+    def __len__(self) -> int:
+        return self.n
+
+
+@dataclass
+class BatchDetermination:
+    """
+    일괄 판정 결과. `results` 는 서로 다른 판정만 담고, `inverse[i]` 가 i 번째 행의
+    결과 인덱스다. 같은 판정의 행들은 같은 DeterminationResult 객체를 공유하므로
+    수정하지 말 것.
+    """
+    results: list[DeterminationResult]
+    inverse: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.inverse)
+
+    def __getitem__(self, i: int) -> DeterminationResult:
+        return self.results[self.inverse[i]]
+
+    def __iter__(self):
+        results = self.results
+        return (results[k] for k in self.inverse.tolist())
+
+
+class BatchEvaluator:
+    """컴파일된 룰셋 + 케이스 테이블의 일괄(열 단위) 평가기."""
+
+    def __init__(self, rule_set: CompiledRuleSet, case_table: CaseTable | None = None):
+        self.rule_set = rule_set
+        self.case_table = case_table or get_case_table()
+        fields = [
+            leaf.field
+            for rule in rule_set.rules
+            for leaf in rule.condition.leaves()
+            if leaf.field is not None
+        ]
+        self.paths = tuple(dict.fromkeys(
+            [key for key, _, _ in DIMENSIONS]
+            + [path for _, path, _ in self.case_table.flag_refs]
+            + fields
+        ))
+
+    def pack(self, contexts: Iterable[dict]) -> ColumnarContexts:
+        return ColumnarContexts(contexts, self.paths)
+
+    # ── 룰 매치 마스크 ──
+
+    def _node_mask(self, node: _Node, cols: ColumnarContexts) -> np.ndarray:
+        if isinstance(node, _Leaf):
+            if node.field is not None:
+                col = cols.columns[node.field]
+                return col.lut(node.test)[col.codes]
+            # 형식 오류/상수 조건: 원본 의미 그대로 행 단위 평가
+            return np.fromiter((node.test(c) for c in cols.contexts), dtype=bool, count=cols.n)
+        if isinstance(node, _All):
+            mask = np.ones(cols.n, dtype=bool)
+            for child in node.children:
+                mask &= self._node_mask(child, cols)
+                if not mask.any():
+                    break
+            return mask
+        if isinstance(node, _Any):
+            mask = np.zeros(cols.n, dtype=bool)
+            for child in node.children:
+                mask |= self._node_mask(child, cols)
+                if mask.all():
+                    break
+            return mask
+        if isinstance(node, _Not):
+            return ~self._node_mask(node.child, cols)
+        raise TypeError(f"unknown node {node!r}")
+
+    def match_masks(self, cols: ColumnarContexts) -> np.ndarray:
+        """(룰 수 × N) 불리언 행렬. 행 순서는 `rule_set.rules` (우선순위) 순서."""
+        masks = np.zeros((len(self.rule_set.rules), cols.n), dtype=bool)
+        for i, rule in enumerate(self.rule_set.rules):
+            masks[i] = self._node_mask(rule.condition, cols)
+        return masks
+
+    def evaluate_rules(self, contexts: Iterable[dict]) -> list[list[RuleMatch]]:
+        """각 컨텍스트에 대해 `evaluate_rules` 와 같은 매치 목록을 반환한다."""
+        cols = self.pack(contexts)
+        masks = self.match_masks(cols)
+        rules = self.rule_set.rules
+        return [[rules[i].to_match() for i in np.flatnonzero(masks[:, j])] for j in range(cols.n)]
+
+    # ── 케이스 분류 ──
+
+    def classify(self, cols: ColumnarContexts) -> np.ndarray:
+        """행별 케이스 테이블 outcome id (`case_table.outcomes[id]`)."""
+        table = self.case_table
+        ordinals = []
+        for dim, (key, _, _) in enumerate(DIMENSIONS):
+            col = cols.columns[key]
+            ordinals.append(col.lut(lambda ctx, d=dim: table.ordinal(d, ctx), np.int64)[col.codes])
+        flags = np.zeros(cols.n, dtype=np.int64)
+        for bit, path, test in table.flag_refs:
+            col = cols.columns[path]
+            flags |= col.lut(lambda ctx, t=test, b=bit: b if t(ctx) else 0, np.int64)[col.codes]
+        return table.classify_columns(*ordinals, flags)
+
+    # ── 판정 ──
+
+    def determine(self, contexts: Iterable[dict]) -> BatchDetermination:
+        """각 컨텍스트에 대해 `run_determination` 과 같은 판정을 일괄 계산한다."""
+        cols = self.pack(contexts)
+        if cols.n == 0:
+            return BatchDetermination([], np.zeros(0, dtype=np.int64))
+        masks = self.match_masks(cols)
+        outcome_ids = self.classify(cols)
+        account = cols.columns["account_type"]
+        rules = self.rule_set.rules
+        catalog = self.rule_set.catalog
+        outcomes = self.case_table.outcomes
+
+        # 1) 매치 패턴별 룰 결과 병합 — 케이스와 무관한 부분 (서류 목록은 3단계에서 렌더링)
+        rule_matches = [r.to_match() for r in rules]
+        packed = np.ascontiguousarray(np.packbits(masks, axis=0).T)
+        packed = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+        _, pattern_first, pattern_ids = np.unique(packed, return_index=True, return_inverse=True)
+        compiled = [
+            compile_determination(
+                "", [], [rule_matches[i] for i in np.flatnonzero(masks[:, row])], catalog, render=False,
+            )
+            for row in pattern_first.tolist()
+        ]
+
+        # 2) (케이스 결과, 계좌유형)별 서류 패키지
+        pkg_key = outcome_ids.astype(np.int64) * len(account.values) + account.codes
+        _, pkg_first, pkg_ids = np.unique(pkg_key, return_index=True, return_inverse=True)
+        packages = []
+        for row in pkg_first.tolist():
+            case_code, case_tags = outcomes[outcome_ids[row]]
+            account_type = account.values[account.codes[row]]
+            packages.append(resolve_documents(
+                case_code, list(case_tags), None if account_type is MISSING else account_type, catalog,
+            ))
+
+        # 3) 서로 다른 (패키지, 패턴) 조합마다 한 번 병합
+        combo = pkg_ids.ravel().astype(np.int64) * len(compiled) + pattern_ids.ravel()
+        _, combo_first, inverse = np.unique(combo, return_index=True, return_inverse=True)
+        results = []
+        for row in combo_first.tolist():
+            case_code, case_tags = outcomes[outcome_ids[row]]
+            c = compiled[pattern_ids.ravel()[row]]
+            result = DeterminationResult(
+                case_code=case_code,
+                # compile_determination 의 dict.fromkeys(case_tags + extra_tags) 와 동일
+                case_tags=tuple(dict.fromkeys((*case_tags, *c.case_tags))),
+                status=c.status,
+                blocked=c.blocked,
+                escalate=c.escalate,
+                explanations=c.explanations,
+                matched_rules=c.matched_rules,
+                required_mask=c.required_mask,
+                optional_mask=c.optional_mask,
+            )
+            results.append(merge_documents(result, packages[pkg_ids.ravel()[row]], catalog))
+        return BatchDetermination(results, inverse.ravel())
@@ -0,0 +1,245 @@
+"""
+Determination Bundle — 프론트엔드 오프라인 판정용 사전 계산 번들 (§11)
+
+룰셋 스냅샷 하나를 클라이언트가 네트워크 없이 판정할 수 있는 JSON 으로 내보낸다.
+입력 조합 전체의 결과를 그대로 나열하면 서로 다른 판정이 수십만 개가 되므로
+(계좌유형·신청자·위험 플래그가 독립적으로 조합됨), 판정을 이루는 부분마다 따로 물질화한다.
+
+- cases     : 케이스 테이블 전체 (차원 서수 × 플래그 마스크 → outcome). CaseTable 과 같은 인덱스.
+- rules     : 룰마다 참조 필드의 값 조합 전체에 대한 매치 진리표 (우선순위 순).
+- packages  : (outcome, 계좌유형) 마다 resolve_documents 결과.
+- documents / texts / tags : 서류 코드·안내 문구·태그 사전. 나머지는 모두 사전 인덱스로 참조한다.
+
+클라이언트는 표 조회 후 `compile_determination` + `merge_documents` 와 같은 규칙으로 합친다
+(상태 우선순위, 서류 합집합 — 사전 인덱스 순서가 카탈로그 렌더링 순서).
+`version` 은 내용 해시이므로 클라이언트 캐시 키·ETag 로 쓴다.
+
+    python -m app.engine.bundle -o ../frontend/public/determination-bundle.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+from functools import lru_cache
+from itertools import product
+from typing import Any
+
+from app.engine.batch import _synthetic
+from app.engine.case_table import DIMENSIONS, CaseTable, get_case_table
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.document_resolver import resolve_documents
+from app.engine.rule_compiler import CompiledRuleSet, _Node
+from app.engine.rule_engine import _STATUS_PRIORITY
+from app.engine.rule_validation import context_fields
+
+BUNDLE_FORMAT = 1
+
+
+class _Dictionary:
+    """값 → 인덱스 (첫 등장 순)."""
+
+    def __init__(self):
+        self.index: dict[Any, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        return self.index.setdefault(value, len(self.index))
+
+    def values(self) -> list:
+        return list(self.index)
+
+
+def _bits(mask: int) -> list[int]:
+    """비트셋 → 카탈로그 id 목록 (오름차순 = 렌더링 순서)."""
+    out = []
+    i = 0
+    while mask:
+        if mask & 1:
+            out.append(i)
+        mask >>= 1
+        i += 1
+    return out
+
+
+def _domain(field: str) -> list:
+    allowed = context_fields().get(field)
+    if allowed is None:
+        raise ValueError(f"값 범위를 알 수 없는 필드라 물질화할 수 없습니다: {field}")
+    # bool 은 [false, true], enum 은 정의 순서
+    if allowed == frozenset((True, False)):
+        return [False, True]
+    enum = next((e for key, e, _ in DIMENSIONS if key == field), None)
+    if enum is not None:
+        return [m.value for m in enum]
+    return sorted(allowed, key=str)
+
+
+def build_bundle(rule_set: CompiledRuleSet, case_table: CaseTable | None = None) -> dict:
+    """룰셋 스냅샷 → 번들 dict (`version` 포함)."""
+    table = case_table or get_case_table()
+    catalog = rule_set.catalog
+    texts = _Dictionary()
+    tags = _Dictionary()
+
+    # ── 필드 ──
+    field_names: list[str] = [key for key, _, _ in DIMENSIONS]
+    for rule in rule_set.rules:
+        for field in _refs(rule.condition):
+            if field not in field_names:
+                field_names.append(field)
+    fields = [{"name": name, "values": _domain(name)} for name in field_names]
+    field_index = {name: i for i, name in enumerate(field_names)}
+
+    # ── 케이스 테이블 ──
+    # 차원 값 → 서수는 CaseTable 과 같다 (모르는 값은 번들 밖이므로 클라이언트가 서버로 넘긴다)
+    outcomes = [[code, [tags(t) for t in case_tags]] for code, case_tags in table.outcomes]
+    cases = {
+        "dimensions": [field_index[key] for key, _, _ in DIMENSIONS],
+        "radices": list(table.radices),
+        "flags": [
+            {"bit": bit.bit_length() - 1, "field": path, "negate": ref_negated}
+            for (bit, path, _), ref_negated in zip(table.flag_refs, _negations(table))
+        ],
+        "flag_bits": table.flag_bits,
+        "outcomes": outcomes,
+        "table": list(table.outcome_ids),
+    }
+
+    # ── 룰 진리표 ──
+    rules = []
+    for rule in rule_set.rules:
+        m = rule.match
+        rules.append({
+            "name": texts(m.rule_name),
+            "fields": [field_index[f] for f in _refs(rule.condition)],
+            "truth": _truth_table(rule.condition),
+            "required": _bits(rule.required_mask),
+            "optional": _bits(rule.optional_mask),
+            "blocked": m.blocked,
+            "escalate": m.escalate,
+            "status": m.output_status,
+            "tags": [tags(t) for t in m.output_case_tags],
+            "explanation": texts(m.explanation) if m.explanation else None,
+        })
+
+    # ── 서류 패키지: (outcome, 계좌유형) ──
+    packages, package_table = _packages(table, catalog)
+    packages_by_id = [
+        {
+            **body,
+            "groups": [{**g, "description": texts(g["description"])} for g in body["groups"]],
+            "explanations": [texts(e) for e in body["explanations"]],
+        }
+        for body in packages
+    ]
+
+    bundle = {
+        "format": BUNDLE_FORMAT,
+        "rule_set_version": rule_set.version,
+        "fields": fields,
+        # 패키지 생성 중 카탈로그에 추가된 코드까지 포함해야 하므로 마지막에 만든다
+        "documents": list(catalog.render((1 << len(catalog)) - 1)),
+        "texts": texts.values(),
+        "tags": tags.values(),
+        "status_priority": dict(_STATUS_PRIORITY),
+        "cases": cases,
+        "rules": rules,
+        "packages": packages_by_id,
+        "package_table": package_table,
+    }
+    canonical = json.dumps(bundle, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    bundle["version"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    return bundle
+
+
+# ── 부분 재계산 ──
+# 룰 하나가 바뀐 스냅샷(`CompiledRuleSet.replace_rule`)은 나머지 룰의 노드와 카탈로그를 그대로 공유하므로,
+# 노드별 진리표와 룰과 무관한 패키지 표를 객체 기준으로 기억해 두면 바뀐 룰의 칸만 다시 계산한다.
+
+@lru_cache(maxsize=8192)
+def _refs(condition: _Node) -> tuple[str, ...]:
+    """조건이 참조하는 필드 (작성 순서, 중복 제거)."""
+    return tuple(dict.fromkeys(leaf.field for leaf in condition.leaves() if leaf.field is not None))
+
+
+@lru_cache(maxsize=8192)
+def _truth_table(condition: _Node) -> str:
+    """참조 필드 값 조합 전체(앞 필드가 상위 자릿수)에 대한 매치 여부 비트 문자열."""
+    refs = _refs(condition)
+    truth = []
+    for combo in product(*(_domain(f) for f in refs)):
+        ctx: dict = {}
+        for path, value in zip(refs, combo):
+            _merge(ctx, _synthetic(path, value))
+        truth.append("1" if condition.evaluate(ctx) else "0")
+    return "".join(truth)
+
+
+@lru_cache(maxsize=4)
+def _packages(table: CaseTable, catalog: DocumentCatalog) -> tuple[list[dict], list[int]]:
+    """
+    (outcome, 계좌유형) 마다 resolve_documents → 중복 제거한 패키지 목록과 패키지 표.
+    문구는 원문 그대로 두고 번들을 만들 때 사전 인덱스로 바꾼다. 카탈로그 id 는 추가만 되므로 유효하다.
+    """
+    package_ids = _Dictionary()
+    packages: list[dict] = []
+    package_table = []
+    for case_code, case_tags in table.outcomes:
+        for account in _domain("account_type"):
+            pkg = resolve_documents(case_code, list(case_tags), account, catalog)
+            body = {
+                "required": _bits(pkg.required_mask),
+                "conditional": _bits(pkg.conditional_mask),
+                "groups": [
+                    {
+                        "code": g.group_code,
+                        "documents": [catalog.intern(d) for d in g.documents],
+                        "min_required": g.min_required,
+                        "description": g.description,
+                    }
+                    for g in pkg.groups
+                ],
+                "explanations": list(pkg.explanations),
+            }
+            pid = package_ids(json.dumps(body, sort_keys=True, ensure_ascii=False))
+            if pid == len(packages):
+                packages.append(body)
+            package_table.append(pid)
+    return packages, package_table
+
+
+def _negations(table: CaseTable) -> list[bool]:
+    """flag_refs 와 같은 순서의 "!필드" 여부."""
+    return [ref.startswith("!") for f in table.definitions["flags"] for ref in f["any"]]
+
+
+def _merge(ctx: dict, part: dict) -> None:
+    for key, value in part.items():
+        if isinstance(value, dict) and isinstance(ctx.get(key), dict):
+            _merge(ctx[key], value)
+        else:
+            ctx[key] = value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="오프라인 판정 번들 내보내기")
+    parser.add_argument("-o", "--output", required=True, help="출력 JSON 경로")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal
+    from app.engine.rule_snapshot import get_rule_set
+
+    db = SessionLocal()
+    try:
+        bundle = build_bundle(get_rule_set(db))
+    finally:
+        db.close()
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"✅ 번들 {bundle['version']} (룰 {len(bundle['rules'])}, 패키지 {len(bundle['packages'])}) → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
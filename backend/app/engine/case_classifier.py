@@ -1,6 +1,11 @@
 """
 Case Classifier — §7
 입력값으로부터 케이스 코드(C01–C14)와 태그를 결정한다.
+
+판정 경로는 이 함수와 동일한 결과를 내는 조회 테이블(`case_table`)을 사용한다.
+이 함수는 기준 구현으로 유지되며, 분류 규칙을 바꿀 때는
+seed/case_classification.json 과 함께 수정하고
+`python -m scripts.check_case_table_parity` 로 일치 여부를 확인한다.
 """
 
 from app.enums import (
@@ -106,7 +111,7 @@ def classify_case(ctx: dict) -> tuple[str, list[str]]:
 
     # 상품 추가 (해외/파생/CMA 등) → C13 태그 추가 (케이스 코드는 유지)
     if account_type and account_type != AccountType.BROKERAGE_GENERAL:
-        product_tag = f"{account_type.value}_PRODUCT"
+        product_tag = f"{AccountType(account_type).value}_PRODUCT"
         tags.append(product_tag)
         # 특수 상품이 포함되면 C13 태그도 부착하되 기본 케이스코드는 유지
         if "C1" not in case_code or case_code in ("C01", "C02"):
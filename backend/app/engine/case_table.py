@@ -0,0 +1,192 @@
+"""
+Case Table — §7
+선언적 분류 정의(seed/case_classification.json)를 조회 테이블로 컴파일한다.
+
+테이블 인덱스는 고객유형·신청자유형·계좌유형·사업자상태의 enum 서수와
+플래그 비트마스크로 구성되며, 분류는 배열 인덱스 한 번으로 끝난다.
+
+정의 형식
+---------
+flags      : [{name, any: [필드, ...]}] — 선언 순서가 비트 위치.
+             "필드" 는 truthy 검사(없으면 False), "!필드" 는 falsy 검사(없으면 기본값 True 로 보아 False).
+base       : 위에서부터 첫 번째로 `when` 이 맞는 항목의 case_code/tags.
+modifiers  : 순서대로 적용. `when` 이 맞으면 tag 를 붙이고
+             (tag_unless_case_codes 에 현재 케이스가 있으면 생략),
+             set_case_code 로 케이스를 바꾼다 (from_case_codes / unless_case_codes 조건).
+when       : {차원: [값, ...]} 또는 {차원: {"not_in": [...]}} 또는 {"flag": 이름}.
+             알 수 없는 값(None 포함)은 어떤 값 목록에도 맞지 않는다.
+"""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from app.enums import AccountType, ApplicantType, BusinessStatus, CustomerType
+
+DEFINITIONS_PATH = Path(__file__).resolve().parent.parent / "seed" / "case_classification.json"
+
+# (컨텍스트 키, enum, 키가 없을 때 기본값) — 인덱스 자릿수 순서
+DIMENSIONS: tuple[tuple[str, type, Any], ...] = (
+    ("customer_type", CustomerType, None),
+    ("applicant_type", ApplicantType, None),
+    ("account_type", AccountType, None),
+    ("business_status", BusinessStatus, BusinessStatus.ACTIVE.value),
+)
+
+_DIM_INDEX = {name: i for i, (name, _, _) in enumerate(DIMENSIONS)}
+
+_MISSING = object()
+
+
+def _flag_test(ref: str) -> Callable[[dict], bool]:
+    negate = ref.startswith("!")
+    parts = tuple(ref.lstrip("!").split("."))
+
+    def test(ctx: dict) -> bool:
+        obj: Any = ctx
+        for part in parts:
+            obj = obj.get(part, _MISSING) if isinstance(obj, dict) else _MISSING
+            if obj is _MISSING:
+                # 누락: "필드" 는 False, "!필드" 는 기본값 True 의 부정이므로 역시 False
+                return False
+        return not obj if negate else bool(obj)
+    return test
+
+
+class CaseTable:
+    """컴파일된 케이스 분류 테이블."""
+
+    def __init__(self, definitions: dict):
+        self.definitions = definitions
+        self.flag_names = tuple(f["name"] for f in definitions["flags"])
+        self._flag_tests = tuple(
+            (1 << bit, tuple(_flag_test(ref) for ref in f["any"]))
+            for bit, f in enumerate(definitions["flags"])
+        )
+        # (비트, 필드 경로, 검사) — 필드 값 단위로 플래그를 계산하는 일괄 경로용
+        self.flag_refs = tuple(
+            (1 << bit, ref.lstrip("!"), _flag_test(ref))
+            for bit, f in enumerate(definitions["flags"])
+            for ref in f["any"]
+        )
+        # 차원별 값 → 서수. 마지막 서수(len(enum))는 알 수 없는 값.
+        self.domains = tuple(tuple(m.value for m in enum) for _, enum, _ in DIMENSIONS)
+        self._ordinals = tuple({v: i for i, v in enumerate(values)} for values in self.domains)
+        self.radices = tuple(len(values) + 1 for values in self.domains)
+        self.flag_bits = len(self.flag_names)
+
+        outcomes: dict[tuple, tuple[str, tuple[str, ...]]] = {}
+        table: list[tuple[str, tuple[str, ...]]] = []
+        # 인덱스 순서: 차원 서수(첫 차원이 최상위 자리) → 플래그 마스크
+        for ordinals in product(*(range(r) for r in self.radices)):
+            values = tuple(
+                domain[o] if o < len(domain) else None
+                for domain, o in zip(self.domains, ordinals)
+            )
+            for mask in range(1 << self.flag_bits):
+                outcome = self._interpret(values, mask)
+                outcome = outcomes.setdefault(outcome, outcome)
+                table.append(outcome)
+        ids = {o: i for i, o in enumerate(outcomes)}
+        outcome_ids = [ids[o] for o in table]
+
+        self.table = table
+        self.outcomes = tuple(outcomes)
+        self.outcome_ids = outcome_ids
+        self._outcome_id_array = None
+
+    # ── 선언적 정의 해석 (테이블 생성 시에만 사용) ──
+
+    def _when(self, when: dict, values: tuple, mask: int) -> bool:
+        for key, spec in when.items():
+            if key == "flag":
+                if not mask & (1 << self.flag_names.index(spec)):
+                    return False
+                continue
+            value = values[_DIM_INDEX[key]]
+            if isinstance(spec, dict):
+                if value is None or value in spec["not_in"]:
+                    return False
+            elif value not in spec:
+                return False
+        return True
+
+    def _interpret(self, values: tuple, mask: int) -> tuple[str, tuple[str, ...]]:
+        defs = self.definitions
+        base = next(b for b in defs["base"] if self._when(b["when"], values, mask))
+        case_code = base["case_code"]
+        tags = list(base.get("tags", []))
+        fmt = {name: v for (name, _, _), v in zip(DIMENSIONS, values)}
+
+        for mod in defs["modifiers"]:
+            if not self._when(mod["when"], values, mask):
+                continue
+            if "tag" in mod and case_code not in mod.get("tag_unless_case_codes", ()):
+                tags.append(mod["tag"].format(**fmt))
+            if "set_case_code" in mod:
+                if "from_case_codes" in mod and case_code not in mod["from_case_codes"]:
+                    continue
+                if case_code in mod.get("unless_case_codes", ()):
+                    continue
+                case_code = mod["set_case_code"]
+        return case_code, tuple(tags)
+
+    # ── 조회 ──
+
+    def index(self, ctx: dict) -> int:
+        """컨텍스트 → 테이블 인덱스."""
+        idx = 0
+        for (key, _, default), ordinals, radix in zip(DIMENSIONS, self._ordinals, self.radices):
+            value = ctx.get(key, default)
+            idx = idx * radix + ordinals.get(value, radix - 1)
+        mask = 0
+        for bit, tests in self._flag_tests:
+            for test in tests:
+                if test(ctx):
+                    mask |= bit
+                    break
+        return (idx << self.flag_bits) | mask
+
+    def ordinal(self, dim: int, ctx: dict) -> int:
+        """차원 `dim` 의 서수 (알 수 없는 값은 마지막 서수)."""
+        key, _, default = DIMENSIONS[dim]
+        return self._ordinals[dim].get(ctx.get(key, default), self.radices[dim] - 1)
+
+    def classify(self, ctx: dict) -> tuple[str, list[str]]:
+        """`classify_case(ctx)` 와 같은 (case_code, tags) 를 반환한다."""
+        case_code, tags = self.table[self.index(ctx)]
+        return case_code, list(tags)
+
+    def classify_many(self, contexts: Iterable[dict]) -> list[tuple[str, list[str]]]:
+        table = self.table
+        index = self.index
+        return [(code, list(tags)) for code, tags in (table[index(c)] for c in contexts)]
+
+    def classify_columns(self, customer, applicant, account, status, flags):
+        """
+        서수/플래그 배열(NumPy) 로 일괄 분류하여 outcome id 배열을 반환한다.
+        각 배열은 같은 길이이며, `self.outcomes[id]` 로 (case_code, tags) 를 얻는다.
+        """
+        import numpy as np
+
+        if self._outcome_id_array is None:
+            self._outcome_id_array = np.asarray(self.outcome_ids, dtype=np.int32)
+        r = self.radices
+        idx = ((customer.astype(np.int64) * r[1] + applicant) * r[2] + account) * r[3] + status
+        idx = (idx << self.flag_bits) | flags
+        return self._outcome_id_array[idx]
+
+
+def load_definitions(path: Path = DEFINITIONS_PATH) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=1)
+def get_case_table() -> CaseTable:
+    """기본 정의로 컴파일된 테이블 (프로세스당 1회 생성)."""
+    return CaseTable(load_definitions())
@@ -0,0 +1,101 @@
+"""
+Document Catalog — §8
+서류 코드를 조밀한 정수 ID로 인턴하고, 서류 집합을 비트셋(int)으로 표현한다.
+
+병합은 OR, 필수 제외는 AND-NOT 으로 처리하며, 코드 목록은 응답 직전에만
+카탈로그 순서(ID 오름차순)로 렌더링한다.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Any, Callable, Iterable
+
+# render() 결과 캐시 상한 — 서로 다른 서류 조합 수는 보통 수백 개 수준
+RENDER_CACHE_SIZE = 8192
+
+_MISSING = object()
+
+
+class DocumentCatalog:
+    """
+    서류 코드 ↔ 정수 ID 사전.
+
+    DocumentType 마스터 순서로 초기화하며, 마스터에 없는 코드(룰에만 등장)는
+    처음 등장할 때 뒤에 추가된다. 빈 카탈로그로 시작하면 ID 순서가 최초 등장
+    순서가 되므로 렌더링 결과가 기존 `dict.fromkeys` 중복 제거와 같다.
+    """
+    __slots__ = ("_ids", "_codes", "_lock", "_rendered", "_memo")
+
+    def __init__(self, codes: Iterable[str] = ()):
+        self._ids: dict[str, int] = {}
+        self._codes: list[str] = []
+        self._lock = threading.Lock()
+        self._rendered: dict[int, tuple[str, ...]] = {}
+        self._memo: dict = {}
+        for code in codes:
+            self.intern(code)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self._ids
+
+    def intern(self, code: str) -> int:
+        idx = self._ids.get(code)
+        if idx is None:
+            with self._lock:
+                idx = self._ids.get(code)
+                if idx is None:
+                    idx = len(self._codes)
+                    code = sys.intern(code)
+                    self._codes.append(code)
+                    self._ids[code] = idx
+        return idx
+
+    def bit(self, code: str) -> int:
+        return 1 << self.intern(code)
+
+    def mask(self, codes: Iterable[str]) -> int:
+        """코드 목록 → 비트셋."""
+        ids = self._ids
+        m = 0
+        for code in codes:
+            idx = ids.get(code)
+            m |= 1 << (self.intern(code) if idx is None else idx)
+        return m
+
+    def render(self, mask: int) -> tuple[str, ...]:
+        """
+        비트셋 → 카탈로그 순서의 코드 튜플. 비용은 설정된 비트 수에 비례한다.
+        같은 비트셋은 같은 튜플 객체를 돌려준다 (판정 결과들이 공유).
+        """
+        out = self._rendered.get(mask)
+        if out is None:
+            codes = self._codes
+            items = []
+            m = mask
+            while m:
+                low = m & -m
+                items.append(codes[low.bit_length() - 1])
+                m ^= low
+            out = tuple(items)
+            if len(self._rendered) >= RENDER_CACHE_SIZE:
+                self._rendered.clear()
+            self._rendered[mask] = out
+        return out
+
+    def memo(self, key, build: Callable[[], Any]) -> Any:
+        """
+        카탈로그에 종속된 불변 파생값(서류 패키지 등)의 캐시.
+        카탈로그는 코드를 뒤에 추가만 하므로 기존 비트셋으로 만든 값은 계속 유효하다.
+        """
+        value = self._memo.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            if len(self._memo) >= RENDER_CACHE_SIZE:
+                self._memo.clear()
+            self._memo[key] = value
+        return value
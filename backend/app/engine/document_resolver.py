@@ -5,25 +5,33 @@ Document Resolver — §9, §18
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from typing import Sequence
 
+from app.engine.document_catalog import DocumentCatalog
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class DocumentGroup:
     """대체 가능 서류 그룹 (§18)."""
     group_code: str
-    documents: list[str]
+    documents: tuple[str, ...]
     min_required: int = 1  # 그룹 내 최소 제출 수
     description: str = ""
+    mask: int = 0  # documents 비트셋
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DocumentPackage:
-    """케이스에 대한 서류 패키지."""
-    required: list[str] = field(default_factory=list)
-    conditional: list[str] = field(default_factory=list)
-    groups: list[DocumentGroup] = field(default_factory=list)
-    explanations: list[str] = field(default_factory=list)
+    """케이스에 대한 서류 패키지. 같은 카탈로그·입력이면 같은 객체가 공유된다."""
+    required: tuple[str, ...] = ()
+    conditional: tuple[str, ...] = ()
+    groups: tuple[DocumentGroup, ...] = ()
+    explanations: tuple[str, ...] = ()
+    required_mask: int = 0
+    conditional_mask: int = 0
+    # (안내 문구, 그 단계에서 추가된 필수서류 비트셋) — 설명 추적의 서류 귀속용
+    required_sources: tuple[tuple[str, int], ...] = ()
 
 
 # ──────────────────────────────────────────────
@@ -119,26 +127,59 @@ _PRODUCT_DOCS = {
 }
 
 
-def resolve_documents(case_code: str, case_tags: list[str], account_type: str | None = None) -> DocumentPackage:
+def resolve_documents(
+    case_code: str,
+    case_tags: Sequence[str],
+    account_type: str | None = None,
+    catalog: DocumentCatalog | None = None,
+) -> DocumentPackage:
     """
     케이스 코드 + 태그 + 계좌유형으로 필요 서류 패키지를 생성한다.
     이 함수는 룰 엔진의 DB 룰이 없을 때 fallback으로 사용되며,
     실제 운영에서는 DB 룰의 결과가 우선한다.
+
+    서류 집합은 `catalog` 기준 비트셋으로 누적하고 마지막에 한 번만 렌더링한다.
+    결과는 불변이므로 카탈로그별로 캐시하며, 태그는 결과에 영향을 주는 것만 키에 넣는다.
     """
-    pkg = DocumentPackage()
+    if catalog is None:
+        catalog = DocumentCatalog()
+    key = (
+        "documents", case_code, account_type,
+        "NEW_CORP" in case_tags, "UBO_COMPLEX" in case_tags, "HIGH_RISK" in case_tags,
+    )
+    return catalog.memo(key, lambda: _build_package(case_code, case_tags, account_type, catalog))
+
+
+def _build_package(
+    case_code: str,
+    case_tags: Sequence[str],
+    account_type: str | None,
+    catalog: DocumentCatalog,
+) -> DocumentPackage:
+    explanations: list[str] = []
+    groups: list[DocumentGroup] = []
+    sources: list[tuple[str, int]] = []
+    required = 0
+    conditional = 0
+
+    def require(documents: list[str], explanation: str) -> None:
+        nonlocal required
+        mask = catalog.mask(documents)
+        required |= mask
+        explanations.append(explanation)
+        sources.append((explanation, mask))
 
     # ── 기본 서류 (모든 케이스 공통) ──
-    pkg.required.extend(_C01_BASE)
-    pkg.conditional.extend(_C01_CONDITIONAL)
-    pkg.explanations.append("기본 법인 계좌개설 필수서류가 포함됩니다.")
+    require(_C01_BASE, "기본 법인 계좌개설 필수서류가 포함됩니다.")
+    conditional |= catalog.mask(_C01_CONDITIONAL)
 
     # ── 케이스별 추가 ──
     if case_code in ("C02", "C03", "C07"):
         # 대리인 서류
-        pkg.required.extend(_PROXY_DOCS)
-        pkg.explanations.append("대리 신청이므로 대리인 신분증과 위임장이 필요합니다.")
+        require(_PROXY_DOCS, "대리 신청이므로 대리인 신분증과 위임장이 필요합니다.")
         # 인감증명/사용인감 대체 그룹
-        pkg.groups.append(DocumentGroup(
+        groups.append(_group(
+            catalog,
             group_code="SEAL_CERT_GROUP",
             documents=["DOC_CORPORATE_SEAL_CERTIFICATE", "DOC_USE_OF_SEAL_FORM"],
             min_required=1,
@@ -146,62 +187,63 @@ def resolve_documents(case_code: str, case_tags: list[str], account_type: str |
         ))
 
     if case_code == "C02":
-        pkg.required.extend(_INTERNAL_PROXY_EXTRA)
-        pkg.explanations.append("임직원 대리이므로 재직증명서가 필요합니다.")
+        require(_INTERNAL_PROXY_EXTRA, "임직원 대리이므로 재직증명서가 필요합니다.")
 
     if case_code == "C03":
-        pkg.required.extend(_EXTERNAL_PROXY_EXTRA)
-        pkg.explanations.append("외부 대리인이므로 대리권 소명자료와 결의서가 필요합니다.")
+        require(_EXTERNAL_PROXY_EXTRA, "외부 대리인이므로 대리권 소명자료와 결의서가 필요합니다.")
 
     if case_code in ("C04", "C05"):
-        pkg.required.extend(_JOINT_REP_DOCS)
-        pkg.explanations.append("공동대표 구조이므로 권한 확인 서류가 필요합니다.")
+        require(_JOINT_REP_DOCS, "공동대표 구조이므로 권한 확인 서류가 필요합니다.")
         if case_code == "C05":
-            pkg.explanations.append("공동행사가 필요하므로 전원의 서명/날인이 확인되어야 합니다.")
+            explanations.append("공동행사가 필요하므로 전원의 서명/날인이 확인되어야 합니다.")
 
     if case_code in ("C06", "C07"):
-        pkg.required.extend(_NON_PROFIT_DOCS)
-        pkg.explanations.append("비영리법인이므로 정관/규약이 필요합니다.")
+        require(_NON_PROFIT_DOCS, "비영리법인이므로 정관/규약이 필요합니다.")
 
     if case_code == "C08":
-        pkg.required.extend(_NON_CORP_ORG_DOCS)
-        pkg.explanations.append("법인격 없는 단체이므로 회칙/규약이 필요합니다.")
+        require(_NON_CORP_ORG_DOCS, "법인격 없는 단체이므로 회칙/규약이 필요합니다.")
 
     if case_code == "C09":
-        pkg.required.extend(_FOREIGN_CORP_DOCS)
-        pkg.explanations.append("외국법인이므로 설립증빙, 번역문, 공증 서류가 필요합니다.")
+        require(_FOREIGN_CORP_DOCS, "외국법인이므로 설립증빙, 번역문, 공증 서류가 필요합니다.")
 
     if case_code == "C10" or "NEW_CORP" in case_tags:
-        pkg.required.extend(_NEW_CORP_DOCS)
-        pkg.conditional.append("DOC_STARTUP_SUPPORT_PROOF")
-        pkg.explanations.append("신설법인이므로 사업장 증빙이 필요합니다.")
+        require(_NEW_CORP_DOCS, "신설법인이므로 사업장 증빙이 필요합니다.")
+        conditional |= catalog.bit("DOC_STARTUP_SUPPORT_PROOF")
 
     if case_code == "C11" or "UBO_COMPLEX" in case_tags:
-        pkg.required.extend(_UBO_COMPLEX_DOCS)
-        pkg.explanations.append("실제소유자 확인 곤란으로 추가 지배구조 서류가 필요합니다.")
+        require(_UBO_COMPLEX_DOCS, "실제소유자 확인 곤란으로 추가 지배구조 서류가 필요합니다.")
 
     if case_code == "C12" or "HIGH_RISK" in case_tags:
-        pkg.required.extend(_HIGH_RISK_DOCS)
-        pkg.explanations.append("고위험 플래그로 인해 강화된 심사 서류가 필요합니다.")
+        require(_HIGH_RISK_DOCS, "고위험 플래그로 인해 강화된 심사 서류가 필요합니다.")
 
     # ── 상품별 추가 (C13) ──
     if account_type and account_type != "BROKERAGE_GENERAL":
         product_docs = _PRODUCT_DOCS.get(account_type, [])
         if product_docs:
-            pkg.required.extend(product_docs)
-            pkg.explanations.append(f"{account_type} 상품 관련 추가 서류가 필요합니다.")
+            require(product_docs, f"{account_type} 상품 관련 추가 서류가 필요합니다.")
 
     # ── 대체 가능 서류 공통 그룹 (§18) ──
-    if "DOC_SHAREHOLDER_REGISTER" not in pkg.required:
-        pkg.groups.append(DocumentGroup(
+    if not required & catalog.bit("DOC_SHAREHOLDER_REGISTER"):
+        groups.append(_group(
+            catalog,
             group_code="OWNERSHIP_PROOF_GROUP",
             documents=["DOC_SHAREHOLDER_REGISTER", "DOC_MEMBER_REGISTER"],
             min_required=1,
             description="주주명부 또는 사원명부/출자자명부 중 1개",
         ))
 
-    # 중복 제거
-    pkg.required = list(dict.fromkeys(pkg.required))
-    pkg.conditional = [d for d in dict.fromkeys(pkg.conditional) if d not in pkg.required]
-
-    return pkg
+    # 필수에 포함된 서류는 조건부에서 제외
+    conditional &= ~required
+    return DocumentPackage(
+        required=catalog.render(required),
+        conditional=catalog.render(conditional),
+        groups=tuple(groups),
+        explanations=tuple(explanations),
+        required_mask=required,
+        conditional_mask=conditional,
+        required_sources=tuple(sources),
+    )
+
+
+def _group(catalog: DocumentCatalog, documents: list[str], **kwargs) -> DocumentGroup:
+    return DocumentGroup(documents=tuple(documents), mask=catalog.mask(documents), **kwargs)
@@ -0,0 +1,104 @@
+"""
+Determination Pipeline — §7 → §11 → §9
+컨텍스트 하나에 대해 케이스 분류 · 룰 평가 · 서류 패키지 병합을 수행한다.
+DB 에 의존하지 않으며, 판정 API 와 일괄 처리 경로가 공유한다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Sequence
+
+from app.engine.case_table import CaseTable, get_case_table
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.document_resolver import DocumentPackage, resolve_documents
+from app.engine.rule_compiler import CompiledRuleSet
+from app.engine.rule_engine import DeterminationResult, RuleMatch, compile_determination
+
+
+def merge_documents(
+    result: DeterminationResult,
+    doc_pkg: DocumentPackage,
+    catalog: DocumentCatalog,
+) -> DeterminationResult:
+    """룰 결과의 서류에 resolver 서류를 병합한 새 결과를 만든다 (비트셋 OR / AND-NOT)."""
+    required_mask = result.required_mask | doc_pkg.required_mask
+    optional_mask = (result.optional_mask | doc_pkg.conditional_mask) & ~required_mask
+    if result.explanations:
+        explanations = tuple(dict.fromkeys(result.explanations + doc_pkg.explanations))
+    else:
+        explanations = doc_pkg.explanations
+    return replace(
+        result,
+        required_mask=required_mask,
+        optional_mask=optional_mask,
+        required_documents=catalog.render(required_mask),
+        optional_documents=catalog.render(optional_mask),
+        explanations=explanations,
+        document_groups=doc_pkg.groups,
+    )
+
+
+def finalize_determination(
+    case_code: str,
+    case_tags: Sequence[str],
+    matches: Sequence[RuleMatch],
+    account_type: str | None,
+    catalog: DocumentCatalog,
+) -> DeterminationResult:
+    """룰 매칭 결과를 병합하고 document_resolver 서류 패키지로 보완한다."""
+    result = compile_determination(case_code, case_tags, matches, catalog, render=False)
+    doc_pkg = resolve_documents(case_code, case_tags, account_type, catalog)
+    return merge_documents(result, doc_pkg, catalog)
+
+
+def run_determination(
+    context: dict,
+    rule_set: CompiledRuleSet,
+    case_table: CaseTable | None = None,
+) -> DeterminationResult:
+    """컨텍스트 → 최종 판정 (대체서류 그룹 포함)."""
+    case_code, case_tags = (case_table or get_case_table()).classify(context)
+    matches = rule_set.evaluate(context)
+    return finalize_determination(
+        case_code, case_tags, matches, context.get("account_type"), rule_set.catalog,
+    )
+
+
+def run_traced_determination(
+    context: dict,
+    rule_set: CompiledRuleSet,
+    case_table: CaseTable | None = None,
+) -> tuple[DeterminationResult, dict]:
+    """
+    `run_determination` 과 같은 결과 + 설명 추적 (§11.4).
+    룰별 평가 트리와, 필수서류마다 그 서류를 요구한 룰(조건 포함)·케이스 규정을 돌려준다.
+    일반 판정 경로와 분리되어 있어 추적하지 않는 요청에는 비용이 없다.
+    """
+    case_code, case_tags = (case_table or get_case_table()).classify(context)
+    matches, rule_traces = rule_set.trace(context)
+    account_type = context.get("account_type")
+    catalog = rule_set.catalog
+    result = finalize_determination(case_code, case_tags, matches, account_type, catalog)
+    doc_pkg = resolve_documents(case_code, case_tags, account_type, catalog)
+
+    conditions = {r.rule.get("id"): r.rule.get("conditions") for r in rule_set.rules}
+    documents = {}
+    for code in result.required_documents:
+        bit = catalog.bit(code)
+        sources: list[dict] = [
+            {"source": "rule", "rule": m.rule_name, "condition": conditions.get(m.rule_id)}
+            for m in matches if m.required_mask & bit
+        ]
+        sources += [
+            {"source": "case", "case_code": case_code, "reason": reason}
+            for reason, mask in doc_pkg.required_sources if mask & bit
+        ]
+        documents[code] = sources
+    trace = {
+        "case_code": case_code,
+        "case_tags": list(case_tags),
+        "rules": rule_traces,
+        "required_documents": documents,
+    }
+    return result, trace
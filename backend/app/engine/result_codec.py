@@ -0,0 +1,73 @@
+"""
+Result Codec — 판정 결과의 정규 직렬화
+판정 결과를 응답 필드 순서의 dict 로 한 번 만들고 한 번 인코딩한다.
+같은 바이트를 HTTP 응답 본문, determination_result_json 컬럼, 감사 로그에 재사용한다.
+
+orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 으로 같은 형식(UTF-8, 공백 없음)을 만든다.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from app.engine.rule_engine import DeterminationResult
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 은 선택 의존성
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """dict/list → UTF-8 JSON 바이트 (비ASCII 문자는 이스케이프하지 않음)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def result_payload(result: DeterminationResult) -> dict:
+    """DeterminationResponse 와 같은 필드·순서의 dict. trace 는 추적 요청일 때만 채운다 (그 밖에는 null)."""
+    return {
+        "case_code": result.case_code,
+        "case_tags": result.case_tags,
+        "status": result.status,
+        "required_documents": result.required_documents,
+        "optional_documents": result.optional_documents,
+        "document_groups": [
+            {
+                "group_code": g.group_code,
+                "documents": g.documents,
+                "min_required": g.min_required,
+                "description": g.description,
+            }
+            for g in result.document_groups
+        ],
+        "blocked": result.blocked,
+        "escalate": result.escalate,
+        "explanations": result.explanations,
+        "matched_rules": result.matched_rules,
+        "trace": None,
+    }
+
+
+class EncodedResult:
+    """한 번 인코딩된 판정 결과. `body` 는 응답 본문, `text` 는 DB/감사 로그용."""
+    __slots__ = ("payload", "body", "_text")
+
+    def __init__(self, result: DeterminationResult):
+        self.payload = result_payload(result)
+        self.body = dumps(self.payload)
+        self._text: str | None = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.body.decode("utf-8")
+        return self._text
@@ -0,0 +1,503 @@
+"""
+Rule Compiler — §11.2
+JSON 조건 트리를 평가 노드로 컴파일하고, 실트래픽 통계에 따라
+all/any 자식 순서를 조정(적응형 단락 평가)한다.
+
+평가 결과는 항상 `evaluate_rules` 와 동일하다. 조건 리프는 부수효과가 없으므로
+all/any 자식의 순서를 바꿔도 결과는 같고, 평가되는 리프 수만 달라진다.
+
+설명 추적(§11.4)은 별도 메서드 `trace()` 로만 수행한다. evaluate/observe 경로에는
+추적 여부 분기나 추가 할당이 없다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Iterable, Mapping
+
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.rule_engine import RuleMatch, _resolve_field, evaluate_condition
+
+
+# ──────────────────────────────────────────────
+# 평가 노드
+# ──────────────────────────────────────────────
+
+class _Node:
+    """컴파일된 조건 노드. hits/passes 는 적응형 모드에서만 증가한다."""
+    __slots__ = ("hits", "passes", "cost", "commutative")
+
+    def __init__(self, cost: int, commutative: bool):
+        self.hits = 0
+        self.passes = 0
+        self.cost = cost                # 정적 비용: 하위 리프 수
+        self.commutative = commutative  # 자식 순서 변경이 결과에 영향이 없는지
+
+    def pass_rate(self) -> float:
+        # Laplace 보정 — 한 번도 도달하지 않은 노드는 0.5
+        return (self.passes + 1) / (self.hits + 2)
+
+    def decay(self) -> None:
+        self.hits >>= 1
+        self.passes >>= 1
+
+
+class _Leaf(_Node):
+    __slots__ = ("test", "field", "source")
+
+    def __init__(
+        self,
+        test: Callable[[dict], bool],
+        commutative: bool = True,
+        field: str | None = None,
+        source: Any = None,
+    ):
+        super().__init__(1, commutative)
+        self.test = test
+        self.field = field  # 결과가 이 필드 값에만 의존할 때 (일괄 평가용)
+        self.source = source  # 원본 JSON 조건 (추적 출력용)
+
+    def evaluate(self, ctx: dict) -> bool:
+        return self.test(ctx)
+
+    def observe(self, ctx: dict) -> bool:
+        self.hits += 1
+        if self.test(ctx):
+            self.passes += 1
+            return True
+        return False
+
+    def trace(self, ctx: dict) -> tuple[bool, dict]:
+        result = bool(self.test(ctx))
+        if not isinstance(self.source, dict):
+            return result, {"condition": self.source, "result": result}
+        out = dict(self.source)
+        if isinstance(out.get("field"), str):
+            out["value"] = _resolve_field(ctx, out["field"])
+        out["result"] = result
+        return result, out
+
+    def leaves(self):
+        yield self
+
+    def walk(self):
+        yield self
+
+
+class _Branch(_Node):
+    __slots__ = ("children", "authored")
+    op = ""
+    stop_on = False  # 이 결과가 나온 자식에서 단락 평가한다
+
+    def __init__(self, children: list[_Node]):
+        super().__init__(
+            sum(c.cost for c in children),
+            all(c.commutative for c in children),
+        )
+        self.children = tuple(children)
+        self.authored = self.children  # 관리자가 작성한 원래 순서
+
+    def trace(self, ctx: dict) -> tuple[bool, dict]:
+        """현재 평가 순서대로 자식을 추적한다. 단락 지점 이후 자식은 skipped 로 센다."""
+        steps = []
+        result = not self.stop_on
+        for c in self.children:
+            r, step = c.trace(ctx)
+            steps.append(step)
+            if r is self.stop_on:
+                result = self.stop_on
+                break
+        out = {"op": self.op, "result": result, "children": steps}
+        skipped = len(self.children) - len(steps)
+        if skipped:
+            out["short_circuit"] = len(steps) - 1
+            out["skipped"] = skipped
+        return result, out
+
+    def leaves(self):
+        for c in self.authored:
+            yield from c.leaves()
+
+    def walk(self):
+        yield self
+        for c in self.authored:
+            yield from c.walk()
+
+
+class _All(_Branch):
+    __slots__ = ()
+    op = "all"
+    stop_on = False
+
+    def evaluate(self, ctx: dict) -> bool:
+        for c in self.children:
+            if not c.evaluate(ctx):
+                return False
+        return True
+
+    def observe(self, ctx: dict) -> bool:
+        self.hits += 1
+        for c in self.children:
+            if not c.observe(ctx):
+                return False
+        self.passes += 1
+        return True
+
+    def _order_key(self, child: _Node) -> float:
+        # 실패 확률 대비 비용이 낮은 자식을 먼저 평가
+        return child.cost / max(1.0 - child.pass_rate(), 1e-9)
+
+
+class _Any(_Branch):
+    __slots__ = ()
+    op = "any"
+    stop_on = True
+
+    def evaluate(self, ctx: dict) -> bool:
+        for c in self.children:
+            if c.evaluate(ctx):
+                return True
+        return False
+
+    def observe(self, ctx: dict) -> bool:
+        self.hits += 1
+        for c in self.children:
+            if c.observe(ctx):
+                self.passes += 1
+                return True
+        return False
+
+    def _order_key(self, child: _Node) -> float:
+        # 통과 확률 대비 비용이 낮은 자식을 먼저 평가
+        return child.cost / max(child.pass_rate(), 1e-9)
+
+
+class _Not(_Node):
+    __slots__ = ("child",)
+
+    def __init__(self, child: _Node):
+        super().__init__(child.cost, child.commutative)
+        self.child = child
+
+    def evaluate(self, ctx: dict) -> bool:
+        return not self.child.evaluate(ctx)
+
+    def observe(self, ctx: dict) -> bool:
+        self.hits += 1
+        if self.child.observe(ctx):
+            return False
+        self.passes += 1
+        return True
+
+    def trace(self, ctx: dict) -> tuple[bool, dict]:
+        r, step = self.child.trace(ctx)
+        return not r, {"op": "not", "result": not r, "child": step}
+
+    def leaves(self):
+        yield from self.child.leaves()
+
+    def walk(self):
+        yield self
+        yield from self.child.walk()
+
+
+# ──────────────────────────────────────────────
+# 컴파일
+# ──────────────────────────────────────────────
+
+def _field_getter(field_path: str) -> Callable[[dict], Any]:
+    """`_resolve_field` 와 동일한 의미의 필드 접근자를 만든다."""
+    parts = tuple(field_path.split("."))
+    if len(parts) == 1:
+        (name,) = parts
+        return lambda ctx: ctx.get(name)
+    if len(parts) == 2:
+        head, tail = parts
+
+        def get2(ctx: dict) -> Any:
+            obj = ctx.get(head)
+            return obj.get(tail) if isinstance(obj, dict) else None
+        return get2
+
+    def get_n(ctx: dict) -> Any:
+        obj: Any = ctx
+        for part in parts:
+            if isinstance(obj, dict):
+                obj = obj.get(part)
+            else:
+                return None
+        return obj
+    return get_n
+
+
+def _compile_leaf(condition: dict) -> _Leaf:
+    field_name = condition.get("field")
+    if field_name is None:
+        return _Leaf(lambda ctx: False, source=condition)
+    if not isinstance(field_name, str):
+        return _opaque(condition)
+    get = _field_getter(field_name)
+
+    # 연산자 우선순위는 evaluate_condition 과 동일
+    if "eq" in condition:
+        expected = condition["eq"]
+        return _Leaf(lambda ctx: get(ctx) == expected, field=field_name, source=condition)
+    if "neq" in condition:
+        expected = condition["neq"]
+        return _Leaf(lambda ctx: get(ctx) != expected, field=field_name, source=condition)
+    if "in" in condition:
+        options = condition["in"]
+        if not isinstance(options, (list, tuple)):
+            return _opaque(condition)
+        options = tuple(options)
+        return _Leaf(lambda ctx: get(ctx) in options, field=field_name, source=condition)
+    if "not_in" in condition:
+        options = condition["not_in"]
+        if not isinstance(options, (list, tuple)):
+            return _opaque(condition)
+        options = tuple(options)
+        return _Leaf(lambda ctx: get(ctx) not in options, field=field_name, source=condition)
+    if "is_true" in condition:
+        return _Leaf(lambda ctx: bool(get(ctx)), field=field_name, source=condition)
+    if "is_false" in condition:
+        return _Leaf(lambda ctx: not get(ctx), field=field_name, source=condition)
+    if "exists" in condition:
+        if condition["exists"]:
+            return _Leaf(lambda ctx: get(ctx) is not None, field=field_name, source=condition)
+        return _Leaf(lambda ctx: get(ctx) is None, field=field_name, source=condition)
+
+    return _Leaf(lambda ctx: False, source=condition)
+
+
+def _opaque(condition: Any) -> _Leaf:
+    """형식이 어긋난 조건은 원본 평가기에 위임하고 순서를 고정한다."""
+    return _Leaf(lambda ctx: evaluate_condition(condition, ctx), commutative=False, source=condition)
+
+
+def compile_condition(condition: Any) -> _Node:
+    """JSON 조건을 평가 노드 트리로 컴파일한다."""
+    if not isinstance(condition, dict):
+        return _opaque(condition)
+
+    for op, cls in (("all", _All), ("any", _Any)):
+        if op in condition:
+            children = condition[op]
+            if not isinstance(children, list) or not all(isinstance(c, dict) for c in children):
+                return _opaque(condition)
+            return cls([compile_condition(c) for c in children])
+    if "not" in condition:
+        return _Not(compile_condition(condition["not"]))
+
+    return _compile_leaf(condition)
+
+
+def _canonical_rule(rule: dict) -> str:
+    return json.dumps(rule, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _digest(canonical_rules: Iterable[str]) -> str:
+    """id 순 룰 정규화 JSON 들을 JSON 배열로 이어 붙인 sha256 (`ruleset_hash` 와 같은 값)."""
+    h = hashlib.sha256(b"[")
+    for i, c in enumerate(canonical_rules):
+        if i:
+            h.update(b",")
+        h.update(c.encode("utf-8"))
+    h.update(b"]")
+    return h.hexdigest()
+
+
+def ruleset_hash(rules_data: list[dict]) -> str:
+    """룰셋 내용의 안정적인 해시 (버전 스탬프)."""
+    return _digest(_canonical_rule(r) for r in sorted(rules_data, key=lambda r: r.get("id", 0)))
+
+
+# ──────────────────────────────────────────────
+# 컴파일된 룰셋
+# ──────────────────────────────────────────────
+
+class CompiledRule:
+    __slots__ = ("rule", "condition", "required_mask", "optional_mask", "match")
+
+    def __init__(self, rule: dict, condition: _Node, catalog: DocumentCatalog):
+        self.rule = rule
+        self.condition = condition
+        self.required_mask = catalog.mask(rule.get("required_documents", []))
+        self.optional_mask = catalog.mask(rule.get("optional_documents", []))
+        # 불변이므로 룰당 하나를 미리 만들어 모든 판정이 공유한다
+        self.match = RuleMatch.from_rule(rule, self.required_mask, self.optional_mask)
+
+    def to_match(self) -> RuleMatch:
+        return self.match
+
+
+class CompiledRuleSet:
+    """
+    우선순위 정렬·컴파일된 룰셋.
+
+    Parameters
+    ----------
+    rules_data : list[dict]
+        `evaluate_rules` 와 동일한 형식의 룰 딕셔너리.
+    adaptive : bool
+        True 이면 노드별 통과/실패 통계를 수집하고 `reorder_interval` 건마다
+        all/any 자식을 재정렬한다. False(결정적 모드)이면 작성 순서 그대로
+        평가한다 — 감사 재현용.
+    record_stats : bool | None
+        통계만 수집하고 재정렬은 하지 않으려면 adaptive=False, record_stats=True.
+        기본값은 adaptive 와 같다.
+    catalog : DocumentCatalog | None
+        서류 비트셋의 기준 카탈로그. 보통 DocumentType 마스터로 초기화한다.
+    precompiled : Mapping | None
+        룰 id → (conditions, 컴파일된 노드). 쓰기 시점 검증에서 이미 컴파일한 조건을
+        재사용한다. conditions 가 룰의 현재 값과 다르면 무시하고 다시 컴파일한다.
+    """
+
+    def __init__(
+        self,
+        rules_data: list[dict],
+        *,
+        adaptive: bool = True,
+        reorder_interval: int = 1000,
+        record_stats: bool | None = None,
+        catalog: DocumentCatalog | None = None,
+        precompiled: Mapping[Any, tuple[Any, _Node]] | None = None,
+    ):
+        self.catalog = catalog if catalog is not None else DocumentCatalog()
+        precompiled = precompiled or {}
+
+        def condition(r: dict) -> _Node:
+            staged = precompiled.get(r.get("id"))
+            if staged is not None and staged[0] == r["conditions"]:
+                return staged[1]
+            return compile_condition(r["conditions"])
+
+        sorted_rules = sorted(rules_data, key=lambda r: r.get("priority", 999))
+        self.rules: tuple[CompiledRule, ...] = tuple(
+            CompiledRule(r, condition(r), self.catalog)
+            for r in sorted_rules
+            if r.get("enabled", True) and r.get("conditions")
+        )
+        # 룰 id → 정규화 JSON. 부분 갱신 시 바뀐 룰만 다시 직렬화해 버전을 만든다.
+        by_id = sorted(rules_data, key=lambda r: r.get("id", 0))
+        canonical = [_canonical_rule(r) for r in by_id]
+        ids = [r.get("id") for r in by_id]
+        self._canonical: dict[Any, str] | None = (
+            dict(zip(ids, canonical)) if None not in ids and len(set(ids)) == len(ids) else None
+        )
+        self.version = _digest(canonical)
+        self._configure(adaptive, reorder_interval, record_stats)
+
+    def _configure(self, adaptive: bool, reorder_interval: int, record_stats: bool | None) -> None:
+        self.adaptive = adaptive
+        self.record_stats = adaptive if record_stats is None else record_stats
+        self.reorder_interval = max(1, reorder_interval)
+        self._since_reorder = 0
+        self._reorder_lock = threading.Lock()
+
+    def replace_rule(
+        self,
+        rule_id: Any,
+        rule: dict | None,
+        precompiled: tuple[Any, _Node] | None = None,
+    ) -> CompiledRuleSet:
+        """
+        룰 하나만 바꾼 새 룰셋 (copy-on-write). rule 이 None 이면 그 룰을 뺀다.
+
+        바뀐 룰만 컴파일(또는 precompiled 재사용)해 우선순위 자리에 끼우고, 나머지 CompiledRule
+        (컴파일된 노드·서류 비트셋·RuleMatch)은 그대로 공유한다. self 는 바뀌지 않으므로
+        진행 중인 평가는 이전 룰셋을 끝까지 쓴다. 공유 노드의 적응형 통계·평가 순서는 이어진다.
+        같은 우선순위는 id 순으로 놓는다 — id 순으로 로드한 룰셋을 새로 컴파일한 결과와 같다.
+        """
+        if self._canonical is None:
+            raise ValueError("룰 id 가 없거나 중복된 룰셋은 부분 갱신할 수 없습니다")
+        canonical = dict(self._canonical)
+        rules = [r for r in self.rules if r.rule.get("id") != rule_id]
+        if rule is None:
+            canonical.pop(rule_id, None)
+        else:
+            canonical[rule_id] = _canonical_rule(rule)
+            if rule.get("enabled", True) and rule.get("conditions"):
+                if precompiled is not None and precompiled[0] == rule["conditions"]:
+                    node = precompiled[1]
+                else:
+                    node = compile_condition(rule["conditions"])
+                key = (rule.get("priority", 999), rule_id)
+                at = next(
+                    (i for i, r in enumerate(rules) if (r.rule.get("priority", 999), r.rule.get("id")) > key),
+                    len(rules),
+                )
+                rules.insert(at, CompiledRule(rule, node, self.catalog))
+
+        derived = object.__new__(type(self))
+        derived.catalog = self.catalog
+        derived.rules = tuple(rules)
+        derived._canonical = canonical
+        derived.version = _digest(canonical[k] for k in sorted(canonical))
+        derived._configure(self.adaptive, self.reorder_interval, self.record_stats)
+        return derived
+
+    def evaluate(self, context: dict) -> list[RuleMatch]:
+        """`evaluate_rules(rules_data, context)` 와 동일한 결과를 반환한다."""
+        if not self.record_stats:
+            return [r.to_match() for r in self.rules if r.condition.evaluate(context)]
+
+        matches = [r.to_match() for r in self.rules if r.condition.observe(context)]
+        if self.adaptive:
+            self._since_reorder += 1
+            if self._since_reorder >= self.reorder_interval:
+                self.reorder()
+        return matches
+
+    def trace(self, context: dict) -> tuple[list[RuleMatch], list[dict]]:
+        """
+        `evaluate` 와 같은 매칭 결과와 룰별 평가 트리(본 값, 리프 결과, 단락 지점).
+        통계는 갱신하지 않는다.
+        """
+        matches = []
+        traces = []
+        for r in self.rules:
+            matched, tree = r.condition.trace(context)
+            traces.append({
+                "rule": r.rule.get("rule_name"),
+                "priority": r.rule.get("priority"),
+                "matched": matched,
+                "condition": tree,
+            })
+            if matched:
+                matches.append(r.to_match())
+        return matches, traces
+
+    def reorder(self) -> None:
+        """관측 통계로 교환 가능한 all/any 노드의 자식 순서를 재정렬한다."""
+        if not self._reorder_lock.acquire(blocking=False):
+            return  # 다른 스레드가 이미 재정렬 중
+        try:
+            self._since_reorder = 0
+            for rule in self.rules:
+                for node in rule.condition.walk():
+                    if isinstance(node, _Branch) and node.commutative and len(node.children) > 1:
+                        # 안정 정렬: 통계가 같으면 작성 순서 유지.
+                        # 튜플 교체는 원자적이므로 진행 중인 평가는 이전 순서를 끝까지 사용한다.
+                        node.children = tuple(sorted(node.authored, key=node._order_key))
+                # 트래픽 변화에 적응하도록 과거 통계를 감쇠
+                for node in rule.condition.walk():
+                    node.decay()
+        finally:
+            self._reorder_lock.release()
+
+    def reset_order(self) -> None:
+        """모든 노드를 작성 순서로 되돌리고 통계를 초기화한다."""
+        with self._reorder_lock:
+            for rule in self.rules:
+                for node in rule.condition.walk():
+                    if isinstance(node, _Branch):
+                        node.children = node.authored
+                    node.hits = node.passes = 0
+            self._since_reorder = 0
+
+    @property
+    def leaf_evaluations(self) -> int:
+        """현재 통계 창에서 평가된 리프 수 (재정렬 시 감쇠된다)."""
+        return sum(leaf.hits for r in self.rules for leaf in r.condition.leaves())
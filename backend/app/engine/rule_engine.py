@@ -5,9 +5,14 @@ JSON 조건을 평가하여 서류 요구, 차단, 에스컬레이션을 결정
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Any
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Sequence
 
+from app.engine.document_catalog import DocumentCatalog
+
+if TYPE_CHECKING:
+    from app.engine.document_resolver import DocumentGroup
 
 # ──────────────────────────────────────────────
 # 조건 평가 (§11.2)
@@ -74,33 +79,63 @@ def _resolve_field(context: dict, field_path: str) -> Any:
 # 룰 평가 결과
 # ──────────────────────────────────────────────
 
-@dataclass
+# 판정 결과 타입은 불변(frozen)·슬롯 객체다. 목록 필드는 튜플이며, 컴파일된 룰셋과
+# 서류 카탈로그가 미리 만들어 둔 튜플을 복사하지 않고 그대로 참조한다.
+# 일괄 처리처럼 결과를 대량으로 보관하는 경로에서 인스턴스 __dict__ 와 리스트 할당을 없앤다.
+
+@dataclass(frozen=True, slots=True)
 class RuleMatch:
-    """단일 룰이 매칭되었을 때의 결과."""
+    """단일 룰이 매칭되었을 때의 결과. 컴파일된 룰은 룰당 하나를 만들어 재사용한다."""
     rule_id: int
     rule_name: str
-    required_documents: list[str] = field(default_factory=list)
-    optional_documents: list[str] = field(default_factory=list)
+    required_documents: tuple[str, ...] = ()
+    optional_documents: tuple[str, ...] = ()
     blocked: bool = False
     escalate: bool = False
     output_status: str | None = None
-    output_case_tags: list[str] = field(default_factory=list)
+    output_case_tags: tuple[str, ...] = ()
     explanation: str = ""
-
-
-@dataclass
+    # 컴파일된 룰셋 카탈로그 기준 비트셋 (0이면 목록에서 계산)
+    required_mask: int = 0
+    optional_mask: int = 0
+
+    @classmethod
+    def from_rule(cls, rule: dict, required_mask: int = 0, optional_mask: int = 0) -> RuleMatch:
+        """룰 딕셔너리 → 매치 (목록은 인턴된 튜플로)."""
+        return cls(
+            rule_id=rule["id"],
+            rule_name=sys.intern(rule["rule_name"]),
+            required_documents=_interned(rule.get("required_documents")),
+            optional_documents=_interned(rule.get("optional_documents")),
+            blocked=rule.get("blocked_if_missing", False),
+            escalate=rule.get("escalate_if_true", False),
+            output_status=rule.get("output_status"),
+            output_case_tags=_interned(rule.get("output_case_tags")),
+            explanation=rule.get("explanation_template") or "",
+            required_mask=required_mask,
+            optional_mask=optional_mask,
+        )
+
+
+def _interned(values) -> tuple[str, ...]:
+    return tuple(sys.intern(v) for v in values) if values else ()
+
+
+@dataclass(frozen=True, slots=True)
 class DeterminationResult:
     """전체 판정 결과."""
     case_code: str
-    case_tags: list[str]
+    case_tags: tuple[str, ...]
     status: str  # RequestStatus value
-    required_documents: list[str] = field(default_factory=list)
-    optional_documents: list[str] = field(default_factory=list)
-    document_groups: list[dict] = field(default_factory=list)  # 대체서류 그룹
+    required_documents: tuple[str, ...] = ()
+    optional_documents: tuple[str, ...] = ()
+    document_groups: tuple[DocumentGroup, ...] = ()  # 대체서류 그룹
     blocked: bool = False
     escalate: bool = False
-    explanations: list[str] = field(default_factory=list)
-    matched_rules: list[str] = field(default_factory=list)
+    explanations: tuple[str, ...] = ()
+    matched_rules: tuple[str, ...] = ()
+    required_mask: int = 0
+    optional_mask: int = 0
 
 
 # ──────────────────────────────────────────────
@@ -136,32 +171,30 @@ def evaluate_rules(rules_data: list[dict], context: dict) -> list[RuleMatch]:
         if not conditions:
             continue
         if evaluate_condition(conditions, context):
-            match = RuleMatch(
-                rule_id=rule["id"],
-                rule_name=rule["rule_name"],
-                required_documents=rule.get("required_documents", []),
-                optional_documents=rule.get("optional_documents", []),
-                blocked=rule.get("blocked_if_missing", False),
-                escalate=rule.get("escalate_if_true", False),
-                output_status=rule.get("output_status"),
-                output_case_tags=rule.get("output_case_tags", []),
-                explanation=rule.get("explanation_template", ""),
-            )
-            matches.append(match)
+            matches.append(RuleMatch.from_rule(rule))
 
     return matches
 
 
 def compile_determination(
     case_code: str,
-    case_tags: list[str],
-    matches: list[RuleMatch],
+    case_tags: Sequence[str],
+    matches: Sequence[RuleMatch],
+    catalog: DocumentCatalog | None = None,
+    render: bool = True,
 ) -> DeterminationResult:
     """
     매칭된 룰들의 결과를 병합하여 최종 판정을 생성한다.
+
+    서류는 `catalog` 기준 비트셋으로 병합한다. catalog 가 없으면 임시 카탈로그를
+    쓰므로 서류 순서는 최초 등장 순서가 되고, 매치에 담긴 비트셋은 쓰지 않는다.
+    render=False 이면 서류 목록은 비워 두고 비트셋만 채운다 (이후 병합 단계에서 렌더링).
     """
-    all_required: list[str] = []
-    all_optional: list[str] = []
+    use_match_masks = catalog is not None
+    if catalog is None:
+        catalog = DocumentCatalog()
+    required_mask = 0
+    optional_mask = 0
     blocked = False
     escalate = False
     explanations: list[str] = []
@@ -170,8 +203,12 @@ def compile_determination(
     extra_tags: list[str] = []
 
     for m in matches:
-        all_required.extend(m.required_documents)
-        all_optional.extend(m.optional_documents)
+        if use_match_masks and (m.required_mask or m.optional_mask):
+            required_mask |= m.required_mask
+            optional_mask |= m.optional_mask
+        else:
+            required_mask |= catalog.mask(m.required_documents)
+            optional_mask |= catalog.mask(m.optional_documents)
         if m.blocked:
             blocked = True
         if m.escalate:
@@ -190,21 +227,25 @@ def compile_determination(
     elif escalate:
         final_status = _higher_priority_status(final_status, "ESCALATION_REQUIRED")
 
-    # 중복 제거
-    all_required = list(dict.fromkeys(all_required))
-    all_optional = [d for d in dict.fromkeys(all_optional) if d not in all_required]
-    combined_tags = list(dict.fromkeys(case_tags + extra_tags))
+    # 필수에 포함된 서류는 선택에서 제외
+    optional_mask &= ~required_mask
+    if extra_tags:
+        combined_tags = tuple(dict.fromkeys((*case_tags, *extra_tags)))
+    else:
+        combined_tags = tuple(case_tags)
 
     return DeterminationResult(
         case_code=case_code,
         case_tags=combined_tags,
         status=final_status,
-        required_documents=all_required,
-        optional_documents=all_optional,
+        required_documents=catalog.render(required_mask) if render else (),
+        optional_documents=catalog.render(optional_mask) if render else (),
         blocked=blocked,
         escalate=escalate,
-        explanations=explanations,
-        matched_rules=matched_names,
+        explanations=tuple(explanations),
+        matched_rules=tuple(matched_names),
+        required_mask=required_mask,
+        optional_mask=optional_mask,
     )
 
 
@@ -0,0 +1,172 @@
+"""
+Rule Snapshot — 활성 룰을 컴파일하여 프로세스 단위로 캐시한다.
+관리자가 룰 하나를 바꾸면 `apply_rule_change()` 가 그 룰만 다시 컴파일한 새 스냅샷을 만들어
+교체한다 (copy-on-write). 읽기 경로는 잠금 없이 `_current` 를 한 번 읽으므로 진행 중인 판정은
+이전 스냅샷을 끝까지 쓴다. 일괄 변경(매트릭스 임포트)은 `invalidate_rule_set()` 으로 다음 요청에서
+전체를 재컴파일한다.
+쓰기 시점 검증에서 컴파일한 조건은 `stage_compiled()` 로 맡겨 두면 다음 스냅샷이 그대로 쓴다.
+
+워커 프로세스가 여럿이면 다른 프로세스의 변경은 위 두 함수로 전해지지 않는다. rules / document_types 를
+바꾸는 모든 쓰기는 트리거가 `rule_set_generation` 세대를 1 올리고 (`ensure_generation_tracking`),
+`get_rule_set` 은 RULE_SET_CHECK_SECONDS 마다 세대 한 행을 읽어 스냅샷을 만든 세대와 다르면 전체를
+재컴파일한다. 관리자 조회 응답 캐시(`app.api.response_cache`)도 같은 세대로 무효화를 확인한다.
+트리거는 SQLite 에서만 만든다 — 다른 DB 에서는 세대가 바뀌지 않아 프로세스 단위 캐시로 동작한다.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from sqlalchemy import Engine, select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.rule_compiler import CompiledRuleSet, _Node
+from app.models.document_type import DocumentType
+from app.models.rule import Rule, RuleSetGeneration
+
+_lock = threading.Lock()
+_current: CompiledRuleSet | None = None
+# _current 를 만든 DB 세대와 마지막으로 세대를 확인한 시각 (monotonic)
+_generation: int | None = None
+_checked_at = 0.0
+# 룰 id → (conditions, 컴파일된 노드). 다음 스냅샷 생성 시 소비된다.
+_staged: dict[int, tuple[dict, _Node]] = {}
+
+
+def serialize_rule(r: Rule) -> dict:
+    """Rule ORM 객체 → 룰 엔진 입력 딕셔너리."""
+    return {
+        "id": r.id,
+        "rule_name": r.rule_name,
+        "priority": r.priority,
+        "conditions": r.conditions,
+        "required_documents": r.required_documents,
+        "optional_documents": r.optional_documents,
+        "blocked_if_missing": r.blocked_if_missing,
+        "escalate_if_true": r.escalate_if_true,
+        "output_status": r.output_status,
+        "output_case_tags": json.loads(r.output_case_tags_json) if r.output_case_tags_json else [],
+        "explanation_template": r.explanation_template,
+        "enabled": r.enabled,
+    }
+
+
+def load_rules_data(db: Session) -> list[dict]:
+    # id 순 — 같은 우선순위의 평가 순서가 부분 갱신(`CompiledRuleSet.replace_rule`)과 같아진다
+    active_rules = db.query(Rule).filter(Rule.enabled == True).order_by(Rule.id).all()  # noqa: E712
+    return [serialize_rule(r) for r in active_rules]
+
+
+def load_document_catalog(db: Session) -> DocumentCatalog:
+    """DocumentType 마스터 순서(id)로 서류 카탈로그를 구성한다."""
+    codes = db.query(DocumentType.code).order_by(DocumentType.id).all()
+    return DocumentCatalog(code for (code,) in codes)
+
+
+# ── 세대 (프로세스 간 무효화) ──
+
+_GENERATION_DDL = [
+    "INSERT OR IGNORE INTO rule_set_generation (id, generation) VALUES (1, 0)",
+    # 이전 버전은 코드 변경에만 세대를 올렸다 (이름 등 변경이 관리자 조회 캐시에 보이지 않음)
+    "DROP TRIGGER IF EXISTS document_types_generation_au",
+    *(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_generation_{suffix} AFTER {event} ON {table} BEGIN
+            UPDATE rule_set_generation SET generation = generation + 1 WHERE id = 1;
+        END
+        """
+        for table, events in (
+            ("rules", (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))),
+            # 카탈로그는 서류 코드와 순서(id)만 쓰지만 관리자 조회 응답은 모든 컬럼을 보여 준다
+            ("document_types", (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))),
+        )
+        for suffix, event in events
+    ),
+]
+
+
+def ensure_generation_tracking(engine: Engine) -> None:
+    """세대 행과 트리거를 만든다 (create_all 이후, 시드 적재 전). SQLite 가 아니면 아무것도 하지 않는다."""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for ddl in _GENERATION_DDL:
+            conn.execute(text(ddl))
+
+
+def read_generation(db: Session) -> int:
+    return db.execute(select(RuleSetGeneration.generation).where(RuleSetGeneration.id == 1)).scalar() or 0
+
+
+def get_rule_set(db: Session) -> CompiledRuleSet:
+    """
+    현재 룰 스냅샷을 반환한다. 없거나, RULE_SET_CHECK_SECONDS 마다 확인한 DB 세대가 스냅샷의
+    세대와 다르면(다른 프로세스가 룰을 바꿈) DB에서 로드하여 컴파일한다.
+    """
+    global _checked_at
+    rule_set = _current
+    if rule_set is not None and time.monotonic() - _checked_at < settings.RULE_SET_CHECK_SECONDS:
+        return rule_set
+    generation = read_generation(db)
+    _checked_at = time.monotonic()
+    if rule_set is not None and generation == _generation:
+        return rule_set
+    with _lock:
+        if _current is None or _generation != generation:
+            _rebuild(db, generation)
+        return _current
+
+
+def _rebuild(db: Session, generation: int) -> None:
+    """(잠금 안에서) 전체 재컴파일. 세대는 룰을 읽기 전에 읽은 값 — 사이에 바뀌면 다음 확인에서 다시 만든다."""
+    global _current, _generation, _staged
+    _current = CompiledRuleSet(
+        load_rules_data(db),
+        adaptive=settings.RULE_ORDERING_MODE == "adaptive",
+        reorder_interval=settings.RULE_REORDER_INTERVAL,
+        catalog=load_document_catalog(db),
+        precompiled=_staged,
+    )
+    _generation = generation
+    # 노드는 통계를 품고 있으므로 스냅샷 하나만 소유한다
+    _staged = {}
+
+
+def stage_compiled(rule_id: int, conditions: dict, node: _Node) -> None:
+    """검증 단계에서 컴파일한 룰 조건을 다음 스냅샷에 넘긴다."""
+    with _lock:
+        _staged[rule_id] = (conditions, node)
+
+
+def apply_rule_change(db: Session, rule_id: int) -> None:
+    """
+    룰 하나의 생성·수정·삭제(커밋 후)를 반영한 새 스냅샷을 게시한다.
+    스냅샷이 아직 없으면 다음 `get_rule_set` 이 전체를 컴파일하므로 할 일이 없다.
+    룰이 현재 카탈로그에 없는 서류 코드를 참조하거나, 이 변경 말고도 세대가 바뀌었으면
+    (다른 프로세스·다른 요청의 변경) 전체 재컴파일로 넘긴다.
+    """
+    global _current, _generation
+    with _lock:
+        current = _current
+        if current is None:
+            return
+        # 잠금 안에서 읽는다 — 같은 룰을 동시에 고쳐도 마지막 커밋이 마지막에 반영된다
+        generation = read_generation(db)
+        row = db.get(Rule, rule_id)
+        rule = serialize_rule(row) if row is not None and row.enabled else None
+        codes = [*rule["required_documents"], *rule["optional_documents"]] if rule else []
+        if generation - (_generation or 0) > 1 or any(code not in current.catalog for code in codes):
+            _current = None
+            return
+        _current = current.replace_rule(rule_id, rule, precompiled=_staged.pop(rule_id, None))
+        _generation = generation
+
+
+def invalidate_rule_set() -> None:
+    global _current
+    with _lock:
+        _current = None
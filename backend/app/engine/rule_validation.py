@@ -0,0 +1,210 @@
+"""
+Rule Validation — 룰 쓰기 시점 검증 (§11)
+
+관리자 API·매트릭스 임포트가 룰을 저장하기 전에 조건을 파싱·컴파일하고
+- 알 수 없는 연산자·필드(판정 컨텍스트 키 기준)·값
+- 알 수 없는 서류 코드
+- 노드 수·깊이 예산(RULE_MAX_NODES / RULE_MAX_DEPTH) 초과
+를 거부한다. `evaluate_condition` 은 형식이 틀린 조건을 조용히 False 로 평가하므로
+잘못된 룰은 저장 시점에 막아야 한다. 예산은 한 번의 관리자 수정이 모든 /determine
+호출의 지연을 늘리지 못하도록 룰 하나의 평가 비용 상한을 정한다.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterable
+
+from app.config import settings
+from app.engine.rule_compiler import _Node, compile_condition
+from app.schemas.determination import DeterminationInput, RiskFlagsInput
+
+# evaluate_condition 이 지원하는 비교 연산자와 논리 연산자
+OPERATORS = ("eq", "neq", "in", "not_in", "is_true", "is_false", "exists")
+BRANCHES = ("all", "any", "not")
+
+
+class RuleValidationError(ValueError):
+    """검증 실패 — problems 는 "경로: 사유" 형식의 문자열 목록."""
+
+    def __init__(self, problems: list[str]):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+@dataclass(frozen=True, slots=True)
+class CheckedCondition:
+    condition: dict
+    node: _Node
+    nodes: int
+    depth: int
+
+    @property
+    def canonical_json(self) -> str:
+        return json.dumps(self.condition, ensure_ascii=False)
+
+
+# ──────────────────────────────────────────────
+# 판정 컨텍스트 스키마
+# ──────────────────────────────────────────────
+
+def _allowed_values(annotation: Any) -> frozenset | None:
+    if annotation is bool:
+        return frozenset((True, False))
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return frozenset(member.value for member in annotation)
+    return None  # 값 제한 없음
+
+
+@lru_cache(maxsize=1)
+def context_fields() -> dict[str, frozenset | None]:
+    """
+    조건에서 참조할 수 있는 필드 → 허용 값.
+    `build_context` 는 DeterminationInput 필드를 그대로 옮기므로 모델 필드가 곧 컨텍스트 키다.
+    """
+    fields: dict[str, frozenset | None] = {}
+    for name, field in DeterminationInput.model_fields.items():
+        if field.annotation is RiskFlagsInput:
+            for flag, flag_field in RiskFlagsInput.model_fields.items():
+                fields[f"{name}.{flag}"] = _allowed_values(flag_field.annotation)
+        else:
+            fields[name] = _allowed_values(field.annotation)
+    return fields
+
+
+# ──────────────────────────────────────────────
+# 조건 검사
+# ──────────────────────────────────────────────
+
+def _check_value(path: str, field: str, op: str, value: Any, problems: list[str]) -> None:
+    allowed = context_fields()[field]
+    if op in ("is_true", "is_false", "exists"):
+        if not isinstance(value, bool):
+            problems.append(f"{path}.{op}: true/false 여야 합니다")
+        return
+    if op in ("in", "not_in"):
+        if not isinstance(value, list) or not value:
+            problems.append(f"{path}.{op}: 비어 있지 않은 목록이어야 합니다")
+            return
+        values = value
+    else:
+        values = [value]
+    if allowed is None:
+        return
+    unknown = [v for v in values if isinstance(v, (list, dict)) or v not in allowed]
+    if unknown:
+        problems.append(f"{path}.{op}: {field} 에 없는 값입니다: {', '.join(map(repr, unknown))}")
+
+
+def _walk(condition: Any, path: str, depth: int, problems: list[str]) -> tuple[int, int]:
+    """조건 트리를 검사하고 (노드 수, 최대 깊이) 를 반환한다."""
+    if not isinstance(condition, dict):
+        problems.append(f"{path}: JSON 객체여야 합니다")
+        return 1, depth
+
+    branches = [k for k in BRANCHES if k in condition]
+    if branches:
+        op = branches[0]
+        extra = sorted(set(condition) - {op})
+        if extra:
+            problems.append(f"{path}: {op} 와 함께 쓸 수 없는 키: {', '.join(extra)}")
+        if op == "not":
+            nodes, max_depth = _walk(condition["not"], f"{path}.not", depth + 1, problems)
+            return nodes + 1, max_depth
+        children = condition[op]
+        if not isinstance(children, list) or not children:
+            problems.append(f"{path}.{op}: 비어 있지 않은 조건 목록이어야 합니다")
+            return 1, depth
+        nodes, max_depth = 1, depth
+        for i, child in enumerate(children):
+            n, d = _walk(child, f"{path}.{op}[{i}]", depth + 1, problems)
+            nodes += n
+            max_depth = max(max_depth, d)
+        return nodes, max_depth
+
+    field = condition.get("field")
+    ops = [k for k in condition if k != "field"]
+    unknown_ops = [k for k in ops if k not in OPERATORS]
+    if unknown_ops:
+        problems.append(f"{path}: 알 수 없는 연산자: {', '.join(unknown_ops)}")
+    known_ops = [k for k in ops if k in OPERATORS]
+    if not isinstance(field, str) or not field:
+        problems.append(f"{path}.field: 필드 이름이 없습니다")
+    elif field not in context_fields():
+        problems.append(f"{path}.field: 알 수 없는 필드입니다: {field!r}")
+    elif len(known_ops) == 1:
+        _check_value(path, field, known_ops[0], condition[known_ops[0]], problems)
+    if not known_ops and not unknown_ops:
+        problems.append(f"{path}: 비교 연산자가 없습니다")
+    elif len(known_ops) > 1:
+        problems.append(f"{path}: 연산자는 하나만 쓸 수 있습니다: {', '.join(known_ops)}")
+    return 1, depth
+
+
+def check_condition(
+    condition: Any,
+    *,
+    max_nodes: int | None = None,
+    max_depth: int | None = None,
+) -> CheckedCondition:
+    """조건을 검사·컴파일한다. 문제가 있으면 RuleValidationError."""
+    max_nodes = settings.RULE_MAX_NODES if max_nodes is None else max_nodes
+    max_depth = settings.RULE_MAX_DEPTH if max_depth is None else max_depth
+    problems: list[str] = []
+    nodes, depth = _walk(condition, "conditions", 1, problems)
+    if nodes > max_nodes:
+        problems.append(f"conditions: 노드 수 {nodes} 가 예산 {max_nodes} 을 초과합니다")
+    if depth > max_depth:
+        problems.append(f"conditions: 깊이 {depth} 가 예산 {max_depth} 을 초과합니다")
+    if problems:
+        raise RuleValidationError(problems)
+    return CheckedCondition(condition, compile_condition(condition), nodes, depth)
+
+
+def parse_condition(text: str, **budget: int | None) -> CheckedCondition:
+    """conditions_json 문자열을 파싱한 뒤 `check_condition`."""
+    try:
+        condition = json.loads(text)
+    except (TypeError, json.JSONDecodeError) as exc:
+        raise RuleValidationError([f"conditions: JSON 오류: {exc}"]) from None
+    return check_condition(condition, **budget)
+
+
+def check_document_codes(column: str, text: str | None, known_codes: Iterable[str]) -> list[str]:
+    """서류 목록 JSON 문자열을 검사하고 문제 목록을 반환한다."""
+    if text is None:
+        return []
+    try:
+        codes = json.loads(text)
+    except json.JSONDecodeError as exc:
+        return [f"{column}: JSON 오류: {exc}"]
+    if not isinstance(codes, list) or not all(isinstance(c, str) for c in codes):
+        return [f"{column}: 서류 코드 문자열 목록이어야 합니다"]
+    known = set(known_codes)
+    unknown = [c for c in dict.fromkeys(codes) if c not in known]
+    if unknown:
+        return [f"{column}: 알 수 없는 서류 코드: {', '.join(unknown)}"]
+    return []
+
+
+def validate_rule(values: dict, known_codes: Iterable[str]) -> CheckedCondition | None:
+    """
+    관리자 API 룰 본문(RuleCreate / RuleUpdate 의 설정된 필드)을 검증한다.
+    모든 문제를 모아 RuleValidationError 로 올린다. conditions_json 이 있으면 컴파일 결과를 반환.
+    """
+    problems: list[str] = []
+    checked = None
+    if values.get("conditions_json") is not None:
+        try:
+            checked = parse_condition(values["conditions_json"])
+        except RuleValidationError as exc:
+            problems += exc.problems
+    known = set(known_codes)
+    for column in ("required_documents_json", "optional_documents_json"):
+        problems += check_document_codes(column, values.get(column), known)
+    if problems:
+        raise RuleValidationError(problems)
+    return checked
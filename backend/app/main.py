@@ -8,9 +8,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.database import engine
+from app.database import engine, read_engine
 from app.models.base import Base
-from app.api import determination, admin, audit
+from app.api import determination, admin, audit, checklist, export, search, stats, profiles, archive, scheduler as scheduler_api
 
 
 @asynccontextmanager
@@ -18,6 +18,16 @@ async def lifespan(app: FastAPI):
     """앱 시작 시 테이블 생성 + 시드 데이터 로드."""
     # Create tables
     Base.metadata.create_all(bind=engine)
+    # 검색 인덱스 (SQLite FTS5) + 증분 갱신 트리거
+    from app.search_index import ensure_search_index
+    ensure_search_index(engine)
+    # 이전 버전 DB 의 판정 지점 컬럼 (집계 기준)
+    from app.rollups import ensure_branch_column
+    with engine.begin() as conn:
+        ensure_branch_column(conn)
+    # 룰셋 세대 트리거 — 워커 프로세스 간 룰 스냅샷 무효화
+    from app.engine.rule_snapshot import ensure_generation_tracking
+    ensure_generation_tracking(engine)
 
     # Load seed data
     from app.database import SessionLocal
@@ -29,6 +39,10 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
+    # 케이스 분류 테이블 사전 컴파일 (첫 판정 요청 지연 방지)
+    from app.engine.case_table import get_case_table
+    get_case_table()
+
     yield
 
 
@@ -39,6 +53,12 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# 우선순위 레인 — 대량 작업이 영업점 판정 지연을 밀어 올리지 않도록 진입을 제어한다
+# (CORS 보다 먼저 등록해 안쪽에 둔다 — 429/503 응답에도 CORS 헤더가 붙는다)
+if settings.SCHEDULER_ENABLED:
+    from app.scheduler import SchedulerMiddleware, scheduler
+    app.add_middleware(SchedulerMiddleware, scheduler=scheduler)
+
 # CORS — Next.js 프론트엔드 허용
 app.add_middleware(
     CORSMiddleware,
@@ -46,12 +66,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Id", "Retry-After"],
 )
 
+# 온디맨드 프로파일링 — 비활성화 시 미들웨어를 설치하지 않는다
+if settings.PROFILING_ENABLED:
+    from app.profiling import ProfilingMiddleware
+    app.add_middleware(
+        ProfilingMiddleware,
+        engines=(engine, read_engine),
+        token=settings.PROFILE_TOKEN,
+        sample_rate=settings.PROFILE_SAMPLE_RATE,
+    )
+
 # Routers
 app.include_router(determination.router, prefix=settings.API_V1_PREFIX, tags=["Determination"])
 app.include_router(admin.router, prefix=settings.API_V1_PREFIX, tags=["Admin"])
 app.include_router(audit.router, prefix=settings.API_V1_PREFIX, tags=["Audit"])
+app.include_router(checklist.router, prefix=settings.API_V1_PREFIX, tags=["Checklist"])
+app.include_router(export.router, prefix=settings.API_V1_PREFIX, tags=["Export"])
+app.include_router(search.router, prefix=settings.API_V1_PREFIX, tags=["Search"])
+app.include_router(stats.router, prefix=settings.API_V1_PREFIX, tags=["Stats"])
+app.include_router(profiles.router, prefix=settings.API_V1_PREFIX, tags=["Profiling"])
+app.include_router(archive.router, prefix=settings.API_V1_PREFIX, tags=["Archive"])
+app.include_router(scheduler_api.router, prefix=settings.API_V1_PREFIX, tags=["Scheduler"])
 
 
 @app.get("/")
@@ -3,9 +3,12 @@ from app.models.customer import Customer
 from app.models.account_request import AccountRequest
 from app.models.document_type import DocumentType
 from app.models.case_type import CaseType, CaseTag
-from app.models.rule import Rule, RequiredDocumentMapping, PolicyVersion
+from app.models.rule import Rule, RequiredDocumentMapping, PolicyVersion, RuleSetGeneration
 from app.models.audit_log import AuditLog
 from app.models.user import User
+from app.models.document_checklist import DocumentChecklist, ChecklistItem, ChecklistGroup
+from app.models.determination_rollup import DeterminationRollup
+from app.models.archive_partition import ArchivePartition
 
 __all__ = [
     "Base",
@@ -17,6 +20,12 @@ __all__ = [
     "Rule",
     "RequiredDocumentMapping",
     "PolicyVersion",
+    "RuleSetGeneration",
     "AuditLog",
     "User",
+    "DocumentChecklist",
+    "ChecklistItem",
+    "ChecklistGroup",
+    "DeterminationRollup",
+    "ArchivePartition",
 ]
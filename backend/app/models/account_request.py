@@ -12,6 +12,8 @@ from app.models.base import Base
 
 class AccountRequest(Base):
     __tablename__ = "account_requests"
+    # 아카이브로 옮겨 hot DB 에서 지운 id 를 새 행에 다시 주지 않는다 (app.archive)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"), index=True)
@@ -40,6 +42,8 @@ class AccountRequest(Base):
     created_at: Mapped[Optional[str]] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[Optional[str]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
+    # 판정 집계의 지점 축 — 생성 시점 부서로 고정한다 (직원이 부서를 옮겨도 이미 센 지점에서 빼고 더한다)
+    branch: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, comment="생성 시점 직원 부서(지점)")
 
     customer = relationship("Customer", back_populates="account_requests")
 
@@ -0,0 +1,27 @@
+"""ArchivePartition model — 월별 아카이브 DB 파일 목록 (hot DB 에 남는 색인)."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ArchivePartition(Base):
+    """
+    아카이브로 옮긴 판정의 월(생성일 기준) 단위 파티션.
+    읽기 폴스루는 id / 생성일 범위로 열어 볼 파일을 고른다.
+    """
+    __tablename__ = "archive_partitions"
+
+    month: Mapped[str] = mapped_column(String(7), primary_key=True, comment="YYYY-MM")
+    path: Mapped[str] = mapped_column(String(500), comment="아카이브 SQLite 파일 경로")
+    min_request_id: Mapped[int] = mapped_column(Integer)
+    max_request_id: Mapped[int] = mapped_column(Integer)
+    first_created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    request_count: Mapped[int] = mapped_column(Integer, default=0)
+    audit_count: Mapped[int] = mapped_column(Integer, default=0)
+    compacted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -11,6 +11,8 @@ from app.models.base import Base
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # 아카이브로 옮겨 hot DB 에서 지운 id 를 새 행에 다시 주지 않는다 (app.archive)
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id: Mapped[int] = mapped_column(primary_key=True)
     event_type: Mapped[str] = mapped_column(String(60), index=True)
@@ -0,0 +1,29 @@
+"""DeterminationRollup model — 운영 대시보드용 판정 집계 (증분 갱신)."""
+
+from sqlalchemy import String, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class DeterminationRollup(Base):
+    """
+    (일자, 지점, 케이스, 상태, 태그) 별 판정 건수.
+    tag == "*" 행은 판정 단위 합계, 그 외 행은 해당 태그가 붙은 판정 건수.
+    상태는 현재 상태 기준 — 상태가 바뀌면 이전 상태 행에서 빼고 새 상태 행에 더한다.
+    """
+    __tablename__ = "determination_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "branch", "case_code", "status", "tag", name="uq_determination_rollups_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    day: Mapped[str] = mapped_column(String(10), index=True, comment="YYYY-MM-DD (UTC)")
+    branch: Mapped[str] = mapped_column(String(100), comment="등록 직원 부서, 없으면 빈 문자열")
+    case_code: Mapped[str] = mapped_column(String(10))
+    status: Mapped[str] = mapped_column(String(40))
+    tag: Mapped[str] = mapped_column(String(60))
+
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    blocked: Mapped[int] = mapped_column(Integer, default=0)
+    escalated: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,65 @@
+"""DocumentChecklist, ChecklistItem, ChecklistGroup models — §9, §18 서류 접수 원장."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class DocumentChecklist(Base):
+    """판정 1건의 서류 접수 현황 요약 (증분 갱신되는 카운터)."""
+    __tablename__ = "document_checklists"
+
+    account_request_id: Mapped[int] = mapped_column(ForeignKey("account_requests.id"), primary_key=True)
+    outstanding_required: Mapped[int] = mapped_column(Integer, default=0, comment="미제출 필수 서류 수")
+    unsatisfied_groups: Mapped[int] = mapped_column(Integer, default=0, comment="min_required 미충족 대체서류 그룹 수")
+
+    created_at: Mapped[Optional[str]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[str]] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    @property
+    def complete(self) -> bool:
+        return self.outstanding_required == 0 and self.unsatisfied_groups == 0
+
+
+class ChecklistItem(Base):
+    """
+    요구 서류 1건 (접수 원장 행).
+    requirement: REQUIRED | OPTIONAL | GROUP(대체서류 그룹 구성원) | EXTRA(요구 외 제출)
+    같은 서류가 필수이면서 그룹 구성원일 수 있으므로 (요청, 서류, 그룹) 단위로 저장한다.
+    """
+    __tablename__ = "checklist_items"
+    __table_args__ = (
+        Index("ix_checklist_items_request_document", "account_request_id", "document_code"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_request_id: Mapped[int] = mapped_column(ForeignKey("account_requests.id"))
+    document_code: Mapped[str] = mapped_column(String(60))
+    requirement: Mapped[str] = mapped_column(String(20))
+    group_code: Mapped[Optional[str]] = mapped_column(String(40), nullable=True)
+
+    received_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    received_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id"), nullable=True)
+
+
+class ChecklistGroup(Base):
+    """대체 가능 서류 그룹의 충족 상태 (§18)."""
+    __tablename__ = "checklist_groups"
+    __table_args__ = (
+        Index("ix_checklist_groups_request_group", "account_request_id", "group_code", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    account_request_id: Mapped[int] = mapped_column(ForeignKey("account_requests.id"))
+    group_code: Mapped[str] = mapped_column(String(40))
+    min_required: Mapped[int] = mapped_column(Integer, default=1)
+    received_count: Mapped[int] = mapped_column(Integer, default=0)
+    description: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+
+    @property
+    def satisfied(self) -> bool:
+        return self.received_count >= self.min_required
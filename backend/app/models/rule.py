@@ -25,6 +25,17 @@ class PolicyVersion(Base):
     rules = relationship("Rule", back_populates="policy_version")
 
 
+class RuleSetGeneration(Base):
+    """
+    룰셋 세대 번호 (단일 행, id=1). rules / document_types 가 바뀌면 트리거가 1 올린다.
+    워커 프로세스는 스냅샷을 만든 세대와 비교해 다른 프로세스의 변경을 알아챈다 (rule_snapshot).
+    """
+    __tablename__ = "rule_set_generation"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    generation: Mapped[int] = mapped_column(Integer, default=0)
+
+
 class Rule(Base):
     __tablename__ = "rules"
 
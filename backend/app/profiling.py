@@ -0,0 +1,301 @@
+"""
+Request Profiling — 요청 단위 온디맨드 프로파일링
+
+트리거: `X-Profile: <PROFILE_TOKEN>` 헤더, 또는 PROFILE_SAMPLE_RATE 확률 표본.
+트리거된 요청만
+- 엔드포인트 워커 스레드를 cProfile 로 측정하고 (요청당 프로파일러 하나)
+- 해당 요청 컨텍스트에서 실행된 SQL 문과 소요 시간을 수집하여
+- PROFILE_DIR/<profile_id>.json (+ .pstats) 로 저장한다. 응답에 X-Profile-Id 헤더가 붙는다.
+  profile_id 는 항상 서버가 만든 접미사를 붙인다 (`<X-Request-Id>-<난수>`) — 클라이언트가
+  기존 아티팩트 이름을 골라 덮어쓸 수 없다.
+
+PROFILING_ENABLED=False 이면 미들웨어·라우트 훅이 설치되지 않아 비용이 전혀 없다.
+켜져 있어도 트리거되지 않은 요청은 헤더 비교 한 번과 ContextVar 조회 한 번만 한다.
+SQL 리스너는 프로파일 중인 요청이 있을 때만 엔진에 등록된다.
+
+주의: Python 3.12+ 의 cProfile 은 sys.monitoring 위에서 동작해 프로세스에 하나만 켤 수 있다.
+다른 프로파일이 이미 켜져 있으면 enable() 이 ValueError 를 내므로, 그 요청은 CPU 프로파일 없이
+SQL 만 저장하고 artifact 의 cpu_profile 에 이유를 남긴다. 3.12+ 에서는 측정 중 다른 스레드의
+작업도 섞일 수 있다 (3.11 이하에서는 워커 스레드만 측정된다).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hmac
+import inspect
+import io
+import json
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import anyio
+from fastapi.routing import APIRoute
+from sqlalchemy import Engine, event
+
+from app.config import settings
+
+_active: ContextVar["ProfileSession | None"] = ContextVar("profile_session", default=None)
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# profile_id 에 쓰는 클라이언트 X-Request-Id 최대 길이 (뒤에 "-" + 12자 접미사)
+_CLIENT_ID_MAX = 48
+
+# 저장 시 SQL 파라미터 repr 최대 길이
+_MAX_PARAMS_REPR = 300
+
+
+class ProfileSession:
+    """프로파일 중인 요청 1건의 수집 버퍼."""
+
+    def __init__(self, request_id: str, trigger: str):
+        self.request_id = request_id
+        self.trigger = trigger
+        self.profiles: list[cProfile.Profile] = []
+        self.cpu_profile = "not run"  # "ok" | "not run" | 건너뛴 이유
+        self.statements: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add_profile(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            self.profiles.append(profile)
+
+    def record_sql(self, statement: str, params: Any, elapsed: float, executemany: bool) -> None:
+        with self._lock:
+            self.statements.append({
+                "sql": statement,
+                "params": repr(params)[:_MAX_PARAMS_REPR],
+                "executemany": executemany,
+                "ms": round(elapsed * 1e3, 3),
+                "thread": threading.current_thread().name,
+            })
+
+
+# ── SQL 수집 ──
+
+class _SqlCapture:
+    """프로파일 중인 요청이 하나라도 있을 때만 엔진(쓰기·읽기 풀 모두)에 커서 리스너를 건다."""
+
+    def __init__(self):
+        self._users = 0
+        self._lock = threading.Lock()
+        self._engines: tuple[Engine, ...] = ()
+
+    @staticmethod
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if _active.get() is not None:
+            conn.info.setdefault("_profile_t0", []).append(time.perf_counter())
+
+    @staticmethod
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        session = _active.get()
+        if session is None:
+            return
+        stack = conn.info.get("_profile_t0")
+        if stack:
+            session.record_sql(statement, parameters, time.perf_counter() - stack.pop(), executemany)
+
+    def acquire(self, engines: tuple[Engine, ...]) -> None:
+        with self._lock:
+            if self._users == 0:
+                for engine in engines:
+                    event.listen(engine, "before_cursor_execute", self._before)
+                    event.listen(engine, "after_cursor_execute", self._after)
+                self._engines = engines
+            self._users += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users == 0:
+                for engine in self._engines:
+                    event.remove(engine, "before_cursor_execute", self._before)
+                    event.remove(engine, "after_cursor_execute", self._after)
+                self._engines = ()
+
+
+_sql_capture = _SqlCapture()
+
+
+# ── 아티팩트 저장소 ──
+
+class ProfileStore:
+    def __init__(self, directory: str, max_artifacts: int):
+        self.directory = Path(directory)
+        self.max_artifacts = max_artifacts
+
+    def _path(self, request_id: str, suffix: str) -> Path:
+        if not _REQUEST_ID.match(request_id):
+            raise KeyError(request_id)
+        return self.directory / f"{request_id}{suffix}"
+
+    def save(self, session: ProfileSession, meta: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        summary = ""
+        if session.profiles:
+            stats = pstats.Stats(session.profiles[0])
+            for p in session.profiles[1:]:
+                stats.add(p)
+            stats.dump_stats(self._path(session.request_id, ".pstats"))
+            buf = io.StringIO()
+            stats.stream = buf
+            stats.sort_stats("cumulative").print_stats(40)
+            summary = buf.getvalue()
+        artifact = {
+            **meta,
+            "request_id": session.request_id,
+            "trigger": session.trigger,
+            "cpu_profile": session.cpu_profile,
+            "sql_count": len(session.statements),
+            "sql_ms": round(sum(s["ms"] for s in session.statements), 3),
+            "sql": session.statements,
+            "profile_summary": summary,
+        }
+        self._path(session.request_id, ".json").write_text(
+            json.dumps(artifact, ensure_ascii=False, indent=1), encoding="utf-8",
+        )
+        self._prune()
+
+    def _prune(self) -> None:
+        artifacts = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in artifacts[:max(0, len(artifacts) - self.max_artifacts)]:
+            old.unlink(missing_ok=True)
+            old.with_suffix(".pstats").unlink(missing_ok=True)
+
+    def list(self) -> list[dict]:
+        if not self.directory.exists():
+            return []
+        out = []
+        for path in sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            out.append({k: data.get(k) for k in ("request_id", "method", "path", "status", "duration_ms", "sql_count", "sql_ms", "trigger", "started_at")})
+        return out
+
+    def get(self, request_id: str) -> dict:
+        path = self._path(request_id, ".json")
+        if not path.exists():
+            raise KeyError(request_id)
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def pstats_path(self, request_id: str) -> Path:
+        path = self._path(request_id, ".pstats")
+        if not path.exists():
+            raise KeyError(request_id)
+        return path
+
+
+store = ProfileStore(settings.PROFILE_DIR, settings.PROFILE_MAX_ARTIFACTS)
+
+
+# ── 미들웨어 ──
+
+class ProfilingMiddleware:
+    """순수 ASGI 미들웨어 (BaseHTTPMiddleware 의 스트림 래핑 비용 없음)."""
+
+    def __init__(self, app, engines: Iterable[Engine], token: str = "", sample_rate: float = 0.0):
+        self.app = app
+        # default 프로파일에서는 쓰기·읽기 엔진이 같은 객체 — 리스너는 한 번만 건다
+        self.engines = tuple(dict.fromkeys(engines))
+        self.token = token.encode("latin-1")
+        self.sample_rate = sample_rate
+
+    def _trigger(self, scope) -> tuple[str, str] | None:
+        request_id = None
+        trigger = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and self.token and hmac.compare_digest(value, self.token):
+                trigger = "header"
+            elif name == b"x-request-id":
+                request_id = value.decode("latin-1")
+        if trigger is None and self.sample_rate and random.random() < self.sample_rate:
+            trigger = "sample"
+        if trigger is None:
+            return None
+        if request_id and _REQUEST_ID.match(request_id):
+            # 클라이언트 id 는 찾기 쉽게 앞에만 쓰고, 파일 이름은 항상 서버가 고유하게 만든다
+            return f"{request_id[:_CLIENT_ID_MAX]}-{uuid.uuid4().hex[:12]}", trigger
+        return uuid.uuid4().hex, trigger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        triggered = self._trigger(scope)
+        if triggered is None:
+            return await self.app(scope, receive, send)
+
+        request_id, trigger = triggered
+        session = ProfileSession(request_id, trigger)
+        status = {"code": None}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", request_id.encode())]}
+            await send(message)
+
+        token = _active.set(session)
+        _sql_capture.acquire(self.engines)
+        started = time.time()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - t0
+            _sql_capture.release()
+            _active.reset(token)
+            meta = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status["code"],
+                "duration_ms": round(elapsed * 1e3, 3),
+                "started_at": started,
+            }
+            await anyio.to_thread.run_sync(store.save, session, meta)
+
+
+# ── 라우트 훅 ──
+
+def _profiled(fn: Callable) -> Callable:
+    """동기 엔드포인트를 감싸 워커 스레드에서 cProfile 을 켠다."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        session = _active.get()
+        if session is None:
+            return fn(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as exc:
+            # 3.12+: 다른 요청의 프로파일이 켜져 있다 — SQL 만 수집한다
+            session.cpu_profile = f"skipped: {exc}"
+            return fn(*args, **kwargs)
+        session.cpu_profile = "ok"
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.disable()
+            session.add_profile(profiler)
+
+    # FastAPI 는 엔드포인트의 __globals__ 로 문자열 어노테이션을 해석하므로 미리 평가해 둔다
+    wrapper.__signature__ = inspect.signature(fn, eval_str=True)
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """PROFILING_ENABLED 일 때 동기 엔드포인트에 프로파일 훅을 설치하는 라우트 클래스."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        if settings.PROFILING_ENABLED and not asyncio.iscoroutinefunction(endpoint):
+            endpoint = _profiled(endpoint)
+        super().__init__(path, endpoint, **kwargs)
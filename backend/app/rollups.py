@@ -0,0 +1,250 @@
+"""
+Determination Rollups — 판정 집계 테이블 증분 갱신 / 재구축
+
+판정 1건이 저장될 때 (일자, 지점, 케이스, 상태) 합계 행과 태그별 행에 +1 을 upsert 한다.
+집계 조회는 원본 account_requests 를 읽지 않으므로 비용이 원본 크기와 무관하다.
+지점은 판정 생성 시점의 직원 부서로 account_requests.branch 에 저장해 두고, 상태 변경·재구축도 그 값을 쓴다.
+
+    python -m app.rollups rebuild [--from 2026-01-01] [--to 2026-01-31]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import delete, inspect, select, text
+from sqlalchemy.orm import Session
+
+from app.models.account_request import AccountRequest
+from app.models.determination_rollup import DeterminationRollup
+from app.models.user import User
+
+ALL_TAGS = "*"
+
+# (day, branch, case_code, status, tag) → [count, blocked, escalated]
+RollupKey = tuple[str, str, str, str, str]
+Deltas = dict[RollupKey, list[int]]
+
+_KEY_COLUMNS = ("day", "branch", "case_code", "status", "tag")
+
+
+def branch_of(db: Session, user_id: int | None, cache: dict[int, str] | None = None) -> str:
+    """
+    직원 ID → 부서(지점). 프로세스 캐시는 두지 않는다 — 부서 이동이 바로 반영되어야 한다 (PK 조회 1회).
+    한 트랜잭션 안에서 여러 건을 처리하는 호출자는 cache 로 같은 직원의 조회를 한 번으로 줄인다.
+    """
+    if user_id is None:
+        return ""
+    branch = cache.get(user_id) if cache is not None else None
+    if branch is None:
+        branch = db.execute(select(User.department).where(User.id == user_id)).scalar() or ""
+        if cache is not None:
+            cache[user_id] = branch
+    return branch
+
+
+def ensure_branch_column(conn) -> None:
+    """
+    이전 버전 DB(또는 아카이브 파일)의 account_requests 에 branch 컬럼을 더한다.
+    users 가 있는 DB 는 지금 부서로 채운다 — 지금까지의 집계가 그 값으로 계산되어 있다.
+    """
+    inspector = inspect(conn)
+    if not inspector.has_table("account_requests"):
+        return
+    if any(c["name"] == "branch" for c in inspector.get_columns("account_requests")):
+        return
+    conn.execute(text("ALTER TABLE account_requests ADD COLUMN branch VARCHAR(100)"))
+    if inspector.has_table("users"):
+        conn.execute(text(
+            "UPDATE account_requests SET branch = "
+            "(SELECT coalesce(department, '') FROM users WHERE users.id = account_requests.created_by) "
+            "WHERE created_by IS NOT NULL"
+        ))
+
+
+def stored_branch(db: Session, acct_req: AccountRequest) -> str:
+    """판정에 저장된 지점. 컬럼 도입 전 아카이브에서 온 행(NULL)만 지금 부서로 대신한다."""
+    if acct_req.branch is not None:
+        return acct_req.branch
+    return branch_of(db, acct_req.created_by)
+
+
+def add_delta(
+    deltas: Deltas,
+    day: str,
+    branch: str,
+    case_code: str | None,
+    status: str | None,
+    tags: Iterable[str],
+    blocked: bool,
+    escalated: bool,
+    sign: int = 1,
+) -> None:
+    """판정 1건의 집계 변화를 deltas 에 누적한다 (sign=-1 이면 차감)."""
+    b = sign if blocked else 0
+    e = sign if escalated else 0
+    for tag in (ALL_TAGS, *dict.fromkeys(tags)):
+        key = (day, branch, case_code or "", status or "", tag)
+        acc = deltas.get(key)
+        if acc is None:
+            deltas[key] = [sign, b, e]
+        else:
+            acc[0] += sign
+            acc[1] += b
+            acc[2] += e
+
+
+def apply_deltas(db: Session, deltas: Deltas) -> None:
+    """누적된 변화를 upsert 한 번으로 반영한다 (커밋은 호출자)."""
+    rows = [
+        dict(zip(_KEY_COLUMNS, key), count=c, blocked=b, escalated=e)
+        for key, (c, b, e) in deltas.items()
+        if c or b or e
+    ]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        table = DeterminationRollup.__table__
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_KEY_COLUMNS),
+            set_={
+                "count": table.c.count + stmt.excluded["count"],
+                "blocked": table.c.blocked + stmt.excluded.blocked,
+                "escalated": table.c.escalated + stmt.excluded.escalated,
+            },
+        )
+        db.execute(stmt, rows)
+        return
+    # 그 밖의 DB: 조회 후 갱신
+    for row in rows:
+        existing = db.execute(
+            select(DeterminationRollup).filter_by(**{k: row[k] for k in _KEY_COLUMNS})
+        ).scalar_one_or_none()
+        if existing is None:
+            db.add(DeterminationRollup(**row))
+        else:
+            existing.count += row["count"]
+            existing.blocked += row["blocked"]
+            existing.escalated += row["escalated"]
+
+
+def _day(created_at) -> str:
+    if isinstance(created_at, datetime):
+        return created_at.date().isoformat()
+    if created_at:
+        return str(created_at)[:10]
+    return datetime.utcnow().date().isoformat()
+
+
+def _flags(acct_req: AccountRequest) -> tuple[bool, bool]:
+    result = json.loads(acct_req.determination_result_json) if acct_req.determination_result_json else {}
+    return bool(result.get("blocked")), bool(result.get("escalate"))
+
+
+def record_determination(db: Session, acct_req: AccountRequest, blocked: bool, escalated: bool) -> None:
+    """새 판정 1건 반영. created_at 은 서버 기본값(UTC)이므로 오늘(UTC) 날짜를 쓴다."""
+    deltas: Deltas = {}
+    add_delta(
+        deltas, _day(None), stored_branch(db, acct_req),
+        acct_req.case_code, acct_req.status, acct_req.case_tags, blocked, escalated,
+    )
+    apply_deltas(db, deltas)
+
+
+def record_status_change(db: Session, acct_req: AccountRequest, old_status: str, new_status: str) -> None:
+    """판정 상태 변경 반영 — 이전 상태 행에서 빼고 새 상태 행에 더한다 (판정에 저장된 지점 기준)."""
+    if old_status == new_status:
+        return
+    blocked, escalated = _flags(acct_req)
+    day = _day(acct_req.created_at)
+    branch = stored_branch(db, acct_req)
+    deltas: Deltas = {}
+    add_delta(deltas, day, branch, acct_req.case_code, old_status, acct_req.case_tags, blocked, escalated, -1)
+    add_delta(deltas, day, branch, acct_req.case_code, new_status, acct_req.case_tags, blocked, escalated, +1)
+    apply_deltas(db, deltas)
+
+
+def rebuild(db: Session, date_from: date | None = None, date_to: date | None = None, chunk: int = 5000) -> int:
+    """
+    기간(양 끝 포함)의 집계를 원본에서 다시 계산한다. 기간이 없으면 전체.
+    반환: 처리한 판정 수.
+    """
+    departments = dict(db.execute(select(User.id, User.department)).all())
+    stmt = select(
+        AccountRequest.created_at,
+        AccountRequest.created_by,
+        AccountRequest.branch,
+        AccountRequest.case_code,
+        AccountRequest.status,
+        AccountRequest.case_tags_json,
+        AccountRequest.determination_result_json,
+    )
+    purge = delete(DeterminationRollup)
+    lo = hi = None
+    if date_from:
+        lo = datetime.combine(date_from, datetime.min.time())
+        stmt = stmt.where(AccountRequest.created_at >= lo)
+        purge = purge.where(DeterminationRollup.day >= date_from.isoformat())
+    if date_to:
+        hi = datetime.combine(date_to + timedelta(days=1), datetime.min.time())
+        stmt = stmt.where(AccountRequest.created_at < hi)
+        purge = purge.where(DeterminationRollup.day <= date_to.isoformat())
+
+    db.execute(purge)
+    deltas: Deltas = {}
+    n = 0
+    # 아카이브로 옮긴 판정도 집계 원본이다
+    from app.archive import archive
+    for row in archive.rows(db, stmt, chunk=chunk, ordered_by_id=False, created_from=lo, created_to=hi):
+        result = json.loads(row.determination_result_json) if row.determination_result_json else {}
+        add_delta(
+            deltas,
+            _day(row.created_at),
+            row.branch if row.branch is not None else (departments.get(row.created_by) or ""),
+            row.case_code,
+            row.status,
+            json.loads(row.case_tags_json) if row.case_tags_json else [],
+            bool(result.get("blocked")),
+            bool(result.get("escalate")),
+        )
+        n += 1
+    apply_deltas(db, deltas)
+    db.commit()
+    return n
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="판정 집계 테이블 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("rebuild", help="원본 판정으로 집계 재구축 (백필)")
+    p.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    p.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal, engine
+    from app.models.base import Base
+
+    from app.models.archive_partition import ArchivePartition
+    Base.metadata.create_all(bind=engine, tables=[DeterminationRollup.__table__, ArchivePartition.__table__])
+    with engine.begin() as conn:
+        ensure_branch_column(conn)
+    db = SessionLocal()
+    try:
+        n = rebuild(db, args.date_from, args.date_to)
+        print(f"✅ {n} 건 집계 완료")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+"""
+Work Scheduler — 대화형 / 대량 작업 우선순위 레인과 진입 제어
+
+영업점 판정(대화형)과 추출·임포트·재심사 같은 대량 작업이 같은 워커 스레드와
+SQLite 쓰기 연결을 다툰다. 요청을 레인으로 나눠 레인별 동시 실행 수를 제한한다.
+
+- interactive : 동시 SCHED_INTERACTIVE_CONCURRENCY, 대기열 SCHED_INTERACTIVE_QUEUE.
+                대기열이 차거나 SCHED_INTERACTIVE_WAIT 초를 기다리면 503 + Retry-After (과부하).
+- bulk        : 동시 SCHED_BULK_CONCURRENCY, 대기열 SCHED_BULK_QUEUE.
+                대기열이 차거나 SCHED_BULK_WAIT 초를 기다리면 429 + Retry-After.
+- 빈 슬롯은 대화형 대기자에게 먼저 준다. 대화형 실행 수가 SCHED_BULK_YIELD_AT 이상이거나
+  대화형 대기자가 있으면(압박) 대량 요청은 새로 시작하지 않는다. 이때 들어온 대량 요청은
+  대기열에 넣지 않고 바로 429 로 돌려보낸다. 이미 실행 중인 대량 요청은 끝까지 간다.
+- 이미 실행 중인 대량 응답은 본문 청크를 보낼 때마다 대화형 요청이 없어질 때까지(청크당 최대
+  SCHED_YIELD_MAX_WAIT 초) 기다린다. 스트리밍 추출은 청크 사이에 다음 행을 읽지 않으므로
+  단일 코어에서도 판정이 CPU·GIL 을 먼저 쓴다. 대화형이 쉬는 동안에는 제 속도로 흐른다.
+- Retry-After 는 레인의 평균 처리 시간(EWMA) × 앞선 요청 수 / 동시 실행 수 로 추정한다.
+
+레인 결정: BULK_ROUTES 경로 표 + `X-Work-Class: bulk` 헤더. 대량 호출자는 헤더로 스스로 레인을 낮출 수 있고,
+높일 수는 없다. API 밖 경로(/docs 등)와 EXEMPT_ROUTES 는 레인을 거치지 않는다.
+프로세스 안 백그라운드 작업(아카이브 이동 등)은 배치 사이에 `yield_to_interactive()` 로 같은 방식으로 양보한다.
+상태는 프로세스 단위다 (rule_snapshot · response_cache 와 같다).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from starlette.responses import JSONResponse
+
+from app.config import settings
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# (메서드, API 접두어 뒤 경로 접두어) — 대량 레인
+BULK_ROUTES: tuple[tuple[str, str], ...] = (
+    ("GET", "/exports/"),
+    ("POST", "/admin/import/"),
+    ("POST", "/admin/archive/run"),
+)
+
+# 레인을 거치지 않는 경로 — 과부하 중에도 상태를 볼 수 있어야 한다
+EXEMPT_ROUTES: tuple[str, ...] = ("/admin/scheduler",)
+
+_EWMA_ALPHA = 0.2
+
+
+class Rejected(Exception):
+    """진입 거절 — status 429(대량) / 503(대화형 과부하)."""
+
+    def __init__(self, lane: str, status: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.lane = lane
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+@dataclass
+class Lane:
+    name: str
+    concurrency: int
+    queue: int
+    wait: float
+    reject_status: int
+    active: int = 0
+    waiters: deque = field(default_factory=deque)
+    avg_seconds: float = 0.0
+    admitted: int = 0
+    rejected: int = 0
+
+    def retry_after(self, ahead: int | None = None) -> int:
+        ahead = len(self.waiters) + self.active if ahead is None else ahead
+        estimate = self.avg_seconds * ahead / max(1, self.concurrency)
+        return max(1, math.ceil(estimate))
+
+    def observe(self, seconds: float) -> None:
+        self.avg_seconds = seconds if not self.avg_seconds else (
+            (1 - _EWMA_ALPHA) * self.avg_seconds + _EWMA_ALPHA * seconds
+        )
+
+    def snapshot(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queue": self.queue,
+            "active": self.active,
+            "waiting": len(self.waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_ms": round(self.avg_seconds * 1e3, 2),
+        }
+
+
+class Scheduler:
+    """
+    레인별 슬롯 배분. acquire/release 는 이벤트 루프에서만 부른다.
+    백그라운드 스레드는 카운터를 읽기만 한다 (`yield_to_interactive`).
+    """
+
+    def __init__(self, interactive: Lane, bulk: Lane, bulk_yield_at: int, api_prefix: str = ""):
+        self.lanes = {interactive.name: interactive, bulk.name: bulk}
+        self.interactive = interactive
+        self.bulk = bulk
+        self.bulk_yield_at = bulk_yield_at
+        self.api_prefix = api_prefix
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+
+    @classmethod
+    def from_settings(cls) -> Scheduler:
+        return cls(
+            Lane(INTERACTIVE, settings.SCHED_INTERACTIVE_CONCURRENCY, settings.SCHED_INTERACTIVE_QUEUE,
+                 settings.SCHED_INTERACTIVE_WAIT, 503),
+            Lane(BULK, settings.SCHED_BULK_CONCURRENCY, settings.SCHED_BULK_QUEUE,
+                 settings.SCHED_BULK_WAIT, 429),
+            settings.SCHED_BULK_YIELD_AT,
+            settings.API_V1_PREFIX,
+        )
+
+    # ── 분류 ──
+
+    def classify(self, scope) -> str | None:
+        path: str = scope["path"]
+        if not path.startswith(self.api_prefix + "/"):
+            return None
+        path = path[len(self.api_prefix):]
+        if path.startswith(EXEMPT_ROUTES):
+            return None
+        method = scope["method"]
+        if any(method == m and path.startswith(p) for m, p in BULK_ROUTES):
+            return BULK
+        for name, value in scope["headers"]:
+            if name == b"x-work-class" and value.strip().lower() == b"bulk":
+                return BULK
+        return INTERACTIVE
+
+    # ── 슬롯 ──
+
+    def under_pressure(self) -> bool:
+        i = self.interactive
+        return i.active >= self.bulk_yield_at or bool(i.waiters)
+
+    def _can_start(self, lane: Lane) -> bool:
+        if lane.active >= lane.concurrency:
+            return False
+        return lane is not self.bulk or not self.under_pressure()
+
+    def _reject(self, lane: Lane, reason: str, retry_after: int | None = None) -> Rejected:
+        lane.rejected += 1
+        return Rejected(lane.name, lane.reject_status, retry_after or lane.retry_after(), reason)
+
+    async def acquire(self, name: str) -> None:
+        lane = self.lanes[name]
+        if not lane.waiters and self._can_start(lane):
+            lane.active += 1
+            lane.admitted += 1
+            self._track_idle()
+            return
+        if lane is self.bulk and self.under_pressure():
+            # 대화형 평균 처리 시간만큼 뒤에 다시 — 압박은 보통 그보다 빨리 풀린다
+            raise self._reject(lane, "interactive work has priority", self.interactive.retry_after())
+        if len(lane.waiters) >= lane.queue:
+            raise self._reject(lane, "queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        lane.waiters.append(future)
+        self._track_idle()
+        try:
+            await asyncio.wait_for(future, lane.wait)
+        except asyncio.TimeoutError:
+            self._forget(lane, future)
+            self._track_idle()
+            raise self._reject(lane, "queue wait timed out") from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(name, 0.0)  # 슬롯을 받은 직후 취소됨 (클라이언트 연결 끊김)
+            else:
+                self._forget(lane, future)
+                self._track_idle()
+            raise
+        lane.admitted += 1
+
+    def release(self, name: str, seconds: float) -> None:
+        lane = self.lanes[name]
+        lane.active -= 1
+        if seconds:
+            lane.observe(seconds)
+        self._dispatch()
+        self._track_idle()
+
+    def _forget(self, lane: Lane, future: asyncio.Future) -> None:
+        try:
+            lane.waiters.remove(future)
+        except ValueError:
+            pass
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 대화형 대기자부터 채운다. 슬롯은 깨우기 전에 잡아 둔다."""
+        for lane in (self.interactive, self.bulk):
+            while lane.waiters and self._can_start(lane):
+                future = lane.waiters.popleft()
+                if future.done():  # 시간 초과로 취소된 대기자
+                    continue
+                lane.active += 1
+                future.set_result(None)
+
+    def _track_idle(self) -> None:
+        i = self.interactive
+        if i.active or i.waiters:
+            self._interactive_idle.clear()
+        else:
+            self._interactive_idle.set()
+
+    async def yield_chunk(self, max_wait: float | None = None) -> None:
+        """(대량 응답용) 대화형 요청이 없어질 때까지 최대 max_wait 초 기다린다."""
+        if self._interactive_idle.is_set():
+            return
+        max_wait = settings.SCHED_YIELD_MAX_WAIT if max_wait is None else max_wait
+        try:
+            await asyncio.wait_for(self._interactive_idle.wait(), max_wait)
+        except asyncio.TimeoutError:
+            pass
+
+    def snapshot(self) -> dict:
+        return {
+            "under_pressure": self.under_pressure(),
+            "bulk_yield_at": self.bulk_yield_at,
+            "lanes": {name: lane.snapshot() for name, lane in self.lanes.items()},
+        }
+
+    # ── 백그라운드 작업 ──
+
+    def yield_to_interactive(self, max_wait: float | None = None, poll: float = 0.01) -> float:
+        """
+        (워커 스레드용) 실행 중인 대화형 요청이 없어질 때까지 최대 max_wait 초 기다린다.
+        배치 사이에 불러 SQLite 쓰기 연결을 대화형 판정에 먼저 넘긴다. 기다린 시간을 반환.
+        """
+        max_wait = settings.SCHED_YIELD_MAX_WAIT if max_wait is None else max_wait
+        start = time.monotonic()
+        deadline = start + max_wait
+        while (self.interactive.active or self.interactive.waiters) and time.monotonic() < deadline:
+            time.sleep(poll)
+        return time.monotonic() - start
+
+
+class SchedulerMiddleware:
+    """순수 ASGI 미들웨어 — 스트리밍 응답이 끝날 때까지 슬롯을 잡는다."""
+
+    def __init__(self, app, scheduler: Scheduler):
+        self.app = app
+        self.scheduler = scheduler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        lane = self.scheduler.classify(scope)
+        if lane is None:
+            return await self.app(scope, receive, send)
+        try:
+            await self.scheduler.acquire(lane)
+        except Rejected as exc:
+            response = JSONResponse(
+                {"detail": exc.reason, "lane": exc.lane, "retry_after": exc.retry_after},
+                status_code=exc.status,
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+            return await response(scope, receive, send)
+        if lane == BULK:
+            send = self._yielding(send)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.scheduler.release(lane, time.perf_counter() - started)
+
+    def _yielding(self, send):
+        async def send_after_interactive(message):
+            if message["type"] == "http.response.body" and message.get("more_body"):
+                await self.scheduler.yield_chunk()
+            await send(message)
+
+        return send_after_interactive
+
+
+# 프로세스 전역 스케줄러
+scheduler = Scheduler.from_settings()
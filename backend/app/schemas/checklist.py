@@ -0,0 +1,59 @@
+"""Pydantic schemas for the document checklist API."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+# ── Request ──
+
+class DocumentSubmissionRequest(BaseModel):
+    """서류 접수/철회 델타. 같은 호출에서 한 서류를 접수와 철회에 동시에 넣을 수 없다."""
+    received: list[str] = Field(default_factory=list)
+    withdrawn: list[str] = Field(default_factory=list)
+    actor_id: int | None = None
+    reason: str | None = None
+
+
+# ── Response ──
+
+class ChecklistItemOut(BaseModel):
+    document_code: str
+    requirement: str
+    group_code: str | None = None
+    received: bool
+    received_at: datetime | None = None
+
+
+class ChecklistGroupOut(BaseModel):
+    group_code: str
+    min_required: int
+    received_count: int
+    satisfied: bool
+    description: str | None = None
+
+
+class ChecklistOut(BaseModel):
+    """접수 현황 전체."""
+    request_id: int
+    status: str
+    outstanding_required: int
+    unsatisfied_groups: int
+    complete: bool
+    items: list[ChecklistItemOut]
+    groups: list[ChecklistGroupOut]
+
+
+class ChecklistUpdateOut(BaseModel):
+    """접수 델타 반영 결과 — 바뀐 항목만 담는다."""
+    request_id: int
+    previous_status: str
+    status: str
+    outstanding_required: int
+    unsatisfied_groups: int
+    complete: bool
+    changed_items: list[ChecklistItemOut]
+    changed_groups: list[ChecklistGroupOut]
+    ignored: list[str] = []
@@ -23,11 +23,8 @@ class RiskFlagsInput(BaseModel):
     dormant_suspicious: bool = False
 
 
-class DeterminationRequest(BaseModel):
-    """직원이 판정을 요청할 때 보내는 입력값."""
-    # §6.1
-    business_reg_no: str = Field(..., min_length=1, max_length=20)
-    corp_name: str = Field(..., min_length=1, max_length=200)
+class DeterminationInput(BaseModel):
+    """판정 엔진 입력값 (고객 식별 정보 제외) — 미리보기 요청 본문."""
     # §6.2
     customer_type: CustomerType
     domestic_flag: bool = True
@@ -41,15 +38,24 @@ class DeterminationRequest(BaseModel):
     ownership_simple: bool = True
     multi_layer_ownership: bool = False
     ultimate_owner_unknown: bool = False
-    # §6.6
-    account_purpose: str | None = None
-    fund_source: str | None = None
     # §6.7
     risk_flags: RiskFlagsInput = Field(default_factory=RiskFlagsInput)
     # 신설법인 여부
     is_new_corp: bool = False
 
 
+class DeterminationRequest(DeterminationInput):
+    """직원이 판정을 요청할 때 보내는 입력값."""
+    # §6.1
+    business_reg_no: str = Field(..., min_length=1, max_length=20)
+    corp_name: str = Field(..., min_length=1, max_length=200)
+    # §6.6
+    account_purpose: str | None = None
+    fund_source: str | None = None
+    # 등록 직원 (지점별 집계 기준)
+    created_by: int | None = None
+
+
 # ── Response ──
 
 class DocumentGroupResponse(BaseModel):
@@ -71,6 +77,8 @@ class DeterminationResponse(BaseModel):
     escalate: bool
     explanations: list[str]
     matched_rules: list[str]
+    # ?trace=true 일 때만 — 룰별 평가 트리와 필수서류별 근거 (§11.4)
+    trace: dict | None = None
 
 
 # ── AccountRequest list ──
@@ -0,0 +1,489 @@
+"""
+Bulk Screening — 고객 파일 일괄 재심사 (§11 일괄 판정)
+
+CSV 또는 NDJSON 고객 속성 파일을 스트리밍으로 읽어 행마다 `/determine` 과 같은 판정을 한다.
+
+- 행은 `DeterminationRequest` 로 검증한다. 검증에 실패한 행은 중단하지 않고 오류 레코드로 남긴다.
+- 청크(--chunk 행) 단위로 프로세스 풀에 나눈다. 워커는 시작할 때 부모가 읽은 룰 스냅샷을
+  한 번 컴파일해 두고, 청크마다 열 단위 일괄 평가(BatchEvaluator)로 판정한다.
+  결과 인코딩도 서로 다른 판정마다 한 번만 한다.
+- 결과는 입력 순서대로 출력 파일(.ndjson / .jsonl / .csv)에 이어 쓴다.
+  --persist 이면 청크마다 고객 upsert · 판정 · 감사 로그 · 집계를 한 트랜잭션으로 일괄 저장한다.
+- 진행 상황은 `<출력>.progress` 에 청크마다 기록하고, --resume 으로 끊긴 곳부터 이어서 실행한다.
+  저장 모드에서는 청크 커밋과 함께 BULK_SCREENING 감사 로그에 진행 행 수를 남긴다.
+  그래서 커밋 직후에 끊겨도 다시 저장하지 않는다.
+
+CSV 입력은 DeterminationRequest 필드 이름을 열 이름으로 쓴다. 위험 플래그는 `risk_flags.high_risk_country`
+형식으로 쓰고, 빈 칸은 기본값을 쓴다.
+
+    python -m app.screening customers.csv -o results.ndjson [--workers 4] [--chunk 2000] [--persist]
+    python -m app.screening customers.csv -o results.ndjson --resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.api.determination import build_context
+from app.customers import upsert_customers
+from app.engine.batch import BatchEvaluator
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.result_codec import EncodedResult, dumps
+from app.engine.rule_compiler import CompiledRuleSet
+from app.engine.rule_snapshot import load_rules_data
+from app.models.account_request import AccountRequest
+from app.models.audit_log import AuditLog
+from app.models.document_type import DocumentType
+from app.rollups import Deltas, _day, add_delta, apply_deltas, branch_of, ensure_branch_column
+from app.schemas.determination import DeterminationRequest
+from app.tabular.csv_stream import neutralize_formula
+
+DEFAULT_CHUNK = 2000
+
+OUTPUT_COLUMNS = [
+    "line", "business_reg_no", "corp_name", "case_code", "case_tags", "status",
+    "required_documents", "optional_documents", "document_groups",
+    "blocked", "escalate", "matched_rules", "explanations", "errors",
+]
+
+_CUSTOMER_FIELDS = ("business_reg_no", "corp_name", "customer_type", "domestic_flag", "business_status")
+_REQUEST_FIELDS = (
+    "account_type", "applicant_type", "ubo_confirmable", "ownership_simple",
+    "multi_layer_ownership", "ultimate_owner_unknown", "account_purpose", "fund_source", "created_by",
+)
+
+
+class ScreeningError(Exception):
+    """실행 전 점검 실패 (출력 파일 충돌, 이어하기 불가 등)."""
+
+
+# ──────────────────────────────────────────────
+# 입력
+# ──────────────────────────────────────────────
+
+def _input_format(path: Path) -> str:
+    return "csv" if path.suffix.lower() == ".csv" else "ndjson"
+
+
+def _csv_record(row: dict) -> dict:
+    """CSV 행 → 요청 본문. 빈 칸은 빼서 기본값을 쓰고, `risk_flags.x` 열은 중첩한다."""
+    record: dict[str, Any] = {}
+    for key, value in row.items():
+        if key is None or value is None or value == "":
+            continue
+        key = key.strip()
+        head, dot, flag = key.partition(".")
+        if dot and head == "risk_flags":
+            record.setdefault("risk_flags", {})[flag] = value
+        else:
+            record[key] = value
+    return record
+
+
+def iter_records(path: Path, fmt: str | None = None) -> Iterator[Any]:
+    """입력 파일의 레코드를 순서대로. 깨진 NDJSON 줄은 ValueError 객체로 내보내 오류 행이 된다."""
+    fmt = fmt or _input_format(path)
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield _csv_record(row)
+        return
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield ValueError(f"JSON 오류: {exc}")
+
+
+def _chunks(records: Iterable[Any], size: int, first_line: int) -> Iterator[tuple[int, list]]:
+    chunk: list = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield first_line, chunk
+            first_line += len(chunk)
+            chunk = []
+    if chunk:
+        yield first_line, chunk
+
+
+# ──────────────────────────────────────────────
+# 워커 — 룰 스냅샷 하나를 들고 청크를 판정한다
+# ──────────────────────────────────────────────
+
+_evaluator: BatchEvaluator | None = None
+
+
+def _init_worker(rules_data: list[dict], catalog_codes: list[str]) -> None:
+    global _evaluator
+    rule_set = CompiledRuleSet(rules_data, adaptive=False, catalog=DocumentCatalog(catalog_codes))
+    _evaluator = BatchEvaluator(rule_set)
+
+
+@dataclass
+class ChunkResult:
+    first_line: int
+    rows: int
+    errors: int
+    output: bytes
+    # --persist: 판정별 (본문, case_code, case_tags_json, status, blocked, escalate) 와
+    # 행별 (고객 값, 판정 값, 판정 인덱스)
+    results: list[tuple] = field(default_factory=list)
+    records: list[tuple[dict, dict, int]] = field(default_factory=list)
+
+
+def _error_messages(exc: Exception) -> list[str]:
+    if isinstance(exc, ValidationError):
+        return [f"{'.'.join(map(str, e['loc'])) or 'body'}: {e['msg']}" for e in exc.errors()]
+    return [str(exc)]
+
+
+def _join(values) -> str:
+    return "; ".join(str(v) for v in values) if values else ""
+
+
+def _csv_columns(payload: dict) -> list:
+    """결과 → OUTPUT_COLUMNS 의 case_code..explanations 열 (내보내기 API 와 같은 표기)."""
+    return [
+        payload["case_code"],
+        _join(payload["case_tags"]),
+        payload["status"],
+        _join(payload["required_documents"]),
+        _join(payload["optional_documents"]),
+        _join(
+            f"{g['group_code']}({g['min_required']}): {'|'.join(g['documents'])}"
+            for g in payload["document_groups"]
+        ),
+        payload["blocked"],
+        payload["escalate"],
+        _join(payload["matched_rules"]),
+        _join(payload["explanations"]),
+    ]
+
+
+def screen_chunk(first_line: int, records: list, out_format: str, persist: bool) -> ChunkResult:
+    """레코드 청크를 검증·판정하고 출력 바이트(와 저장용 값)를 만든다."""
+    valid: list[tuple[int, DeterminationRequest]] = []
+    failed: dict[int, tuple[Any, list[str]]] = {}
+    for offset, record in enumerate(records):
+        line = first_line + offset
+        if isinstance(record, Exception):
+            failed[line] = ({}, _error_messages(record))
+            continue
+        try:
+            valid.append((line, DeterminationRequest.model_validate(record)))
+        except ValidationError as exc:
+            failed[line] = (record if isinstance(record, dict) else {}, _error_messages(exc))
+
+    batch = _evaluator.determine([build_context(req) for _, req in valid])
+    encoded = [EncodedResult(r) for r in batch.results]
+    chunk = ChunkResult(first_line, len(records), len(failed), b"")
+    if persist:
+        chunk.results = [
+            (
+                e.text, r.case_code, json.dumps(list(r.case_tags), ensure_ascii=False),
+                r.status, r.blocked, r.escalate,
+            )
+            for e, r in zip(encoded, batch.results)
+        ]
+    result_of = {line: (req, k) for (line, req), k in zip(valid, batch.inverse.tolist())}
+
+    if out_format == "csv":
+        columns = [_csv_columns(e.payload) for e in encoded]
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\r\n")
+    else:
+        parts: list[bytes] = []
+
+    for offset, record in enumerate(records):
+        line = first_line + offset
+        if line in failed:
+            raw, messages = failed[line]
+            ident = [raw.get("business_reg_no"), raw.get("corp_name")]
+            if out_format == "csv":
+                writer.writerow([line, *map(neutralize_formula, ident), *[""] * 10, neutralize_formula(_join(messages))])
+            else:
+                parts.append(dumps({
+                    "line": line, "business_reg_no": ident[0], "corp_name": ident[1], "errors": messages,
+                }) + b"\n")
+            continue
+        req, k = result_of[line]
+        if out_format == "csv":
+            writer.writerow([
+                line, neutralize_formula(req.business_reg_no), neutralize_formula(req.corp_name), *columns[k], "",
+            ])
+        else:
+            # 판정 본문은 이미 인코딩된 바이트를 그대로 잇는다
+            head = dumps({"line": line, "business_reg_no": req.business_reg_no, "corp_name": req.corp_name})
+            parts.append(head[:-1] + b',"result":' + encoded[k].body + b"}\n")
+        if persist:
+            values = req.model_dump(mode="json", include={*_CUSTOMER_FIELDS, *_REQUEST_FIELDS, "risk_flags"})
+            chunk.records.append((
+                {f: values[f] for f in _CUSTOMER_FIELDS},
+                {
+                    **{f: values[f] for f in _REQUEST_FIELDS},
+                    "risk_flags_json": json.dumps(values["risk_flags"], ensure_ascii=False),
+                },
+                k,
+            ))
+
+    chunk.output = buf.getvalue().encode("utf-8") if out_format == "csv" else b"".join(parts)
+    return chunk
+
+
+# ──────────────────────────────────────────────
+# 저장 — 청크 하나 = 트랜잭션 하나
+# ──────────────────────────────────────────────
+
+def persist_chunk(db: Session, chunk: ChunkResult, run_id: str, rows_done: int) -> int:
+    """청크의 판정을 저장하고 BULK_SCREENING 진행 기록을 남긴 뒤 커밋한다. 저장한 판정 수를 반환."""
+    ids = upsert_customers(db, [customer for customer, _, _ in chunk.records])
+    rows = []
+    deltas: Deltas = {}
+    branches: dict[int, str] = {}
+    day = _day(None)
+    for customer, values, k in chunk.records:
+        text, case_code, case_tags_json, status, blocked, escalate = chunk.results[k]
+        branch = branch_of(db, values["created_by"], branches)
+        rows.append({
+            **values,
+            "branch": branch,
+            "customer_id": ids[customer["business_reg_no"]],
+            "case_code": case_code,
+            "case_tags_json": case_tags_json,
+            "status": status,
+            "determination_result_json": text,
+        })
+        add_delta(
+            deltas, day, branch,
+            case_code, status, json.loads(case_tags_json), blocked, escalate,
+        )
+    if rows:
+        new_ids = db.execute(
+            insert(AccountRequest).returning(AccountRequest.id, sort_by_parameter_order=True), rows,
+        ).scalars().all()
+        db.execute(insert(AuditLog), [
+            {
+                "event_type": "CASE_CREATED",
+                "target_type": "account_request",
+                "target_id": request_id,
+                "new_value": row["determination_result_json"],
+                "reason": "일괄 재심사 판정",
+            }
+            for request_id, row in zip(new_ids, rows)
+        ])
+        apply_deltas(db, deltas)
+    db.add(AuditLog(
+        event_type="BULK_SCREENING",
+        target_type="screening_run",
+        new_value=dumps({"run": run_id, "rows": rows_done}).decode("utf-8"),
+        reason="일괄 재심사 진행",
+    ))
+    db.commit()
+    return len(rows)
+
+
+def persisted_rows(db: Session, run_id: str) -> int:
+    """이 실행에서 커밋까지 끝난 입력 행 수 (BULK_SCREENING 진행 기록 기준)."""
+    value = db.execute(
+        select(AuditLog.new_value)
+        .where(AuditLog.event_type == "BULK_SCREENING", AuditLog.new_value.contains(f'"run":"{run_id}"'))
+        .order_by(AuditLog.id.desc())
+        .limit(1)
+    ).scalar()
+    return json.loads(value)["rows"] if value else 0
+
+
+# ──────────────────────────────────────────────
+# 실행 / 이어하기
+# ──────────────────────────────────────────────
+
+def snapshot_digest(rules_data: list[dict], catalog_codes: list[str]) -> str:
+    """룰 스냅샷 지문 — 이어하기 전후로 룰이 바뀌었는지 확인한다."""
+    body = json.dumps([rules_data, catalog_codes], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+
+
+def _input_stamp(path: Path) -> dict:
+    stat = path.stat()
+    return {"input": str(path.resolve()), "input_size": stat.st_size, "input_mtime_ns": stat.st_mtime_ns}
+
+
+def _write_progress(path: Path, progress: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(progress, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _prepare(args, rules_data: list[dict], catalog_codes: list[str]) -> dict:
+    """새 실행이면 진행 파일을 만들고, --resume 이면 점검한 뒤 출력 파일을 마지막 청크 끝으로 자른다."""
+    progress_path = Path(str(args.output) + ".progress")
+    digest = snapshot_digest(rules_data, catalog_codes)
+    if args.resume:
+        if not progress_path.exists():
+            raise ScreeningError(f"진행 파일이 없습니다: {progress_path}")
+        progress = json.loads(progress_path.read_text(encoding="utf-8"))
+        if {k: progress[k] for k in ("input", "input_size", "input_mtime_ns")} != _input_stamp(args.input):
+            raise ScreeningError("입력 파일이 이전 실행과 다릅니다")
+        if progress["snapshot"] != digest:
+            raise ScreeningError("이전 실행 이후 룰이 바뀌었습니다 — 새 출력 파일로 다시 실행하세요")
+        if progress["persist"] != args.persist:
+            raise ScreeningError(f"이전 실행은 --persist={progress['persist']} 였습니다")
+        with open(args.output, "r+b") as f:
+            f.truncate(progress["output_bytes"])
+        return progress
+    if args.output.exists() or progress_path.exists():
+        raise ScreeningError(f"출력 파일이 이미 있습니다: {args.output} (--resume 또는 다른 경로)")
+    header = b""
+    if args.output_format == "csv":
+        header = ("﻿" + ",".join(OUTPUT_COLUMNS) + "\r\n").encode("utf-8")
+    args.output.write_bytes(header)
+    progress = {
+        "run": uuid.uuid4().hex,
+        **_input_stamp(args.input),
+        "snapshot": digest,
+        "persist": args.persist,
+        "chunk": args.chunk,
+        "rows": 0,
+        "errors": 0,
+        "persisted": 0,
+        "output_bytes": len(header),
+        "done": False,
+    }
+    _write_progress(progress_path, progress)
+    return progress
+
+
+def _report(progress: dict, started_rows: int, started: float, final: bool = False) -> None:
+    elapsed = time.perf_counter() - started
+    rate = (progress["rows"] - started_rows) / elapsed if elapsed else 0.0
+    sys.stderr.write(
+        f"\r{progress['rows']:>12,} 행  {rate:>10,.0f} 행/s  오류 {progress['errors']:,}"
+        f"  저장 {progress['persisted']:,}" + ("\n" if final else "")
+    )
+    sys.stderr.flush()
+
+
+def run(args, db: Session) -> dict:
+    rules_data = load_rules_data(db)
+    # 워커마다 같은 서류 순서로 카탈로그를 만들도록 마스터 코드만 넘긴다 (load_document_catalog 와 같은 순서)
+    catalog_codes = list(db.execute(select(DocumentType.code).order_by(DocumentType.id)).scalars())
+    progress = _prepare(args, rules_data, catalog_codes)
+    progress_path = Path(str(args.output) + ".progress")
+    if progress["done"]:
+        return progress
+    chunk_size = progress["chunk"]
+    skip = progress["rows"]
+    # 커밋 직후 진행 파일을 쓰기 전에 끊겼다면 DB 가 앞서 있다 — 그 청크는 다시 저장하지 않는다
+    committed = persisted_rows(db, progress["run"]) if args.persist else 0
+
+    records = iter_records(args.input, args.input_format)
+    for _ in range(skip):
+        next(records, None)
+    chunks = _chunks(records, chunk_size, first_line=skip + 1)
+
+    started, started_rows = time.perf_counter(), progress["rows"]
+
+    def handle(chunk: ChunkResult) -> None:
+        rows_done = chunk.first_line - 1 + chunk.rows
+        if args.persist:
+            if rows_done > committed:
+                progress["persisted"] += persist_chunk(db, chunk, progress["run"], rows_done)
+            else:
+                progress["persisted"] += len(chunk.records)
+        out.write(chunk.output)
+        out.flush()
+        os.fsync(out.fileno())
+        progress["rows"] = rows_done
+        progress["errors"] += chunk.errors
+        progress["output_bytes"] = out.tell()
+        _write_progress(progress_path, progress)
+        _report(progress, started_rows, started)
+
+    with open(args.output, "ab") as out:
+        if args.workers <= 1:
+            _init_worker(rules_data, catalog_codes)
+            for first_line, records_chunk in chunks:
+                handle(screen_chunk(first_line, records_chunk, args.output_format, args.persist))
+        else:
+            with ProcessPoolExecutor(
+                args.workers, initializer=_init_worker, initargs=(rules_data, catalog_codes),
+            ) as pool:
+                # 입력 순서대로 쓰되, 워커마다 두 청크씩 미리 맡겨 둔다 (메모리는 그만큼만 쓴다)
+                pending: deque = deque()
+                for first_line, records_chunk in chunks:
+                    pending.append(pool.submit(
+                        screen_chunk, first_line, records_chunk, args.output_format, args.persist,
+                    ))
+                    if len(pending) >= args.workers * 2:
+                        handle(pending.popleft().result())
+                while pending:
+                    handle(pending.popleft().result())
+
+    progress["done"] = True
+    _write_progress(progress_path, progress)
+    _report(progress, started_rows, started, final=True)
+    return progress
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="고객 파일 일괄 재심사", formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__,
+    )
+    parser.add_argument("input", type=Path, help="CSV 또는 NDJSON 고객 속성 파일")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="결과 파일 (.ndjson / .jsonl / .csv)")
+    parser.add_argument("--input-format", choices=("csv", "ndjson"), help="기본: 확장자로 판단")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="판정 프로세스 수")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="청크 행 수 (이어하기 시 이전 값 사용)")
+    parser.add_argument("--persist", action="store_true", help="고객·판정·감사 로그·집계를 DB 에 저장")
+    parser.add_argument("--resume", action="store_true", help="진행 파일 기준으로 이어서 실행")
+    args = parser.parse_args(argv)
+    args.output_format = "csv" if args.output.suffix.lower() == ".csv" else "ndjson"
+
+    from app.database import SessionLocal, engine
+
+    if args.persist:
+        # 기존 DB 에 아직 없는 테이블(집계 등)은 만들어 둔다 — app.rollups.main 과 같다
+        from app.models.base import Base
+        from app.models.customer import Customer
+        from app.models.determination_rollup import DeterminationRollup
+
+        Base.metadata.create_all(bind=engine, tables=[
+            Customer.__table__, AccountRequest.__table__, AuditLog.__table__, DeterminationRollup.__table__,
+        ])
+        with engine.begin() as conn:
+            ensure_branch_column(conn)
+    db = SessionLocal()
+    try:
+        progress = run(args, db)
+    except ScreeningError as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    print(f"✅ {progress['rows']:,} 행 판정 (오류 {progress['errors']:,}, 저장 {progress['persisted']:,}) → {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""
+Search Index — 고객/판정 검색용 SQLite FTS5 인덱스.
+
+- customer_fts        : trigram 토크나이저 — 법인명·사업자번호 부분 문자열 검색 (3자 이상)
+- customer_prefix_fts : unicode61 + prefix 인덱스 — 2자 이하/어절 접두 검색 (예: "삼성")
+두 테이블 모두 customers 를 외부 콘텐츠로 참조하며, 트리거로 삽입/수정/삭제 시 증분 갱신된다.
+SQLite 가 아니면(FTS5 없음) 아무것도 만들지 않고, 검색 API 는 LIKE 로 대체한다.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Engine, text
+
+FTS_TABLES = ("customer_fts", "customer_prefix_fts")
+
+_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS customer_fts USING fts5(
+        corp_name, business_reg_no,
+        content='customers', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS customer_prefix_fts USING fts5(
+        corp_name,
+        content='customers', content_rowid='id', prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_search_ai AFTER INSERT ON customers BEGIN
+        INSERT INTO customer_fts(rowid, corp_name, business_reg_no)
+            VALUES (new.id, new.corp_name, new.business_reg_no);
+        INSERT INTO customer_prefix_fts(rowid, corp_name) VALUES (new.id, new.corp_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS customers_search_ad AFTER DELETE ON customers BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, corp_name, business_reg_no)
+            VALUES ('delete', old.id, old.corp_name, old.business_reg_no);
+        INSERT INTO customer_prefix_fts(customer_prefix_fts, rowid, corp_name)
+            VALUES ('delete', old.id, old.corp_name);
+    END
+    """,
+    # 고객 upsert 는 값이 같아도 corp_name 을 SET 하므로 실제로 바뀔 때만 색인을 고친다.
+    # 조건 없는 이전 트리거가 있는 DB 도 교체되도록 매번 다시 만든다.
+    "DROP TRIGGER IF EXISTS customers_search_au",
+    """
+    CREATE TRIGGER customers_search_au
+    AFTER UPDATE OF corp_name, business_reg_no ON customers
+    WHEN old.corp_name IS NOT new.corp_name OR old.business_reg_no IS NOT new.business_reg_no
+    BEGIN
+        INSERT INTO customer_fts(customer_fts, rowid, corp_name, business_reg_no)
+            VALUES ('delete', old.id, old.corp_name, old.business_reg_no);
+        INSERT INTO customer_fts(rowid, corp_name, business_reg_no)
+            VALUES (new.id, new.corp_name, new.business_reg_no);
+        INSERT INTO customer_prefix_fts(customer_prefix_fts, rowid, corp_name)
+            VALUES ('delete', old.id, old.corp_name);
+        INSERT INTO customer_prefix_fts(rowid, corp_name) VALUES (new.id, new.corp_name);
+    END
+    """,
+    # 판정 필터 (case_code/status) — 기존 DB 에도 적용되도록 모델 대신 여기서 생성
+    "CREATE INDEX IF NOT EXISTS ix_account_requests_customer_case_status "
+    "ON account_requests (customer_id, case_code, status)",
+    "CREATE INDEX IF NOT EXISTS ix_account_requests_case_status ON account_requests (case_code, status)",
+]
+
+
+def fts_available(engine: Engine) -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """인덱스·트리거를 만들고, 새로 만든 인덱스는 기존 고객으로 채운다. FTS5 사용 여부를 반환."""
+    if not fts_available(engine):
+        return False
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name = 'customer_fts'")
+        ).scalar()
+        for ddl in _DDL:
+            conn.execute(text(ddl))
+        if not existed:
+            rebuild(conn)
+    return True
+
+
+def rebuild(conn) -> None:
+    """customers 전체로 FTS 인덱스를 다시 만든다 (트리거 도입 전 데이터 백필)."""
+    for table in FTS_TABLES:
+        conn.execute(text(f"INSERT INTO {table}({table}) VALUES ('rebuild')"))
@@ -0,0 +1,538 @@
+"""
+Requirement Matrix Importer — 구비서류 매트릭스(XLSX) → DocumentType / Rule 일괄 반영 (§8, §11, §18)
+
+워크북 양식
+-----------
+시트 "document_types" (또는 "서류유형")
+    code(코드) | name(서류명) | category(분류) | description(설명) | enabled(사용)
+시트 "rules" (또는 "룰")
+    rule_name(룰명) | priority(우선순위) | enabled(사용) | conditions(조건, JSON) |
+    required_documents(필수서류) | optional_documents(선택서류) |
+    blocked_if_missing(미비시차단) | escalate_if_true(에스컬레이션) |
+    output_status(출력상태) | output_case_tags(케이스태그) | explanation_template(안내문구)
+
+- 첫 번째 비어 있지 않은 행이 헤더. 헤더에 없는 열은 기존 값을 유지한다.
+- 목록 셀은 줄바꿈/쉼표/세미콜론으로 구분. 불리언은 TRUE/FALSE, Y/N, 1/0, O/X.
+- 서류는 code, 룰은 rule_name 으로 기존 레코드와 대응한다. DB 에 같은 rule_name 의 룰이 여럿이면
+  대응할 룰을 정할 수 없으므로 그 이름의 행은 오류로 보고한다 (관리 화면에서 이름을 바꾼 뒤 다시 가져온다).
+- 오류가 하나라도 있으면 아무것도 반영하지 않는다.
+- 반영은 한 트랜잭션의 일괄 INSERT/UPDATE + MATRIX_IMPORTED 감사 로그 1건.
+
+    python -m app.seed.matrix_importer 매트릭스.xlsx [--dry-run] [--prune] [--actor-id N]
+    python -m app.seed.matrix_importer --template 매트릭스.xlsx   # 현재 DB 를 같은 양식으로 내보내기
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterator
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.engine.rule_validation import RuleValidationError, check_condition
+from app.enums import DocumentCategory, RequestStatus
+from app.models.audit_log import AuditLog
+from app.models.document_type import DocumentType
+from app.models.rule import PolicyVersion, Rule
+from app.tabular.xlsx_reader import XlsxFormatError, XlsxReader
+
+DOC_SHEETS = ("document_types", "서류유형")
+RULE_SHEETS = ("rules", "룰")
+
+# 필드 → 허용 헤더 (공백 제거·소문자 비교)
+DOC_COLUMNS: dict[str, tuple[str, ...]] = {
+    "code": ("code", "코드", "서류코드"),
+    "name": ("name", "서류명", "명칭"),
+    "category": ("category", "분류", "카테고리"),
+    "description": ("description", "설명"),
+    "enabled": ("enabled", "사용", "사용여부"),
+}
+RULE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "rule_name": ("rule_name", "룰명", "규칙명"),
+    "priority": ("priority", "우선순위"),
+    "enabled": ("enabled", "사용", "사용여부"),
+    "conditions": ("conditions", "조건"),
+    "required_documents": ("required_documents", "필수서류"),
+    "optional_documents": ("optional_documents", "선택서류"),
+    "blocked_if_missing": ("blocked_if_missing", "미비시차단"),
+    "escalate_if_true": ("escalate_if_true", "에스컬레이션"),
+    "output_status": ("output_status", "출력상태", "판정상태"),
+    "output_case_tags": ("output_case_tags", "케이스태그"),
+    "explanation_template": ("explanation_template", "안내문구"),
+}
+
+# 시트 필드 → Rule 컬럼
+_RULE_FIELD_COLUMNS = {
+    "conditions": "conditions_json",
+    "required_documents": "required_documents_json",
+    "optional_documents": "optional_documents_json",
+    "output_case_tags": "output_case_tags_json",
+}
+_JSON_LIST_COLUMNS = {"required_documents_json", "optional_documents_json", "output_case_tags_json"}
+
+_TRUE = {"true", "y", "yes", "1", "o", "예", "사용"}
+_FALSE = {"false", "n", "no", "0", "x", "아니오", "미사용"}
+_LIST_SPLIT = re.compile(r"[\n,;]+")
+
+_CATEGORIES = {c.value for c in DocumentCategory}
+_STATUSES = {s.value for s in RequestStatus}
+
+
+class MatrixImportError(ValueError):
+    """워크북 구조 오류 (시트/헤더 누락 등)."""
+
+
+@dataclass
+class RowError:
+    sheet: str
+    row: int
+    message: str
+
+
+@dataclass
+class Change:
+    key: str
+    action: str                                   # created | updated | disabled
+    fields: dict[str, tuple[Any, Any]] = field(default_factory=dict)  # 컬럼 → (이전, 이후)
+
+
+@dataclass
+class ImportReport:
+    source: str
+    document_types: list[Change] = field(default_factory=list)
+    rules: list[Change] = field(default_factory=list)
+    unchanged: dict[str, int] = field(default_factory=lambda: {"document_types": 0, "rules": 0})
+    errors: list[RowError] = field(default_factory=list)
+    applied: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def counts(self) -> dict:
+        out = {}
+        for name, changes in (("document_types", self.document_types), ("rules", self.rules)):
+            c = {"created": 0, "updated": 0, "disabled": 0, "unchanged": self.unchanged[name]}
+            for ch in changes:
+                c[ch.action] += 1
+            out[name] = c
+        return out
+
+    def to_dict(self) -> dict:
+        def changes(items: list[Change]) -> list[dict]:
+            return [
+                {"key": c.key, "action": c.action,
+                 "fields": {k: {"old": o, "new": n} for k, (o, n) in c.fields.items()}}
+                for c in items
+            ]
+        return {
+            "source": self.source,
+            "applied": self.applied,
+            "counts": self.counts(),
+            "document_types": changes(self.document_types),
+            "rules": changes(self.rules),
+            "errors": [e.__dict__ for e in self.errors],
+        }
+
+
+# ──────────────────────────────────────────────
+# 셀 변환
+# ──────────────────────────────────────────────
+
+def _norm_header(value: Any) -> str:
+    return re.sub(r"\s+", "", str(value or "")).lower()
+
+
+def _str(value: Any) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _bool(value: Any, default: bool) -> bool:
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"불리언 값이 아닙니다: {value!r}")
+
+
+def _list(value: Any) -> list[str]:
+    if value is None:
+        return []
+    return [s.strip() for s in _LIST_SPLIT.split(str(value)) if s.strip()]
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+# ──────────────────────────────────────────────
+# 시트 읽기
+# ──────────────────────────────────────────────
+
+def _pick_sheet(book: XlsxReader, names: tuple[str, ...]) -> str | None:
+    for name in names:
+        if name in book.sheets:
+            return name
+    return None
+
+
+def _records(book: XlsxReader, sheet: str, columns: dict[str, tuple[str, ...]]) -> Iterator[tuple[int, dict]]:
+    """헤더를 해석해 (행 번호, {필드: 값}) 를 흘려보낸다. 헤더에 없는 필드는 키가 없다."""
+    rows = book.rows(sheet)
+    header_row = next(rows, None)
+    if header_row is None:
+        return
+    aliases = {alias: name for name, names in columns.items() for alias in names}
+    positions = {}
+    for idx, value in enumerate(header_row[1]):
+        name = aliases.get(_norm_header(value))
+        if name and name not in positions:
+            positions[name] = idx
+    key = next(iter(columns))
+    if key not in positions:
+        raise MatrixImportError(f"'{sheet}' 시트 헤더에 {key} 열이 없습니다")
+    for row_no, values in rows:
+        yield row_no, {
+            name: values[idx] if idx < len(values) else None
+            for name, idx in positions.items()
+        }
+
+
+def _parse_document_type(rec: dict) -> dict:
+    out: dict[str, Any] = {}
+    code = _str(rec["code"])
+    if not code:
+        raise ValueError("code 가 비어 있습니다")
+    out["code"] = code
+    if "name" in rec:
+        out["name"] = _str(rec["name"])
+        if not out["name"]:
+            raise ValueError("name 이 비어 있습니다")
+    if "category" in rec:
+        category = (_str(rec["category"]) or "").upper()
+        if category not in _CATEGORIES:
+            raise ValueError(f"알 수 없는 분류입니다: {rec['category']!r}")
+        out["category"] = category
+    if "description" in rec:
+        out["description"] = _str(rec["description"])
+    if "enabled" in rec:
+        out["enabled"] = _bool(rec["enabled"], True)
+    return out
+
+
+def _parse_rule(rec: dict) -> tuple[dict, list[str]]:
+    """시트 행 → Rule 컬럼 값, 참조 서류 코드."""
+    out: dict[str, Any] = {}
+    name = _str(rec["rule_name"])
+    if not name:
+        raise ValueError("rule_name 이 비어 있습니다")
+    out["rule_name"] = name
+    if "priority" in rec:
+        try:
+            out["priority"] = int(rec["priority"]) if rec["priority"] not in (None, "") else 100
+        except (TypeError, ValueError):
+            raise ValueError(f"priority 가 정수가 아닙니다: {rec['priority']!r}") from None
+    if "enabled" in rec:
+        out["enabled"] = _bool(rec["enabled"], True)
+    if "conditions" in rec:
+        text = _str(rec["conditions"])
+        if not text:
+            raise ValueError("conditions 가 비어 있습니다")
+        try:
+            condition = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"conditions JSON 오류: {exc.msg} (위치 {exc.pos})") from None
+        if not isinstance(condition, dict):
+            raise ValueError("conditions 는 JSON 객체여야 합니다")
+        try:
+            check_condition(condition)
+        except RuleValidationError as exc:
+            raise ValueError("; ".join(exc.problems)) from None
+        out["conditions_json"] = _dumps(condition)
+    referenced = []
+    for key in ("required_documents", "optional_documents", "output_case_tags"):
+        if key in rec:
+            values = _list(rec[key])
+            out[_RULE_FIELD_COLUMNS[key]] = _dumps(values)
+            if key != "output_case_tags":
+                referenced += values
+    for key in ("blocked_if_missing", "escalate_if_true"):
+        if key in rec:
+            out[key] = _bool(rec[key], False)
+    if "output_status" in rec:
+        status = _str(rec["output_status"])
+        if status is not None and status.upper() not in _STATUSES:
+            raise ValueError(f"알 수 없는 출력상태입니다: {status!r}")
+        out["output_status"] = status.upper() if status else None
+    if "explanation_template" in rec:
+        out["explanation_template"] = _str(rec["explanation_template"])
+    return out, referenced
+
+
+# ──────────────────────────────────────────────
+# 비교
+# ──────────────────────────────────────────────
+
+def _same(column: str, old: Any, new: Any) -> bool:
+    if column.endswith("_json"):
+        old_v = json.loads(old) if old else None
+        new_v = json.loads(new) if new else None
+        if column in _JSON_LIST_COLUMNS:
+            return (old_v or []) == (new_v or [])
+        return old_v == new_v
+    return old == new
+
+
+def _diff(existing: Any, values: dict, key_column: str) -> dict[str, tuple[Any, Any]]:
+    return {
+        col: (getattr(existing, col), new)
+        for col, new in values.items()
+        if col != key_column and not _same(col, getattr(existing, col), new)
+    }
+
+
+def plan_import(db: Session, source: str | IO[bytes], *, prune: bool = False, name: str | None = None) -> tuple[ImportReport, dict]:
+    """
+    워크북을 읽어 검증하고 DB 와 비교한다. DB 는 변경하지 않는다.
+    반환: (보고서, 적용 계획) — 계획은 `apply_import` 에 넘긴다.
+    """
+    report = ImportReport(source=name or (source if isinstance(source, str) else "upload"))
+    plan: dict[str, list] = {"doc_insert": [], "doc_update": [], "rule_insert": [], "rule_update": []}
+
+    try:
+        book = XlsxReader(source)
+    except XlsxFormatError as exc:
+        report.errors.append(RowError("", 0, str(exc)))
+        return report, plan
+
+    with book:
+        doc_sheet = _pick_sheet(book, DOC_SHEETS)
+        rule_sheet = _pick_sheet(book, RULE_SHEETS)
+        if doc_sheet is None and rule_sheet is None:
+            report.errors.append(RowError("", 0, f"{DOC_SHEETS} 또는 {RULE_SHEETS} 시트가 필요합니다"))
+            return report, plan
+
+        docs: dict[str, tuple[int, dict]] = {}
+        rules: dict[str, tuple[int, dict, list[str]]] = {}
+        try:
+            if doc_sheet:
+                for row_no, rec in _records(book, doc_sheet, DOC_COLUMNS):
+                    try:
+                        values = _parse_document_type(rec)
+                    except ValueError as exc:
+                        report.errors.append(RowError(doc_sheet, row_no, str(exc)))
+                        continue
+                    if values["code"] in docs:
+                        report.errors.append(RowError(doc_sheet, row_no, f"중복 code: {values['code']}"))
+                        continue
+                    docs[values["code"]] = (row_no, values)
+            if rule_sheet:
+                for row_no, rec in _records(book, rule_sheet, RULE_COLUMNS):
+                    try:
+                        values, referenced = _parse_rule(rec)
+                    except ValueError as exc:
+                        report.errors.append(RowError(rule_sheet, row_no, str(exc)))
+                        continue
+                    if values["rule_name"] in rules:
+                        report.errors.append(RowError(rule_sheet, row_no, f"중복 rule_name: {values['rule_name']}"))
+                        continue
+                    rules[values["rule_name"]] = (row_no, values, referenced)
+        except MatrixImportError as exc:
+            report.errors.append(RowError("", 0, str(exc)))
+            return report, plan
+
+    # 기존 레코드는 한 번씩만 조회
+    existing_docs = {d.code: d for d in db.query(DocumentType).all()}
+    rules_by_name: dict[str, list[Rule]] = {}
+    for r in db.query(Rule).order_by(Rule.id).all():
+        rules_by_name.setdefault(r.rule_name, []).append(r)
+    existing_rules = {n: group[0] for n, group in rules_by_name.items() if len(group) == 1}
+
+    known_codes = set(existing_docs) | set(docs)
+    for name_, (row_no, _, referenced) in rules.items():
+        unknown = [c for c in dict.fromkeys(referenced) if c not in known_codes]
+        if unknown:
+            report.errors.append(RowError(rule_sheet, row_no, f"알 수 없는 서류 코드: {', '.join(unknown)}"))
+
+    for code, (row_no, values) in docs.items():
+        current = existing_docs.get(code)
+        if current is None:
+            missing = [c for c in ("name", "category") if c not in values]
+            if missing:
+                report.errors.append(RowError(doc_sheet, row_no, f"새 서류 {code} 에 {', '.join(missing)} 열이 필요합니다"))
+                continue
+            plan["doc_insert"].append(values)
+            report.document_types.append(Change(code, "created", {k: (None, v) for k, v in values.items() if k != "code"}))
+        else:
+            changes = _diff(current, values, "code")
+            if changes:
+                plan["doc_update"].append({"id": current.id, **{k: n for k, (_, n) in changes.items()}})
+                report.document_types.append(Change(code, "updated", changes))
+            else:
+                report.unchanged["document_types"] += 1
+
+    for name_, (row_no, values, _) in rules.items():
+        duplicates = rules_by_name.get(name_, ())
+        if len(duplicates) > 1:
+            ids = ", ".join(str(r.id) for r in duplicates)
+            report.errors.append(RowError(rule_sheet, row_no, f"DB 에 rule_name 이 같은 룰이 여럿입니다 (id {ids}): {name_}"))
+            continue
+        current = existing_rules.get(name_)
+        if current is None:
+            if "conditions_json" not in values:
+                report.errors.append(RowError(rule_sheet, row_no, f"새 룰 {name_} 에 conditions 열이 필요합니다"))
+                continue
+            plan["rule_insert"].append(values)
+            report.rules.append(Change(name_, "created", {k: (None, v) for k, v in values.items() if k != "rule_name"}))
+        else:
+            changes = _diff(current, values, "rule_name")
+            if changes:
+                plan["rule_update"].append({"id": current.id, **{k: n for k, (_, n) in changes.items()}})
+                report.rules.append(Change(name_, "updated", changes))
+            else:
+                report.unchanged["rules"] += 1
+
+    if prune:
+        # 삭제 대신 비활성화 — 과거 판정의 감사 추적 유지
+        if doc_sheet:
+            for code, d in existing_docs.items():
+                if code not in docs and d.enabled:
+                    plan["doc_update"].append({"id": d.id, "enabled": False})
+                    report.document_types.append(Change(code, "disabled", {"enabled": (True, False)}))
+        if rule_sheet:
+            for name_, group in rules_by_name.items():
+                for r in group:
+                    if name_ not in rules and r.enabled:
+                        plan["rule_update"].append({"id": r.id, "enabled": False})
+                        key = name_ if len(group) == 1 else f"{name_} (id {r.id})"
+                        report.rules.append(Change(key, "disabled", {"enabled": (True, False)}))
+
+    return report, plan
+
+
+def apply_import(db: Session, report: ImportReport, plan: dict, actor_id: int | None = None) -> ImportReport:
+    """검증된 계획을 한 트랜잭션으로 반영한다. 호출자가 룰 스냅샷/응답 캐시를 무효화해야 한다."""
+    if not report.ok or not (report.document_types or report.rules):
+        return report
+    policy = db.query(PolicyVersion).filter_by(is_active=True).order_by(PolicyVersion.id.desc()).first()
+    policy_id = policy.id if policy else None
+    try:
+        if plan["doc_insert"]:
+            db.execute(insert(DocumentType), [{"policy_version_id": policy_id, **v} for v in plan["doc_insert"]])
+        if plan["doc_update"]:
+            db.execute(update(DocumentType), plan["doc_update"])
+        if plan["rule_insert"]:
+            db.execute(insert(Rule), [{"policy_version_id": policy_id, **v} for v in plan["rule_insert"]])
+        if plan["rule_update"]:
+            db.execute(update(Rule), plan["rule_update"])
+        db.add(AuditLog(
+            event_type="MATRIX_IMPORTED",
+            actor_id=actor_id,
+            target_type="rule_matrix",
+            new_value=json.dumps({
+                "counts": report.counts(),
+                "document_types": {c.key: c.action for c in report.document_types},
+                "rules": {c.key: c.action for c in report.rules},
+            }, ensure_ascii=False),
+            reason=f"구비서류 매트릭스 일괄 반영: {report.source}",
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    report.applied = True
+    return report
+
+
+# ──────────────────────────────────────────────
+# 양식 내보내기
+# ──────────────────────────────────────────────
+
+def template_sheets(db: Session) -> list[tuple[str, list[str], Iterator[list]]]:
+    """현재 DB 내용을 가져오기 양식 그대로 (재가져오기 시 변경 없음)."""
+    def doc_rows():
+        for d in db.query(DocumentType).order_by(DocumentType.id):
+            yield [d.code, d.name, d.category, d.description, d.enabled]
+
+    def rule_rows():
+        for r in db.query(Rule).order_by(Rule.priority, Rule.id):
+            tags = json.loads(r.output_case_tags_json) if r.output_case_tags_json else []
+            yield [
+                r.rule_name, r.priority, r.enabled, r.conditions_json,
+                "\n".join(r.required_documents), "\n".join(r.optional_documents),
+                r.blocked_if_missing, r.escalate_if_true, r.output_status,
+                "\n".join(tags), r.explanation_template,
+            ]
+
+    return [
+        (DOC_SHEETS[0], list(DOC_COLUMNS), doc_rows()),
+        (RULE_SHEETS[0], list(RULE_COLUMNS), rule_rows()),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="구비서류 매트릭스 XLSX 가져오기")
+    parser.add_argument("path")
+    parser.add_argument("--dry-run", action="store_true", help="변경 내역만 출력")
+    parser.add_argument("--prune", action="store_true", help="워크북에 없는 서류/룰 비활성화")
+    parser.add_argument("--actor-id", type=int)
+    parser.add_argument("--template", action="store_true", help="현재 DB 를 양식으로 내보내기")
+    args = parser.parse_args(argv)
+
+    from app.database import SessionLocal
+    from app.engine.rule_snapshot import ensure_generation_tracking
+    from app.tabular.xlsx_writer import iter_xlsx_sheets
+
+    db = SessionLocal()
+    try:
+        if args.template:
+            with open(args.path, "wb") as f:
+                # 양식은 다시 가져오므로 값을 그대로 둔다 (' 를 붙이면 룰명·조건이 바뀐다)
+                for chunk in iter_xlsx_sheets(template_sheets(db), formula_safe=False):
+                    f.write(chunk)
+            print(f"✅ 양식 저장: {args.path}")
+            return 0
+        report, plan = plan_import(db, args.path, prune=args.prune)
+        if report.ok and not args.dry_run:
+            # 세대 트리거가 아직 없는 DB 라도 이번 변경부터 실행 중인 서버에 보이게 한다
+            ensure_generation_tracking(db.get_bind())
+            apply_import(db, report, plan, actor_id=args.actor_id)
+        print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2, default=str))
+        if report.applied:
+            # 룰 스냅샷과 관리자 조회 캐시(admin_cache)는 rule_set_generation 세대로 변경을 알아챈다 (SQLite 트리거)
+            if db.get_bind().dialect.name == "sqlite":
+                print(
+                    f"ℹ️  실행 중인 서버는 {settings.RULE_SET_CHECK_SECONDS:g}초 안에 새 룰셋을 쓰고, "
+                    "관리자 조회(/admin/rules, /admin/document-types)도 다음 요청부터 새 내용을 돌려줍니다. "
+                    "재시작은 필요 없습니다.",
+                    file=sys.stderr,
+                )
+            else:
+                print(
+                    "ℹ️  이 DB 에는 세대 추적 트리거가 없어 실행 중인 서버의 룰 스냅샷과 관리자 조회 캐시가 "
+                    "갱신되지 않습니다 — 재시작하거나 POST /admin/import/matrix 를 쓰세요.",
+                    file=sys.stderr,
+                )
+        return 0 if report.ok else 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
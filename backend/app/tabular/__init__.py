@@ -0,0 +1 @@
+"""Streaming tabular I/O (CSV / XLSX) — 대용량 내보내기·가져오기용."""
@@ -0,0 +1,52 @@
+"""
+CSV 스트리밍 인코더 — 행 이터레이터를 바이트 청크 이터레이터로 변환한다.
+메모리 사용량은 청크 크기에만 비례한다.
+
+스프레드시트가 수식으로 읽는 문자(= + - @ 탭 CR)로 시작하는 문자열 셀은 앞에 ' 를 붙여
+텍스트로 고정한다 (CSV/수식 주입 방지). 법인명·사유 같은 사용자 입력이 그대로 셀이 되기 때문이다.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import Any, Iterable, Iterator, Sequence
+
+# Excel 에서 한글이 깨지지 않도록 UTF-8 BOM 을 붙인다
+BOM = "\ufeff"
+
+# 이 문자로 시작하는 셀은 스프레드시트가 수식으로 해석한다
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def neutralize_formula(value: Any) -> Any:
+    """수식으로 해석될 문자열 셀 앞에 ' 를 붙인다. 문자열이 아니면 그대로."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    chunk_rows: int = 1000,
+    bom: bool = True,
+    formula_safe: bool = True,
+) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\r\n")
+    if bom:
+        buf.write(BOM)
+    writer.writerow(header)
+    pending = 0
+    for row in rows:
+        writer.writerow([neutralize_formula(v) for v in row] if formula_safe else row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+            pending = 0
+    tail = buf.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
@@ -0,0 +1,153 @@
+"""
+XLSX 스트리밍 리더 — 시트 XML 을 iterparse 로 행 단위로 읽는다.
+
+워크시트 전체를 메모리에 올리지 않으며, 읽은 행 요소는 즉시 해제한다.
+공유 문자열 표(sharedStrings.xml)만 한 번 읽어 둔다. 수식은 캐시된 값을,
+날짜 서식 셀은 일련번호(float)를 그대로 반환한다.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from typing import IO, Any, Iterator
+from xml.etree.ElementTree import iterparse
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+class XlsxFormatError(ValueError):
+    """XLSX 로 읽을 수 없는 파일."""
+
+
+def _column_index(ref: str) -> int:
+    """"C12" → 2 (0부터)."""
+    m = _CELL_REF.match(ref)
+    letters = m.group(1) if m else ref
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def _text(el) -> str:
+    """<si>/<is> 요소의 텍스트 (서식 run 포함)."""
+    return "".join(t.text or "" for t in el.iter(f"{_NS}t"))
+
+
+class XlsxReader:
+    """
+    with XlsxReader(path) as book:
+        for row in book.rows("rules"):
+            ...
+    """
+
+    def __init__(self, source: str | IO[bytes]):
+        try:
+            self._zip = zipfile.ZipFile(source)
+        except zipfile.BadZipFile as exc:
+            raise XlsxFormatError(_describe_non_zip(source)) from exc
+        self._shared: list[str] | None = None
+        self.sheets = self._sheet_paths()
+
+    def __enter__(self) -> "XlsxReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def _sheet_paths(self) -> dict[str, str]:
+        """시트 이름 → zip 내부 경로 (워크북 순서)."""
+        try:
+            rels = {}
+            with self._zip.open("xl/_rels/workbook.xml.rels") as f:
+                for _, el in iterparse(f):
+                    if el.tag == f"{_PKG_REL_NS}Relationship":
+                        target = el.get("Target", "")
+                        rels[el.get("Id")] = (
+                            target.lstrip("/") if target.startswith("/")
+                            else posixpath.normpath(posixpath.join("xl", target))
+                        )
+            sheets = {}
+            with self._zip.open("xl/workbook.xml") as f:
+                for _, el in iterparse(f):
+                    if el.tag == f"{_NS}sheet":
+                        sheets[el.get("name")] = rels[el.get(f"{_REL_NS}id")]
+        except KeyError as exc:
+            raise XlsxFormatError(f"XLSX 구조가 올바르지 않습니다: {exc}") from exc
+        return sheets
+
+    def _shared_strings(self) -> list[str]:
+        if self._shared is None:
+            self._shared = []
+            if "xl/sharedStrings.xml" in self._zip.namelist():
+                with self._zip.open("xl/sharedStrings.xml") as f:
+                    for _, el in iterparse(f):
+                        if el.tag == f"{_NS}si":
+                            self._shared.append(_text(el))
+                            el.clear()
+        return self._shared
+
+    def _cell_value(self, cell) -> Any:
+        kind = cell.get("t", "n")
+        if kind == "inlineStr":
+            is_ = cell.find(f"{_NS}is")
+            return _text(is_) if is_ is not None else ""
+        v = cell.find(f"{_NS}v")
+        if v is None or v.text is None:
+            return None
+        if kind == "s":
+            return self._shared_strings()[int(v.text)]
+        if kind == "b":
+            return v.text == "1"
+        if kind in ("str", "e"):
+            return v.text
+        num = float(v.text)
+        return int(num) if num.is_integer() else num
+
+    def rows(self, sheet: str) -> Iterator[tuple[int, list[Any]]]:
+        """(행 번호(1부터), 셀 값 목록). 빈 셀은 None, 완전히 빈 행은 건너뛴다."""
+        if sheet not in self.sheets:
+            raise XlsxFormatError(f"시트를 찾을 수 없습니다: {sheet}")
+        self._shared_strings()
+        with self._zip.open(self.sheets[sheet]) as f:
+            row_no = 0
+            for _, el in iterparse(f):
+                if el.tag != f"{_NS}row":
+                    continue
+                row_no = int(el.get("r", row_no + 1))
+                values: list[Any] = []
+                for cell in el.iter(f"{_NS}c"):
+                    ref = cell.get("r")
+                    if ref:
+                        col = _column_index(ref)
+                        values.extend([None] * (col - len(values)))
+                    values.append(self._cell_value(cell))
+                el.clear()
+                if any(v not in (None, "") for v in values):
+                    yield row_no, values
+
+
+def _describe_non_zip(source: str | IO[bytes]) -> str:
+    try:
+        if isinstance(source, str):
+            with open(source, "rb") as f:
+                head = f.read(64)
+        else:
+            source.seek(0)
+            head = source.read(64)
+    except OSError:
+        head = b""
+    if b"DRM" in head:
+        return "DRM 으로 암호화된 파일입니다. 복호화(DRM 해제) 후 다시 업로드하세요."
+    if head.startswith(b"\xd0\xcf\x11\xe0"):
+        return "구형 XLS 또는 암호가 설정된 파일입니다. 암호를 해제한 XLSX 로 저장 후 다시 업로드하세요."
+    return "XLSX(zip) 형식이 아닙니다."
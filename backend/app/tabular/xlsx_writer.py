@@ -0,0 +1,161 @@
+"""
+XLSX 스트리밍 작성기 — 외부 라이브러리 없이 SpreadsheetML 을 zip 스트림으로 쓴다.
+
+시트 XML 을 행 단위로 압축 스트림에 기록하고, zip 출력은 탐색(seek) 불가
+싱크에 쓰므로 (데이터 디스크립터 사용) 만들어진 바이트를 바로 응답으로 흘려보낼 수 있다.
+셀은 inline string / 숫자 / 불리언만 사용하며 스타일은 없다.
+문자열 셀은 CSV 와 같이 수식 시작 문자를 ' 로 무력화한다 (formula_safe=False 로 끌 수 있다).
+"""
+
+from __future__ import annotations
+
+import re
+import zipfile
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Sequence
+from xml.sax.saxutils import escape
+
+from app.tabular.csv_stream import neutralize_formula
+
+# Excel 셀 최대 길이
+MAX_CELL_CHARS = 32767
+
+# XML 1.0 에서 허용되지 않는 제어 문자
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{sheets}'
+    '</Types>'
+)
+_CONTENT_TYPE_SHEET = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets>'
+    '</workbook>'
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}'
+    '</Relationships>'
+)
+_WORKBOOK_REL_SHEET = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Sink:
+    """zipfile 출력 버퍼. write() 만 제공하므로 zipfile 은 비탐색 스트림 모드로 쓴다."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _cell(value: Any, formula_safe: bool = True) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f"<c><v>{value}</v></c>"
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat(sep=" ") if isinstance(value, datetime) else value.isoformat()
+    elif formula_safe:
+        value = neutralize_formula(value)
+    text = _ILLEGAL_XML.sub("", str(value))[:MAX_CELL_CHARS]
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _row(values: Sequence[Any], formula_safe: bool = True) -> str:
+    return "<row>" + "".join(_cell(v, formula_safe) for v in values) + "</row>"
+
+
+def iter_xlsx(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    sheet_name: str = "Sheet1",
+    chunk_rows: int = 1000,
+    formula_safe: bool = True,
+) -> Iterator[bytes]:
+    """헤더 + 행 이터레이터 → XLSX 바이트 청크."""
+    return iter_xlsx_sheets([(sheet_name, header, rows)], chunk_rows, formula_safe)
+
+
+def iter_xlsx_sheets(
+    sheets: Sequence[tuple[str, Sequence[str], Iterable[Sequence[Any]]]],
+    chunk_rows: int = 1000,
+    formula_safe: bool = True,
+) -> Iterator[bytes]:
+    """
+    [(시트 이름, 헤더, 행 이터레이터), ...] → XLSX 바이트 청크. 시트는 순서대로 쓴다.
+    formula_safe=False 는 다시 읽어 들일 양식처럼 값이 그대로 보존돼야 할 때만 쓴다.
+    """
+    sink = _Sink()
+    numbers = range(1, len(sheets) + 1)
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=5) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES.format(
+            sheets="".join(_CONTENT_TYPE_SHEET.format(n=n) for n in numbers),
+        ))
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK.format(sheets="".join(
+            _WORKBOOK_SHEET.format(name=escape(name[:31], {'"': "&quot;"}), n=n)
+            for n, (name, _, _) in zip(numbers, sheets)
+        )))
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS.format(
+            sheets="".join(_WORKBOOK_REL_SHEET.format(n=n) for n in numbers),
+        ))
+        yield sink.drain()
+
+        for n, (_, header, rows) in zip(numbers, sheets):
+            with zf.open(f"xl/worksheets/sheet{n}.xml", "w", force_zip64=True) as sheet:
+                sheet.write((_SHEET_HEAD + _row(header)).encode("utf-8"))
+                pending: list[str] = []
+                for row in rows:
+                    pending.append(_row(row, formula_safe))
+                    if len(pending) >= chunk_rows:
+                        sheet.write("".join(pending).encode("utf-8"))
+                        pending.clear()
+                        data = sink.drain()
+                        if data:
+                            yield data
+                sheet.write(("".join(pending) + _SHEET_TAIL).encode("utf-8"))
+    yield sink.drain()
@@ -0,0 +1 @@
+"""개발용 벤치마크/검증 스크립트. backend/ 에서 `python -m scripts.<name>` 으로 실행한다."""
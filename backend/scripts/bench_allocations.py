@@ -0,0 +1,88 @@
+"""
+판정 경로 메모리 할당 벤치마크 (tracemalloc).
+
+    python -m scripts.bench_allocations [--n 20000] [--mix branch_typical]
+
+일괄 처리·백필처럼 결과를 메모리에 모아 두는 작업을 가정하고, 판정 n 건의 결과를
+리스트에 보관한 상태에서 판정 1건당 남아 있는 할당 블록 수·바이트와 처리 중 최대 사용량을 잰다.
+- matches : 룰 평가 결과(RuleMatch 목록)만 보관
+- single  : run_determination 결과 보관
+- batch   : BatchEvaluator.determine 결과 보관 (같은 판정은 객체 공유)
+시간은 tracemalloc 을 끈 상태에서 따로 잰다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from app.engine.batch import BatchEvaluator
+from app.engine.case_table import get_case_table
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import run_determination
+from app.engine.rule_compiler import CompiledRuleSet
+from scripts.traffic import MIXES, SEED_DIR, load_seed_rules, sample_contexts
+
+
+def _measure(fn) -> tuple[int, int, int]:
+    """fn() 결과를 보관한 채로 (남은 블록 수, 남은 바이트, 최대 사용 바이트)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    kept = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats)
+    size = sum(s.size_diff for s in stats)
+    del kept
+    return blocks, size, peak - base
+
+
+def _time(fn) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--mix", choices=list(MIXES), default="branch_typical")
+    args = parser.parse_args()
+
+    with open(SEED_DIR / "document_types.json", encoding="utf-8") as f:
+        catalog = DocumentCatalog(d["code"] for d in json.load(f))
+    rule_set = CompiledRuleSet(load_seed_rules(), adaptive=False, catalog=catalog)
+    table = get_case_table()
+    evaluator = BatchEvaluator(rule_set, table)
+    contexts = sample_contexts(args.mix, args.n)
+    # 워밍업 — 카탈로그·캐시 적재가 측정에 섞이지 않도록
+    for ctx in contexts[:1000]:
+        run_determination(ctx, rule_set, table)
+    evaluator.determine(contexts[:1000])
+
+    cases = {
+        "matches": lambda: [rule_set.evaluate(ctx) for ctx in contexts],
+        "single": lambda: [run_determination(ctx, rule_set, table) for ctx in contexts],
+        "batch": lambda: list(evaluator.determine(contexts)),
+    }
+    n = len(contexts)
+    print(f"mix={args.mix} n={n:,}")
+    print(f"{'path':<8}{'blocks/det':>12}{'bytes/det':>12}{'peak/det':>12}{'µs/det':>10}")
+    for name, fn in cases.items():
+        blocks, size, peak = _measure(fn)
+        elapsed = _time(fn)
+        print(f"{name:<8}{blocks / n:>12.2f}{size / n:>12.1f}{peak / n:>12.1f}{elapsed / n * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+일괄(열 단위) 판정 벤치마크 — 단건 엔진 대비 처리량과 결과 일치 확인.
+
+    python -m scripts.bench_batch [--n 100000] [--mix review_queue]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+
+from app.engine.batch import BatchEvaluator
+from app.engine.case_table import get_case_table
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import run_determination
+from app.engine.rule_compiler import CompiledRuleSet
+from app.engine.rule_engine import evaluate_rules
+from scripts.traffic import MIXES, SEED_DIR, load_seed_rules, sample_contexts
+
+
+def _summary(r) -> tuple:
+    return (
+        r.case_code, r.case_tags, r.status, r.required_documents, r.optional_documents,
+        [g.group_code for g in r.document_groups], r.blocked, r.escalate,
+        r.explanations, r.matched_rules,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--mix", choices=list(MIXES), default="review_queue")
+    args = parser.parse_args()
+
+    rules = load_seed_rules()
+    with open(SEED_DIR / "document_types.json", encoding="utf-8") as f:
+        catalog = DocumentCatalog(d["code"] for d in json.load(f))
+    rule_set = CompiledRuleSet(rules, adaptive=False, catalog=catalog)
+    table = get_case_table()
+    contexts = sample_contexts(args.mix, args.n)
+
+    gc.collect()
+    start = time.perf_counter()
+    single = [run_determination(ctx, rule_set, table) for ctx in contexts]
+    t_single = time.perf_counter() - start
+
+    evaluator = BatchEvaluator(rule_set, table)
+    gc.collect()
+    start = time.perf_counter()
+    batch = evaluator.determine(contexts)
+    t_batch = time.perf_counter() - start
+
+    mismatches = sum(_summary(a) != _summary(b) for a, b in zip(single, batch))
+
+    # 룰 매치 자체도 evaluate_rules 와 비교 (표본)
+    sample = contexts[:5000]
+    batch_matches = evaluator.evaluate_rules(sample)
+    rule_mismatches = sum(
+        [m.rule_id for m in evaluate_rules(rules, ctx)] != [m.rule_id for m in got]
+        for ctx, got in zip(sample, batch_matches)
+    )
+
+    print(f"mix={args.mix} rows={args.n:,} distinct determinations={len(batch.results):,}")
+    print(f"per-dict : {t_single:8.3f}s  {args.n / t_single:>12,.0f} rows/s")
+    print(f"columnar : {t_batch:8.3f}s  {args.n / t_batch:>12,.0f} rows/s  ({t_single / t_batch:.1f}x)")
+    print(f"determination mismatches={mismatches}  evaluate_rules mismatches (first 5k)={rule_mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+우선순위 레인 벤치마크 — 대량 추출이 도는 동안 영업점(branch) 판정 지연이 유지되는지 본다.
+
+    python -m scripts.bench_lanes [--bulk-rows 50000] [--bulk-clients 4] [--concurrency 16] [--duration 15]
+
+SCHEDULER_ENABLED=false / true 마다 새 임시 SQLite 파일(기본 DB_PROFILE=production)로 이 스크립트를 별도 프로세스에서 실행한다
+(미들웨어는 import 시점 설정으로 설치되므로). 자식 프로세스는
+
+1. 워밍업 판정 내역을 --bulk-rows 건까지 복제해 추출 대상을 만들고,
+2. branch 혼합 트래픽만 --duration 초 (기준),
+3. 같은 트래픽 + 대량 클라이언트 --bulk-clients 개가 `GET /exports/requests` 를 반복하며 --duration 초
+
+를 재고 대화형 p50/p95/p99 와 대량 완료·거절 수를 낸다. 대량 클라이언트는 429 를 받으면 Retry-After 만큼 쉰다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from scripts.loadtest import API, Workload, _pct, run_level, synthetic_customers
+
+
+# ── 자식: 한 설정 측정 ──
+
+def seed_bulk_rows(target: int) -> int:
+    """기존 판정 내역을 target 건 이상이 될 때까지 두 배씩 복제한다."""
+    from sqlalchemy import func, insert, select
+
+    from app.database import SessionLocal
+    from app.models.account_request import AccountRequest
+
+    table = AccountRequest.__table__
+    columns = [c for c in table.columns if c.name != "id"]
+    db = SessionLocal()
+    try:
+        count = db.scalar(select(func.count()).select_from(table))
+        if not count:
+            raise RuntimeError("복제할 판정 내역이 없습니다 — 워밍업 판정 이후에 호출해야 합니다")
+        while count < target:
+            limit = min(count, target - count)
+            db.execute(insert(table).from_select(columns, select(*columns).order_by(table.c.id).limit(limit)))
+            db.commit()
+            count += limit
+        return count
+    finally:
+        db.close()
+
+
+def _interactive(result: dict) -> dict:
+    values = sorted(v for op_values in result["latencies"].values() for v in op_values)
+    return {
+        "requests": len(values),
+        "rps": len(values) / result["elapsed"],
+        "errors": sum(result["errors"].values()),
+        "p50_ms": _pct(values, 0.50) * 1e3,
+        "p95_ms": _pct(values, 0.95) * 1e3,
+        "p99_ms": _pct(values, 0.99) * 1e3,
+    }
+
+
+async def bulk_client(client: httpx.AsyncClient, stop: asyncio.Event, stats: dict) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            r = await client.get(f"{API}/exports/requests", params={"format": "csv"})
+        except Exception:
+            stats["errors"] += 1
+            continue
+        if r.status_code == 429:
+            stats["rejected"] += 1
+            retry_after = float(r.headers.get("Retry-After", "1"))
+            try:
+                await asyncio.wait_for(stop.wait(), retry_after)
+            except asyncio.TimeoutError:
+                pass
+        elif r.status_code < 400:
+            stats["completed"] += 1
+            stats["seconds"].append(time.perf_counter() - t0)
+        else:
+            stats["errors"] += 1
+
+
+async def child_async(args) -> dict:
+    import anyio.to_thread
+
+    from app.main import app
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=120.0)
+    lifespan = app.router.lifespan_context(app)
+    await lifespan.__aenter__()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+    try:
+        workload = Workload(client, "branch", synthetic_customers(args.customers), args.seed)
+        await workload.prepare()
+        await run_level(workload, 1, args.warmup, None)
+        rows = seed_bulk_rows(args.bulk_rows)
+
+        alone = await run_level(workload, args.concurrency, 0, args.duration)
+
+        stop = asyncio.Event()
+        bulk = {"completed": 0, "rejected": 0, "errors": 0, "seconds": []}
+        bulk_tasks = [asyncio.create_task(bulk_client(client, stop, bulk)) for _ in range(args.bulk_clients)]
+        await asyncio.sleep(0.5)  # 추출이 먼저 자리를 잡게 한다
+        mixed = await run_level(workload, args.concurrency, 0, args.duration)
+        stop.set()
+        await asyncio.gather(*bulk_tasks)
+    finally:
+        await client.aclose()
+        await lifespan.__aexit__(None, None, None)
+
+    seconds = sorted(bulk.pop("seconds"))
+    bulk["p50_s"] = _pct(seconds, 0.50)
+    return {"rows": rows, "alone": _interactive(alone), "mixed": _interactive(mixed), "bulk": bulk}
+
+
+# ── 부모: 설정별 실행 + 비교 ──
+
+def run_setting(enabled: bool, args, workdir: str) -> dict:
+    name = "on" if enabled else "off"
+    out_path = os.path.join(workdir, f"{name}.json")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, name + '.db')}",
+        "DEBUG": "false",
+        "DB_PROFILE": args.db_profile,
+        "SCHEDULER_ENABLED": "true" if enabled else "false",
+    }
+    cmd = [
+        sys.executable, "-m", "scripts.bench_lanes", "--child", out_path,
+        "--bulk-rows", str(args.bulk_rows), "--bulk-clients", str(args.bulk_clients),
+        "--concurrency", str(args.concurrency), "--duration", str(args.duration),
+        "--threads", str(args.threads), "--warmup", str(args.warmup),
+        "--customers", str(args.customers), "--seed", str(args.seed),
+    ]
+    print(f"… scheduler {name}", flush=True)
+    subprocess.run(cmd, env=env, check=True)
+    with open(out_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bulk-rows", type=int, default=50_000, help="추출 대상 판정 내역 수")
+    parser.add_argument("--bulk-clients", type=int, default=4, help="동시에 추출을 반복하는 클라이언트 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="영업점 트래픽 동시성")
+    parser.add_argument("--duration", type=float, default=15.0, help="단계별 시간(초)")
+    parser.add_argument("--threads", type=int, default=40, help="스레드풀 크기")
+    parser.add_argument("--db-profile", default="production",
+                        help="DB_PROFILE — default 는 추출 커서가 판정 쓰기를 잠가 레인과 무관하게 막힌다")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--customers", type=int, default=20, help="케이스별 합성 고객 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", metavar="OUT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(child_async(args))
+        with open(args.child, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {name: run_setting(name == "on", args, workdir) for name in ("off", "on")}
+
+    print(f"\n판정 내역 {results['on']['rows']:,} 건 ({args.db_profile}), 대량 클라이언트 {args.bulk_clients}, "
+          f"영업점 동시성 {args.concurrency}, 단계별 {args.duration:.0f}s")
+    print(f"  {'scheduler':<10}{'phase':<8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err':>6}"
+          f"{'exports':>9}{'429':>6}{'export p50 s':>14}")
+    for name, r in results.items():
+        for phase in ("alone", "mixed"):
+            i = r[phase]
+            line = (f"  {name:<10}{phase:<8}{i['rps']:>9.1f}{i['p50_ms']:>9.2f}{i['p95_ms']:>9.2f}"
+                    f"{i['p99_ms']:>9.2f}{i['errors']:>6}")
+            if phase == "mixed":
+                b = r["bulk"]
+                line += f"{b['completed']:>9}{b['rejected']:>6}{b['p50_s']:>14.2f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+적응형 all/any 재정렬 벤치마크 — 판정 1건당 평가된 조건 리프 수 비교.
+
+    python -m scripts.bench_rule_ordering [--n 50000] [--interval 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.engine.rule_compiler import CompiledRuleSet
+from app.engine.rule_engine import evaluate_rules
+from scripts.traffic import MIXES, load_seed_rules, sample_contexts
+
+
+def _run(rule_set: CompiledRuleSet, contexts: list[dict], interval: int | None) -> tuple[int, float, list]:
+    """리프 평가 수를 호출 전후 차이로 누적한다 (재정렬 시 통계 감쇠와 무관하게)."""
+    leaves = 0
+    results = []
+    start = time.perf_counter()
+    for i, ctx in enumerate(contexts, start=1):
+        before = rule_set.leaf_evaluations
+        results.append([m.rule_id for m in rule_set.evaluate(ctx)])
+        leaves += rule_set.leaf_evaluations - before
+        if interval and i % interval == 0:
+            rule_set.reorder()
+    return leaves, time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=50_000)
+    parser.add_argument("--interval", type=int, default=1000)
+    args = parser.parse_args()
+
+    rules = load_seed_rules()
+    print(f"rules={len(rules)} contexts/mix={args.n} reorder_interval={args.interval}\n")
+    print(f"{'mix':<16}{'authored leaves/req':>22}{'adaptive leaves/req':>22}{'reduction':>12}")
+
+    for mix in MIXES:
+        contexts = sample_contexts(mix, args.n)
+        # 결정적 모드 + 통계 수집: 작성 순서 기준선
+        baseline = CompiledRuleSet(rules, adaptive=False, record_stats=True)
+        # 재정렬은 아래 루프에서 직접 호출 (리프 수를 정확히 세기 위해)
+        adaptive = CompiledRuleSet(rules, adaptive=False, record_stats=True)
+
+        base_leaves, _, base_results = _run(baseline, contexts, None)
+        adapt_leaves, _, adapt_results = _run(adaptive, contexts, args.interval)
+
+        reference = [[m.rule_id for m in evaluate_rules(rules, ctx)] for ctx in contexts[:2000]]
+        assert base_results == adapt_results, "reordering changed results"
+        assert base_results[:2000] == reference, "compiled engine diverges from evaluate_rules"
+
+        reduction = 1 - adapt_leaves / base_leaves
+        print(f"{mix:<16}{base_leaves / args.n:>22.2f}{adapt_leaves / args.n:>22.2f}{reduction:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
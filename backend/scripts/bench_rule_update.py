@@ -0,0 +1,109 @@
+"""
+룰 1건 수정 시 스냅샷 갱신 비용 — 전체 재컴파일 vs 부분 갱신(`CompiledRuleSet.replace_rule`).
+
+    python -m scripts.bench_rule_update [--rules 100,1000,3000] [--edits 20]
+
+시드 룰을 필드 값만 바꿔 복제해 --rules 건짜리 룰셋을 만들고, 무작위 룰 하나의 조건·우선순위를 바꾼다.
+두 방식 모두 새 룰셋 + 오프라인 번들(`build_bundle`, 룰별 진리표 포함)까지 만드는 시간을 잰다.
+부분 갱신은 바뀐 룰만 컴파일하고, 번들은 공유 노드의 진리표를 재사용한다.
+매 수정 후 두 결과의 version · 룰 순서 · 번들이 같은지 확인한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import random
+import statistics
+import time
+
+from app.engine.bundle import build_bundle
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.rule_compiler import CompiledRuleSet
+from app.enums import AccountType, ApplicantType
+from scripts.traffic import load_seed_rules
+
+
+def synthetic_rules(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    seed_rules = load_seed_rules()
+    out = []
+    for i in range(n):
+        rule = copy.deepcopy(seed_rules[i % len(seed_rules)])
+        if i >= len(seed_rules):
+            # 같은 모양, 다른 값 — 진리표가 룰마다 달라지도록
+            rule["conditions"] = {"all": [
+                rule["conditions"],
+                {"field": "applicant_type", "neq": rng.choice(list(ApplicantType)).value},
+            ]}
+        rule.update(id=i + 1, rule_name=f"{rule['rule_name']} #{i + 1}", priority=rng.randrange(1, 500))
+        out.append(rule)
+    return out
+
+
+def edit(rule: dict, rng: random.Random) -> dict:
+    rule = dict(rule)
+    rule["priority"] = rng.randrange(1, 500)
+    rule["conditions"] = {"all": [
+        {"field": "account_type", "eq": rng.choice(list(AccountType)).value},
+        {"field": "is_new_corp", "is_true": True},
+    ]}
+    return rule
+
+
+def run(n: int, edits: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    rules = synthetic_rules(n, seed)
+    codes = sorted({c for r in rules for c in (*r.get("required_documents", []), *r.get("optional_documents", []))})
+    catalog = DocumentCatalog(codes)
+
+    current = CompiledRuleSet(rules, adaptive=False, catalog=catalog)
+    build_bundle(current)  # 패키지 표·진리표 적재
+    by_id = {r["id"]: r for r in rules}
+
+    timings: dict[str, list[float]] = {"full": [], "full_bundle": [], "incremental": [], "incremental_bundle": []}
+    for _ in range(edits):
+        changed = edit(by_id[rng.randrange(1, n + 1)], rng)
+        by_id[changed["id"]] = changed
+
+        t0 = time.perf_counter()
+        rebuilt = CompiledRuleSet(list(by_id.values()), adaptive=False, catalog=DocumentCatalog(codes))
+        t1 = time.perf_counter()
+        full_bundle = build_bundle(rebuilt)
+        t2 = time.perf_counter()
+        timings["full"].append(t1 - t0)
+        timings["full_bundle"].append(t2 - t1)
+
+        t0 = time.perf_counter()
+        current = current.replace_rule(changed["id"], changed)
+        t1 = time.perf_counter()
+        bundle = build_bundle(current)
+        t2 = time.perf_counter()
+        timings["incremental"].append(t1 - t0)
+        timings["incremental_bundle"].append(t2 - t1)
+
+        assert current.version == rebuilt.version
+        assert [r.rule["id"] for r in current.rules] == [r.rule["id"] for r in rebuilt.rules]
+        assert json.dumps(bundle) == json.dumps(full_bundle)
+
+    return {"rules": n, **{k: statistics.median(v) * 1e3 for k, v in timings.items()}}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", default="100,1000,3000", help="쉼표로 구분한 룰 수")
+    parser.add_argument("--edits", type=int, default=20, help="룰 수별 수정 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("  중앙값 ms — 스냅샷: 룰셋 교체 (PATCH 응답 전), 번들: 다음 GET /determine/bundle")
+    print(f"  {'rules':>7}{'full snapshot':>15}{'incr snapshot':>15}{'full bundle':>13}{'incr bundle':>13}")
+    for n in (int(x) for x in args.rules.split(",")):
+        r = run(n, args.edits, args.seed)
+        print(f"  {r['rules']:>7,}{r['full']:>15.2f}{r['incremental']:>15.2f}"
+              f"{r['full_bundle']:>13.1f}{r['incremental_bundle']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
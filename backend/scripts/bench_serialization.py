@@ -0,0 +1,147 @@
+"""
+판정 결과 직렬화 벤치마크 — 요청 지연 중 직렬화 비중 (기존 3중 직렬화 vs 정규 인코딩 1회).
+
+    python -m scripts.bench_serialization [--n 20000] [--requests 500]
+
+기존 경로: DeterminationResponse/DocumentGroupResponse 구성 → FastAPI response_model
+검증·직렬화 → json.dumps (JSONResponse) + determination_result_json 용 json.dumps.
+새 경로: EncodedResult 1회 (orjson 사용 가능 시 orjson).
+요청 지연은 임시 SQLite DB 에 TestClient 로 POST /determine 을 보내 측정한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+
+from pydantic import TypeAdapter
+
+from app.engine import result_codec
+from app.engine.case_table import get_case_table
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import run_determination
+from app.engine.result_codec import EncodedResult
+from app.engine.rule_compiler import CompiledRuleSet
+from app.schemas.determination import DeterminationResponse, DocumentGroupResponse
+from scripts.traffic import MIXES, SEED_DIR, load_seed_rules, sample_contexts
+
+_response_adapter = TypeAdapter(DeterminationResponse)
+
+
+def legacy_serialize(result) -> tuple[bytes, str]:
+    """변경 전 determine() 의 직렬화 단계 재현."""
+    doc_groups = [
+        DocumentGroupResponse(
+            group_code=g.group_code,
+            documents=g.documents,
+            min_required=g.min_required,
+            description=g.description,
+        )
+        for g in result.document_groups
+    ]
+    column = json.dumps({
+        "case_code": result.case_code,
+        "case_tags": result.case_tags,
+        "status": result.status,
+        "required_documents": result.required_documents,
+        "optional_documents": result.optional_documents,
+        "blocked": result.blocked,
+        "escalate": result.escalate,
+        "explanations": result.explanations,
+        "matched_rules": result.matched_rules,
+    }, ensure_ascii=False)
+    response = DeterminationResponse(
+        case_code=result.case_code,
+        case_tags=result.case_tags,
+        status=result.status,
+        required_documents=result.required_documents,
+        optional_documents=result.optional_documents,
+        document_groups=doc_groups,
+        blocked=result.blocked,
+        escalate=result.escalate,
+        explanations=result.explanations,
+        matched_rules=result.matched_rules,
+    )
+    # FastAPI serialize_response: 모델 → dict → response_model 검증 → JSON 모드 덤프 → JSONResponse
+    content = _response_adapter.dump_python(_response_adapter.validate_python(response.model_dump()), mode="json")
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+    return body.encode("utf-8"), column
+
+
+def canonical_serialize(result) -> tuple[bytes, str]:
+    encoded = EncodedResult(result)
+    return encoded.body, encoded.text
+
+
+def _time_per_call(fn, results) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    for r in results:
+        fn(r)
+    return (time.perf_counter() - start) / len(results)
+
+
+def _request_latency(contexts: list[dict], n: int) -> float:
+    """TestClient 로 측정한 POST /determine 평균 지연 (초)."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    bodies = [
+        {
+            "business_reg_no": f"BENCH{i % 50:05d}",
+            "corp_name": "벤치마크",
+            **{k: v for k, v in ctx.items() if k != "risk_flags"},
+            "risk_flags": ctx["risk_flags"],
+        }
+        for i, ctx in enumerate(contexts[:n])
+    ]
+    with TestClient(app) as client:
+        for body in bodies[:20]:  # 워밍업
+            client.post("/api/v1/determine", json=body)
+        start = time.perf_counter()
+        for body in bodies:
+            client.post("/api/v1/determine", json=body).raise_for_status()
+        return (time.perf_counter() - start) / len(bodies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--mix", choices=list(MIXES), default="branch_typical")
+    args = parser.parse_args()
+
+    rules = load_seed_rules()
+    with open(SEED_DIR / "document_types.json", encoding="utf-8") as f:
+        catalog = DocumentCatalog(d["code"] for d in json.load(f))
+    rule_set = CompiledRuleSet(rules, adaptive=False, catalog=catalog)
+    table = get_case_table()
+    contexts = sample_contexts(args.mix, args.n)
+    results = [run_determination(ctx, rule_set, table) for ctx in contexts]
+
+    # 새 인코딩이 기존 응답과 같은 바이트인지 확인
+    mismatches = sum(legacy_serialize(r)[0] != canonical_serialize(r)[0] for r in results[:2000])
+
+    t_legacy = _time_per_call(legacy_serialize, results)
+    t_new = _time_per_call(canonical_serialize, results)
+    latency = _request_latency(contexts, args.requests)
+    # 측정된 지연은 새 경로 기준 — 기존 경로 지연은 직렬화 시간 차이만큼 더한 값으로 추정
+    legacy_latency = latency - t_new + t_legacy
+
+    print(f"encoder            : {'orjson' if result_codec.orjson is not None else 'json'}")
+    print(f"legacy serialize   : {t_legacy * 1e6:8.1f} µs/result")
+    print(f"canonical encode   : {t_new * 1e6:8.1f} µs/result  ({t_legacy / t_new:.1f}x)")
+    print(f"request latency    : {latency * 1e3:8.2f} ms (canonical), ~{legacy_latency * 1e3:.2f} ms (legacy)")
+    print(f"serialization share: {t_legacy / legacy_latency:6.1%} → {t_new / latency:6.1%}")
+    print(f"response mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("DEBUG", "false")
+    main()
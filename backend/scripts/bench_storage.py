@@ -0,0 +1,79 @@
+"""
+저장소 프로파일 벤치마크 — DB_PROFILE=default(기존) 와 production(WAL + 단일 쓰기 연결 + 읽기 풀)의
+동시 처리량을 같은 부하로 비교한다.
+
+    python -m scripts.bench_storage [--mix back_office] [--concurrency 1,8,32] [--requests 2000]
+    python -m scripts.bench_storage --baseline-debug   # 기존 기본값(DEBUG=True → SQL echo)까지 재현
+
+프로파일마다 새 임시 SQLite 파일로 `scripts.loadtest` 를 별도 프로세스에서 실행하고
+(엔진은 import 시점 설정으로 만들어지므로), 단계별 처리량·p95·오류·DB 잠금 대기를 나란히 출력한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+PROFILES = ("default", "production")
+
+
+def run_profile(profile: str, args, workdir: str) -> dict:
+    db_path = os.path.join(workdir, f"{profile}.db")
+    out_path = os.path.join(workdir, f"{profile}.json")
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "DB_PROFILE": profile,
+        "DEBUG": "true" if profile == "default" and args.baseline_debug else "false",
+    }
+    cmd = [
+        sys.executable, "-m", "scripts.loadtest",
+        "--mix", args.mix,
+        "--concurrency", args.concurrency,
+        "--requests", str(args.requests),
+        "--threads", str(args.threads),
+        "--json", out_path,
+    ]
+    print(f"\n════ DB_PROFILE={profile} ════", flush=True)
+    subprocess.run(
+        cmd, env=env, check=True,
+        stdout=None if args.verbose else subprocess.DEVNULL,
+    )
+    with open(out_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", default="back_office", help="scripts.loadtest 엔드포인트 혼합")
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=40)
+    parser.add_argument("--baseline-debug", action="store_true", help="default 프로파일을 DEBUG=True(SQL echo)로 실행")
+    parser.add_argument("--verbose", action="store_true", help="loadtest 출력 그대로 보기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {p: run_profile(p, args, workdir) for p in PROFILES}
+
+    print(f"\nmix={args.mix} requests/level={args.requests}")
+    print(f"{'conc':>5}{'profile':>12}{'req/s':>10}{'p95 read':>10}{'p95 write':>11}{'errors':>8}{'lock ms':>10}")
+    for i, level in enumerate(results["default"]["levels"]):
+        for profile in PROFILES:
+            row = results[profile]["levels"][i]
+            endpoints = row["endpoints"]
+            writes = [e["p95_ms"] for op, e in endpoints.items() if op in ("determine", "admin_rule_update")]
+            reads = [e["p95_ms"] for op, e in endpoints.items() if op not in ("determine", "admin_rule_update")]
+            print(f"{level['concurrency']:>5}{profile:>12}{row['rps']:>10.1f}"
+                  f"{max(reads, default=0):>10.2f}{max(writes, default=0):>11.2f}"
+                  f"{row['errors']:>8}{row.get('db_lock_wait_ms', 0):>10.1f}")
+        base, prod = results["default"]["levels"][i]["rps"], results["production"]["levels"][i]["rps"]
+        print(f"{'':>5}{'speedup':>12}{prod / base:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+케이스 분류 테이블 ↔ `classify_case` 전수 일치 검사.
+
+enum 4개 차원의 모든 값과 분류에 쓰이는 불리언 입력 9개의 모든 조합
+(6·6·6·4·2⁹ = 442,368 건)을 두 구현에 넣어 (case_code, tags) 가 같은지 확인한다.
+
+    python -m scripts.check_case_table_parity
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from itertools import product
+
+from app.engine.case_classifier import classify_case
+from app.engine.case_table import get_case_table
+from app.enums import AccountType, ApplicantType, BusinessStatus, CustomerType
+
+BOOL_INPUTS = (
+    "is_new_corp",
+    "ubo_confirmable",
+    "multi_layer_ownership",
+    "ultimate_owner_unknown",
+    "risk_flags.high_risk_country",
+    "risk_flags.pep_sanction",
+    "risk_flags.special_review",
+    "risk_flags.document_mismatch",
+    "risk_flags.proxy_authority_unclear",
+)
+
+
+def iter_input_space():
+    for cust, app, acct, status in product(CustomerType, ApplicantType, AccountType, BusinessStatus):
+        for bits in range(1 << len(BOOL_INPUTS)):
+            ctx = {
+                "customer_type": cust,
+                "applicant_type": app,
+                "account_type": acct,
+                "business_status": status,
+                "risk_flags": {},
+            }
+            for i, name in enumerate(BOOL_INPUTS):
+                value = bool(bits >> i & 1)
+                if name.startswith("risk_flags."):
+                    ctx["risk_flags"][name.split(".", 1)[1]] = value
+                else:
+                    ctx[name] = value
+            yield ctx
+
+
+def main() -> int:
+    start = time.perf_counter()
+    table = get_case_table()
+    built = time.perf_counter() - start
+
+    checked = mismatches = 0
+    for ctx in iter_input_space():
+        expected = classify_case(ctx)
+        # 판정 API 는 enum 대신 문자열 값을 넘긴다 — 둘 다 확인
+        plain = {k: (v.value if hasattr(v, "value") else v) for k, v in ctx.items()}
+        for got in (table.classify(ctx), table.classify(plain)):
+            if got != expected:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"MISMATCH {plain}: expected {expected}, got {got}")
+        checked += 1
+
+    print(
+        f"table entries={len(table.table):,} outcomes={len(table.outcomes)} build={built:.2f}s; "
+        f"checked {checked:,} inputs in {time.perf_counter() - start:.1f}s, mismatches={mismatches}"
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+판정 엔진 적합성(골든) 코퍼스 — 입력 공간 전수 열거 + 기대 판정.
+
+    python -m scripts.conformance_corpus generate [--out corpus] [--source db|seed] [--jobs N] [--all-fields]
+    python -m scripts.conformance_corpus verify [--corpus corpus/<hash>] [--engine compiled|batch|reference]
+
+기대값은 기준 구현(classify_case + evaluate_rules + compile_determination + resolve_documents)으로
+만들고, 최적화된 엔진(컴파일 룰셋, 일괄 평가기, 케이스 테이블, 프런트엔드 TS 엔진)은
+같은 입력에 대해 바이트 단위로 같은 결과를 내야 한다.
+
+입력 공간
+---------
+DeterminationInput 의 enum 필드 4개(전체 값) × 불리언 입력의 모든 조합.
+기본은 룰 조건이나 케이스 분류가 참조하는 불리언만 열거하고 나머지는 API 기본값으로 고정한다
+(--all-fields 면 DeterminationInput 의 모든 불리언을 열거). 고정값은 manifest 에 기록된다.
+
+코퍼스 형식 (<out>/<ruleset_hash 앞 16자>/)
+-------------------------------------------
+manifest.json : ruleset_hash, 차원(이름·값 목록, 앞쪽이 상위 자릿수), 불리언 필드(앞쪽이 상위 비트),
+                고정값, 입력 수, 결과 수, outcomes.bin 의 sha256
+values.json.gz  : 응답 필드별 서로 다른 값 목록 {"strings": [...], 필드: [값, ...]}.
+                  문자열 목록 필드(list_fields)의 값은 strings 번호 배열로 저장한다.
+outcomes.bin.gz : 입력 × 응답 필드 행렬(행 우선, little-endian uint16 — 값이 65535 개를 넘으면 uint32).
+                  입력 i 의 필드 j 값은 values[fields[j]][outcomes[i, j]]
+
+판정 전체를 통째로 중복 제거하면 설명·매칭 룰 조합 때문에 결과 수가 입력 수에 가까워지므로
+필드 단위로 인턴한다. 필드 값을 응답 순서대로 다시 조립해 result_codec 으로 인코딩하면
+응답 본문과 같은 바이트가 된다.
+
+입력 i 는 혼합 기수 표기로 복원한다: 하위 자리부터 불리언 비트(마지막 필드가 최하위 비트),
+그다음 enum 차원(마지막 차원이 하위 자리). `decode_input(manifest, i)` 참고.
+
+ruleset_hash 는 활성 룰(정규화 JSON) · 서류 카탈로그 순서 · 케이스 분류 정의의 sha256 이다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+from app.engine import result_codec
+from app.engine.case_classifier import classify_case
+from app.engine.case_table import get_case_table, load_definitions
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import finalize_determination
+from app.engine.rule_engine import evaluate_rules
+from app.schemas.determination import DeterminationInput, RiskFlagsInput
+
+FORMAT_VERSION = 1
+DEFAULT_OUT = Path("corpus")
+
+_RULE_KEYS = (
+    "id", "rule_name", "priority", "conditions", "required_documents", "optional_documents",
+    "blocked_if_missing", "escalate_if_true", "output_status", "output_case_tags", "explanation_template",
+)
+
+
+# ── 룰셋 ──
+
+def load_ruleset(source: str) -> tuple[list[dict], list[str]]:
+    """(활성 룰 목록, 서류 카탈로그 코드 순서)."""
+    if source == "seed":
+        from scripts.traffic import SEED_DIR, load_seed_rules
+
+        with open(SEED_DIR / "document_types.json", encoding="utf-8") as f:
+            codes = [d["code"] for d in json.load(f)]
+        return load_seed_rules(), codes
+
+    from app.database import SessionLocal
+    from app.engine.rule_snapshot import load_rules_data
+    from app.models.document_type import DocumentType
+
+    db = SessionLocal()
+    try:
+        codes = [code for (code,) in db.query(DocumentType.code).order_by(DocumentType.id)]
+        return load_rules_data(db), codes
+    finally:
+        db.close()
+
+
+def ruleset_hash(rules: list[dict], catalog_codes: list[str]) -> str:
+    canonical = {
+        "rules": sorted(
+            ({k: r.get(k) for k in _RULE_KEYS} for r in rules if r.get("enabled", True)),
+            key=lambda r: r["id"],
+        ),
+        "catalog": catalog_codes,
+        "case_classification": load_definitions(),
+    }
+    blob = json.dumps(canonical, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# ── 입력 공간 ──
+
+def _referenced_fields(rules: list[dict]) -> set[str]:
+    fields: set[str] = set()
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if isinstance(node.get("field"), str):
+                fields.add(node["field"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    for rule in rules:
+        walk(rule.get("conditions"))
+    for _, path, _ in get_case_table().flag_refs:
+        fields.add(path)
+    return fields
+
+
+def input_space(rules: list[dict], all_fields: bool) -> dict:
+    """DeterminationInput 스키마에서 차원·불리언 필드·고정값을 도출한다."""
+    dimensions: list[tuple[str, list[str]]] = []
+    booleans: list[tuple[str, bool]] = []
+    for name, field in DeterminationInput.model_fields.items():
+        if name == "risk_flags":
+            booleans += [(f"risk_flags.{n}", f.default) for n, f in RiskFlagsInput.model_fields.items()]
+        elif field.annotation is bool:
+            booleans.append((name, field.default))
+        else:
+            dimensions.append((name, [member.value for member in field.annotation]))
+
+    referenced = _referenced_fields(rules)
+    enumerated = [name for name, _ in booleans if all_fields or name in referenced]
+    fixed = {name: default for name, default in booleans if name not in enumerated}
+    return {
+        "dimensions": [{"name": n, "values": v} for n, v in dimensions],
+        "booleans": enumerated,
+        "fixed": fixed,
+        "size": int(np.prod([len(v) for _, v in dimensions])) << len(enumerated),
+    }
+
+
+def decode_input(space: dict, i: int) -> dict:
+    """입력 번호 → 엔진 컨텍스트 (판정 API 의 build_context 와 같은 형태)."""
+    values: dict[str, Any] = dict(space["fixed"])
+    booleans = space["booleans"]
+    for k, name in enumerate(reversed(booleans)):
+        values[name] = bool(i >> k & 1)
+    i >>= len(booleans)
+    for dim in reversed(space["dimensions"]):
+        i, digit = divmod(i, len(dim["values"]))
+        values[dim["name"]] = dim["values"][digit]
+
+    context: dict[str, Any] = {"risk_flags": {}}
+    for name, value in values.items():
+        if name.startswith("risk_flags."):
+            context["risk_flags"][name[len("risk_flags."):]] = value
+        else:
+            context[name] = value
+    return context
+
+
+def iter_inputs(space: dict, start: int, stop: int) -> Iterator[dict]:
+    for i in range(start, stop):
+        yield decode_input(space, i)
+
+
+# ── 생성 (병렬) ──
+
+FIELDS = (
+    "case_code", "case_tags", "status", "required_documents", "optional_documents",
+    "document_groups", "blocked", "escalate", "explanations", "matched_rules",
+)
+
+LIST_FIELDS = ("case_tags", "required_documents", "optional_documents", "explanations", "matched_rules")
+
+_worker: dict = {}
+
+
+def _init_worker(rules: list[dict], catalog_codes: list[str], space: dict) -> None:
+    _worker.update(rules=rules, catalog=DocumentCatalog(catalog_codes), space=space)
+
+
+def reference_determination(context: dict, rules: list[dict], catalog: DocumentCatalog):
+    """기준 구현 — 최적화 경로(케이스 테이블, 컴파일 룰셋, 비트셋 매치)를 거치지 않는다."""
+    case_code, case_tags = classify_case(context)
+    matches = evaluate_rules(rules, context)
+    return finalize_determination(case_code, case_tags, matches, context.get("account_type"), catalog)
+
+
+def encode_fields(result) -> list[bytes]:
+    """판정 결과 → 응답 필드별 정규 인코딩."""
+    payload = result_codec.result_payload(result)
+    return [result_codec.dumps(payload[f]) for f in FIELDS]
+
+
+def _generate_shard(bounds: tuple[int, int]) -> tuple[int, list[list[bytes]], np.ndarray]:
+    """입력 [start, stop) 의 기대 판정 — (start, 필드별 샤드 내 값 목록, 샤드 내 값 번호 행렬)."""
+    start, stop = bounds
+    rules, catalog, space = _worker["rules"], _worker["catalog"], _worker["space"]
+    tables: list[dict[bytes, int]] = [{} for _ in FIELDS]
+    ids = np.empty((stop - start, len(FIELDS)), dtype=np.uint32)
+    for k, context in enumerate(iter_inputs(space, start, stop)):
+        encoded = encode_fields(reference_determination(context, rules, catalog))
+        ids[k] = [table.setdefault(value, len(table)) for table, value in zip(tables, encoded)]
+    return start, [list(table) for table in tables], ids
+
+
+def generate(out: Path, source: str, jobs: int, all_fields: bool, shard_size: int = 4096) -> Path:
+    rules, catalog_codes = load_ruleset(source)
+    digest = ruleset_hash(rules, catalog_codes)
+    space = input_space(rules, all_fields)
+    n = space["size"]
+    shards = [(s, min(s + shard_size, n)) for s in range(0, n, shard_size)]
+
+    t0 = time.perf_counter()
+    tables: list[dict[bytes, int]] = [{} for _ in FIELDS]
+    outcomes = np.empty((n, len(FIELDS)), dtype=np.uint32)
+    if jobs > 1:
+        pool = ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(rules, catalog_codes, space))
+        shard_results = pool.map(_generate_shard, shards, chunksize=2)
+    else:
+        pool = None
+        _init_worker(rules, catalog_codes, space)
+        shard_results = map(_generate_shard, shards)
+    try:
+        for start, local_tables, local_ids in shard_results:
+            for j, (table, values) in enumerate(zip(tables, local_tables)):
+                remap = np.array([table.setdefault(v, len(table)) for v in values], dtype=np.uint32)
+                outcomes[start:start + len(local_ids), j] = remap[local_ids[:, j]]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    elapsed = time.perf_counter() - t0
+
+    dtype = np.dtype("<u2") if max(map(len, tables)) <= 0xFFFF else np.dtype("<u4")
+    packed = outcomes.astype(dtype).tobytes()
+    target = out / digest[:16]
+    target.mkdir(parents=True, exist_ok=True)
+    with gzip.open(target / "outcomes.bin.gz", "wb", compresslevel=6) as f:
+        f.write(packed)
+    strings: dict[str, int] = {}
+    values: dict[str, Any] = {"strings": strings}
+    for field, table in zip(FIELDS, tables):
+        decoded = [result_codec.loads(v) for v in table]
+        if field in LIST_FIELDS:
+            decoded = [[strings.setdefault(item, len(strings)) for item in v] for v in decoded]
+        values[field] = decoded
+    values["strings"] = list(strings)
+    with gzip.open(target / "values.json.gz", "wb", compresslevel=6) as f:
+        f.write(result_codec.dumps(values))
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "ruleset_hash": digest,
+        "source": source,
+        "rule_count": len(rules),
+        **space,
+        "fields": list(FIELDS),
+        "list_fields": list(LIST_FIELDS),
+        "value_counts": {field: len(table) for field, table in zip(FIELDS, tables)},
+        "outcome_dtype": dtype.str,
+        "outcomes_sha256": hashlib.sha256(packed).hexdigest(),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    (target / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    size = sum(p.stat().st_size for p in target.iterdir())
+    print(f"ruleset {digest[:16]}: {n:,} inputs in {elapsed:.1f}s ({jobs} jobs) "
+          f"→ {target} ({size / 1e6:.1f} MB)")
+    return target
+
+
+# ── 검증 ──
+
+def load_corpus(path: Path) -> tuple[dict, list[dict[bytes, int]], np.ndarray]:
+    """(manifest, 필드별 {정규 인코딩: 값 번호}, 입력 × 필드 값 번호 행렬)."""
+    manifest = json.loads((path / "manifest.json").read_text(encoding="utf-8"))
+    if manifest["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported corpus format {manifest['format_version']}")
+    with gzip.open(path / "outcomes.bin.gz", "rb") as f:
+        packed = f.read()
+    if hashlib.sha256(packed).hexdigest() != manifest["outcomes_sha256"]:
+        raise ValueError(f"{path}: outcomes checksum mismatch")
+    with gzip.open(path / "values.json.gz", "rb") as f:
+        values = result_codec.loads(f.read())
+    strings = values["strings"]
+    lookups = []
+    for field in manifest["fields"]:
+        entries = values[field]
+        if field in manifest["list_fields"]:
+            entries = [[strings[k] for k in v] for v in entries]
+        lookups.append({result_codec.dumps(v): i for i, v in enumerate(entries)})
+    outcomes = np.frombuffer(packed, dtype=np.dtype(manifest["outcome_dtype"]))
+    return manifest, lookups, outcomes.reshape(manifest["size"], len(manifest["fields"]))
+
+
+def _compare(lookups: list[dict[bytes, int]], expected: np.ndarray, result) -> list[str]:
+    """불일치한 필드 이름 목록."""
+    return [
+        field
+        for field, lookup, want, value in zip(FIELDS, lookups, expected.tolist(), encode_fields(result))
+        if lookup.get(value, -1) != want
+    ]
+
+
+def verify(corpus: Path, source: str, engine: str, limit: int = 10) -> int:
+    """현재 룰셋·엔진으로 코퍼스를 재현해 불일치 수를 반환한다."""
+    from app.engine.batch import BatchEvaluator
+    from app.engine.pipeline import run_determination
+    from app.engine.rule_compiler import CompiledRuleSet
+
+    manifest, lookups, outcomes = load_corpus(corpus)
+    if manifest["fields"] != list(FIELDS):
+        raise ValueError(f"{corpus}: response fields differ from this engine ({manifest['fields']})")
+    rules, catalog_codes = load_ruleset(source)
+    digest = ruleset_hash(rules, catalog_codes)
+    if digest != manifest["ruleset_hash"]:
+        print(f"⚠️  ruleset hash differs: corpus {manifest['ruleset_hash'][:16]}, current {digest[:16]} "
+              "— regenerate the corpus before verifying")
+        return 2
+
+    t0 = time.perf_counter()
+    n = manifest["size"]
+    mismatches = 0
+
+    def check(i: int, result) -> None:
+        nonlocal mismatches
+        fields = _compare(lookups, outcomes[i], result)
+        if fields:
+            mismatches += 1
+            if mismatches <= limit:
+                print(f"MISMATCH #{i} fields={fields} input={decode_input(manifest, i)}")
+
+    catalog = DocumentCatalog(catalog_codes)
+    rule_set = CompiledRuleSet(rules, adaptive=False, catalog=catalog)
+    if engine == "batch":
+        evaluator = BatchEvaluator(rule_set)
+        chunk = 65536
+        for start in range(0, n, chunk):
+            batch = evaluator.determine(list(iter_inputs(manifest, start, min(start + chunk, n))))
+            # 같은 결과 객체를 공유하는 행은 값 번호도 같아야 하므로 결과별로 한 번만 인코딩
+            encoded = [
+                [lookup.get(value, -1) for lookup, value in zip(lookups, encode_fields(r))]
+                for r in batch.results
+            ]
+            got = np.array(encoded, dtype=np.int64)[batch.inverse]
+            bad = np.flatnonzero((got != outcomes[start:start + len(got)]).any(axis=1))
+            for k in bad.tolist():
+                check(start + k, batch[k])
+    else:
+        for i, context in enumerate(iter_inputs(manifest, 0, n)):
+            if engine == "compiled":
+                check(i, run_determination(context, rule_set))
+            else:
+                check(i, reference_determination(context, rules, catalog))
+    print(f"engine={engine}: checked {n:,} inputs in {time.perf_counter() - t0:.1f}s, mismatches={mismatches}")
+    return 1 if mismatches else 0
+
+
+def _latest(out: Path) -> Path:
+    manifests = sorted(out.glob("*/manifest.json"), key=lambda p: p.stat().st_mtime)
+    if not manifests:
+        raise SystemExit(f"no corpus under {out}")
+    return manifests[-1].parent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    g = sub.add_parser("generate", help="코퍼스 생성")
+    g.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    g.add_argument("--source", choices=("db", "seed"), default="db", help="룰·서류 마스터 출처")
+    g.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    g.add_argument("--all-fields", action="store_true", help="참조되지 않는 불리언도 열거")
+    v = sub.add_parser("verify", help="현재 엔진을 코퍼스와 대조")
+    v.add_argument("--corpus", type=Path, help="코퍼스 디렉터리 (기본: --out 아래 최신)")
+    v.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    v.add_argument("--source", choices=("db", "seed"), default="db")
+    v.add_argument("--engine", choices=("compiled", "batch", "reference"), default="batch")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate(args.out, args.source, args.jobs, args.all_fields)
+        return 0
+    return verify(args.corpus or _latest(args.out), args.source, args.engine)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("DEBUG", "false")
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""
+부하 테스트 — 엔드포인트 혼합 트래픽을 목표 동시성으로 재생하고 처리량·지연 백분위를 보고한다.
+
+    python -m scripts.loadtest [--mix branch] [--concurrency 1,8,32] [--requests 2000] [--threads 40]
+    python -m scripts.loadtest --base-url http://127.0.0.1:8000 --concurrency 16 --duration 30
+
+기본은 httpx ASGITransport 로 앱을 프로세스 안에서 구동한다 (lifespan 실행, DATABASE_URL 이
+없으면 임시 SQLite DB). --threads 는 동기 엔드포인트를 실행하는 스레드풀 크기다.
+--base-url 을 주면 이미 떠 있는 인스턴스(예: `uvicorn app.main:app --workers 4`)를 대상으로 한다.
+
+판정 요청은 케이스 C01~C14 마다 합성 고객 --customers 명씩을 균등하게 사용한다.
+(C13 은 케이스 코드가 아니라 상품 추가 태그이므로 PRODUCT_ADDITIONAL 이 붙는 입력으로 대표한다.)
+
+DB 잠금 대기 (프로세스 내 모드만): 쓰기 문장(INSERT/UPDATE/DELETE)과 COMMIT 의 실행 시간 중
+동시성 1 워밍업에서 측정한 비경합 중앙값을 넘는 부분의 합. SQLite 의 busy 대기와
+PostgreSQL 의 행 잠금 대기는 모두 이 호출 안에서 일어난다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from itertools import product
+
+import httpx
+
+API = "/api/v1"
+
+# 엔드포인트 혼합: (작업, 가중치)
+ENDPOINT_MIXES: dict[str, list[tuple[str, int]]] = {
+    # 영업점 — 판정 등록 위주
+    "branch": [
+        ("determine", 55), ("list_requests", 15), ("get_request", 15),
+        ("audit_logs", 5), ("admin_rules", 5), ("admin_document_types", 5),
+    ],
+    # 심사부 — 조회 위주
+    "back_office": [
+        ("determine", 10), ("list_requests", 30), ("get_request", 25),
+        ("audit_logs", 25), ("admin_rules", 5), ("admin_document_types", 5),
+    ],
+    # 룰 관리 중 — 관리 쓰기가 캐시·룰 스냅샷을 계속 무효화
+    "admin_churn": [
+        ("determine", 40), ("list_requests", 10), ("get_request", 10), ("audit_logs", 10),
+        ("admin_rules", 15), ("admin_document_types", 10), ("admin_rule_update", 5),
+    ],
+}
+
+CASE_CODES = [f"C{i:02d}" for i in range(1, 15)]
+
+
+# ── 합성 고객 ──
+
+def synthetic_customers(per_case: int, seed: int = 7) -> dict[str, list[dict]]:
+    """케이스 코드 → 판정 요청 본문 목록. 분류 테이블로 입력 공간을 열거해 케이스별로 표본 추출한다."""
+    from app.engine.case_table import get_case_table
+    from app.enums import AccountType, ApplicantType, BusinessStatus, CustomerType
+    from scripts.traffic import RISK_FLAGS
+
+    table = get_case_table()
+    buckets: dict[str, list[dict]] = defaultdict(list)
+    for customer, applicant, account, status in product(CustomerType, ApplicantType, AccountType, BusinessStatus):
+        for ubo_unknown, multi_layer, owner_unknown, new_corp in product((False, True), repeat=4):
+            for flag in (None, *RISK_FLAGS):
+                ctx = {
+                    "customer_type": customer.value,
+                    "applicant_type": applicant.value,
+                    "account_type": account.value,
+                    "business_status": status.value,
+                    "ubo_confirmable": not ubo_unknown,
+                    "multi_layer_ownership": multi_layer,
+                    "ultimate_owner_unknown": owner_unknown,
+                    "is_new_corp": new_corp,
+                    "risk_flags": {flag: True} if flag else {},
+                }
+                code, tags = table.classify(ctx)
+                buckets[code].append(ctx)
+                if "PRODUCT_ADDITIONAL" in tags:
+                    buckets["C13"].append(ctx)
+
+    rng = random.Random(seed)
+    out: dict[str, list[dict]] = {}
+    for code in CASE_CODES:
+        pool = buckets.get(code)
+        if not pool:
+            continue
+        out[code] = [
+            {
+                **ctx,
+                "business_reg_no": f"LT{code}{i:05d}",
+                "corp_name": f"부하테스트 {code}-{i}",
+            }
+            for i, ctx in enumerate(rng.sample(pool, min(per_case, len(pool))))
+        ]
+    return out
+
+
+# ── DB 시간 측정 ──
+
+class DbTimer:
+    """엔진의 쓰기 문장·COMMIT 실행 시간을 수집한다 (프로세스 내 모드)."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        dialect = engine.dialect
+        do_commit = dialect.do_commit
+
+        def timed_commit(dbapi_connection):
+            t0 = time.perf_counter()
+            try:
+                do_commit(dbapi_connection)
+            finally:
+                self._add("commit", time.perf_counter() - t0)
+
+        dialect.do_commit = timed_commit
+
+    def _add(self, kind: str, elapsed: float) -> None:
+        with self._lock:
+            self.samples[kind].append(elapsed)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.t0 = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip()[:6].upper()
+        if verb in ("INSERT", "UPDATE", "DELETE"):
+            self._add("write", time.perf_counter() - self._local.t0)
+
+    def reset(self) -> dict[str, list[float]]:
+        with self._lock:
+            samples, self.samples = self.samples, defaultdict(list)
+        return samples
+
+
+def lock_wait(samples: dict[str, list[float]], baseline: dict[str, float]) -> tuple[float, int]:
+    """(비경합 중앙값 초과 시간 합, 측정 호출 수)."""
+    total = 0.0
+    n = 0
+    for kind, values in samples.items():
+        base = baseline.get(kind, 0.0)
+        total += sum(max(0.0, v - base) for v in values)
+        n += len(values)
+    return total, n
+
+
+# ── 부하 생성 ──
+
+class Workload:
+    def __init__(self, client: httpx.AsyncClient, mix: str, customers: dict[str, list[dict]], seed: int):
+        self.client = client
+        self.ops, self.weights = zip(*ENDPOINT_MIXES[mix])
+        self.customers = customers
+        self.codes = list(customers)
+        self.rng = random.Random(seed)
+        self.request_ids: list[int] = []
+        self.rules: list[dict] = []
+
+    async def prepare(self) -> None:
+        r = await self.client.get(f"{API}/admin/rules")
+        r.raise_for_status()
+        self.rules = r.json()
+        r = await self.client.get(f"{API}/requests", params={"limit": 100})
+        r.raise_for_status()
+        self.request_ids = [row["id"] for row in r.json()]
+
+    def next_op(self) -> str:
+        return self.rng.choices(self.ops, self.weights)[0]
+
+    async def run(self, op: str) -> httpx.Response:
+        c = self.client
+        if op == "determine":
+            code = self.codes[self.rng.randrange(len(self.codes))]
+            body = self.rng.choice(self.customers[code])
+            return await c.post(f"{API}/determine", json=body)
+        if op == "list_requests":
+            # 판정 응답에는 id 가 없으므로 상세 조회 대상은 목록 조회 결과로 보충한다
+            r = await c.get(f"{API}/requests", params={"limit": 20})
+            if r.status_code == 200:
+                self.request_ids.extend(row["id"] for row in r.json()[:5])
+                del self.request_ids[:-1000]
+            return r
+        if op == "get_request":
+            if not self.request_ids:
+                return await self.run("list_requests")
+            return await c.get(f"{API}/requests/{self.rng.choice(self.request_ids)}")
+        if op == "audit_logs":
+            return await c.get(f"{API}/audit-logs", params={"limit": 50})
+        if op == "admin_rules":
+            return await c.get(f"{API}/admin/rules")
+        if op == "admin_document_types":
+            return await c.get(f"{API}/admin/document-types")
+        if op == "admin_rule_update":
+            # 우선순위를 현재 값으로 다시 저장 — 판정 결과는 그대로, 쓰기·무효화 경로만 탄다
+            rule = self.rng.choice(self.rules)
+            return await c.patch(f"{API}/admin/rules/{rule['id']}", json={"priority": rule["priority"]})
+        raise ValueError(op)
+
+
+async def run_level(workload: Workload, concurrency: int, requests: int, duration: float | None) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    remaining = requests
+    deadline = time.perf_counter() + duration if duration else None
+
+    async def worker():
+        nonlocal remaining
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    return
+            else:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            op = workload.next_op()
+            t0 = time.perf_counter()
+            try:
+                r = await workload.run(op)
+                ok = r.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            except Exception:  # 프로세스 내 모드에서 앱 예외가 그대로 올라오는 경우 (예: database is locked)
+                ok = False
+            latencies[op].append(time.perf_counter() - t0)
+            if not ok:
+                errors[op] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"elapsed": time.perf_counter() - start, "latencies": latencies, "errors": errors}
+
+
+def _pct(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def report(concurrency: int, result: dict, db: tuple[float, int] | None) -> dict:
+    elapsed = result["elapsed"]
+    total = sum(len(v) for v in result["latencies"].values())
+    total_errors = sum(result["errors"].values())
+    print(f"\n── concurrency {concurrency}: {total:,} req in {elapsed:.2f}s → {total / elapsed:,.1f} req/s"
+          f"  errors={total_errors}")
+    print(f"  {'endpoint':<22}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'err':>6}")
+    endpoints = {}
+    for op in sorted(result["latencies"]):
+        values = sorted(result["latencies"][op])
+        row = {
+            "count": len(values),
+            "rps": len(values) / elapsed,
+            "p50_ms": _pct(values, 0.50) * 1e3,
+            "p95_ms": _pct(values, 0.95) * 1e3,
+            "p99_ms": _pct(values, 0.99) * 1e3,
+            "max_ms": values[-1] * 1e3,
+            "errors": result["errors"].get(op, 0),
+        }
+        endpoints[op] = row
+        print(f"  {op:<22}{row['count']:>8,}{row['rps']:>9.1f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+              f"{row['p99_ms']:>9.2f}{row['max_ms']:>9.2f}{row['errors']:>6}")
+    out = {"concurrency": concurrency, "elapsed_s": elapsed, "requests": total, "rps": total / elapsed,
+           "errors": total_errors, "endpoints": endpoints}
+    if db is not None:
+        wait, calls = db
+        # 스레드별 대기의 합이므로 벽시계 시간보다 클 수 있다
+        print(f"  DB lock wait ≈ {wait * 1e3:,.1f} ms summed over {calls:,} write/commit calls"
+              f" (avg {wait / max(calls, 1) * 1e3:.2f} ms/call)")
+        out["db_lock_wait_ms"] = wait * 1e3
+        out["db_write_calls"] = calls
+    return out
+
+
+async def main_async(args) -> list[dict]:
+    customers = synthetic_customers(args.customers)
+    print(f"synthetic customers: {sum(map(len, customers.values())):,} across {', '.join(customers)}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout,
+                                   limits=httpx.Limits(max_connections=max(levels)))
+        lifespan = None
+        timer = None
+        print(f"target: {args.base_url} (DB lock wait not measured)")
+    else:
+        import anyio.to_thread
+
+        from app.database import engine
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+        lifespan = app.router.lifespan_context(app)
+        await lifespan.__aenter__()
+        anyio.to_thread.current_default_thread_limiter().total_tokens = args.threads
+        timer = DbTimer(engine)
+        print(f"target: in-process ASGI, {engine.dialect.name}, threadpool={args.threads}")
+
+    results = []
+    try:
+        workload = Workload(client, args.mix, customers, args.seed)
+        await workload.prepare()
+        # 워밍업 (동시성 1) — 캐시 적재 + 비경합 DB 기준값
+        await run_level(workload, 1, args.warmup, None)
+        baseline = {}
+        if timer is not None:
+            baseline = {k: statistics.median(v) for k, v in timer.reset().items() if v}
+        for level in levels:
+            result = await run_level(workload, level, args.requests, args.duration)
+            db = lock_wait(timer.reset(), baseline) if timer is not None else None
+            results.append(report(level, result, db))
+    finally:
+        await client.aclose()
+        if lifespan is not None:
+            await lifespan.__aexit__(None, None, None)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="대상 서버 (없으면 프로세스 내 ASGI)")
+    parser.add_argument("--mix", choices=list(ENDPOINT_MIXES), default="branch")
+    parser.add_argument("--concurrency", default="1,8,32", help="쉼표로 구분한 동시성 단계")
+    parser.add_argument("--requests", type=int, default=2000, help="단계별 요청 수")
+    parser.add_argument("--duration", type=float, help="단계별 시간(초) — 주면 --requests 대신 사용")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--customers", type=int, default=20, help="케이스별 합성 고객 수")
+    parser.add_argument("--threads", type=int, default=40, help="프로세스 내 모드 스레드풀 크기")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_out", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "levels": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "loadtest.db")
+    os.environ.setdefault("DEBUG", "false")
+    main()
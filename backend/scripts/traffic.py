@@ -0,0 +1,96 @@
+"""
+벤치마크용 합성 트래픽 — 영업점 판정 요청의 현실적인 입력 분포.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+from app.enums import AccountType, ApplicantType, BusinessStatus, CustomerType
+
+SEED_DIR = Path(__file__).resolve().parent.parent / "app" / "seed"
+
+RISK_FLAGS = (
+    "high_risk_country",
+    "pep_sanction",
+    "special_review",
+    "document_mismatch",
+    "proxy_authority_unclear",
+    "dormant_suspicious",
+)
+
+# 분포: (값, 가중치)
+MIXES: dict[str, dict] = {
+    # 대부분 국내 영리법인 대표자 본인 / 일반계좌
+    "branch_typical": {
+        "customer_type": [("FOR_PROFIT_CORP_DOMESTIC", 85), ("NON_PROFIT_CORP", 6), ("NON_CORPORATE_ORG", 4),
+                          ("FOREIGN_CORP", 4), ("FOREIGN_ORG", 1)],
+        "applicant_type": [("REPRESENTATIVE_SELF", 60), ("INTERNAL_EMPLOYEE_PROXY", 20), ("EXTERNAL_PROXY", 8),
+                           ("JOINT_REP_SINGLE_ACTION_ALLOWED", 4), ("JOINT_REP_JOINT_ACTION_REQUIRED", 2),
+                           ("NON_FACE_TO_FACE_REQUEST", 6)],
+        "account_type": [("BROKERAGE_GENERAL", 70), ("CMA_SETTLEMENT", 12), ("FOREIGN_SECURITIES", 10),
+                         ("DERIVATIVES", 4), ("BOND_REPO", 3), ("OTHER_PRODUCT", 1)],
+        "business_status": [("ACTIVE", 97), ("SUSPENDED", 1), ("CLOSED", 1), ("UNKNOWN", 1)],
+        "flag_rate": 0.03,
+        "new_corp_rate": 0.10,
+    },
+    # 대리 신청 위주 (법인영업 센터)
+    "proxy_heavy": {
+        "customer_type": [("FOR_PROFIT_CORP_DOMESTIC", 90), ("NON_PROFIT_CORP", 10)],
+        "applicant_type": [("REPRESENTATIVE_SELF", 15), ("INTERNAL_EMPLOYEE_PROXY", 45), ("EXTERNAL_PROXY", 30),
+                           ("JOINT_REP_SINGLE_ACTION_ALLOWED", 5), ("JOINT_REP_JOINT_ACTION_REQUIRED", 5)],
+        "account_type": [("BROKERAGE_GENERAL", 80), ("CMA_SETTLEMENT", 20)],
+        "business_status": [("ACTIVE", 99), ("UNKNOWN", 1)],
+        "flag_rate": 0.08,
+        "new_corp_rate": 0.05,
+    },
+    # 심사부 재검토 큐 — 위험 플래그와 외국법인 비중이 높음
+    "review_queue": {
+        "customer_type": [(c.value, 1) for c in CustomerType],
+        "applicant_type": [(a.value, 1) for a in ApplicantType],
+        "account_type": [(a.value, 1) for a in AccountType],
+        "business_status": [(b.value, 1) for b in BusinessStatus],
+        "flag_rate": 0.25,
+        "new_corp_rate": 0.25,
+    },
+}
+
+
+def load_seed_rules() -> list[dict]:
+    """seed/rules.json 을 DB 직렬화 형태(id, enabled 포함)로 로드한다."""
+    with open(SEED_DIR / "rules.json", encoding="utf-8") as f:
+        rules = json.load(f)
+    return [
+        {"id": i, "enabled": True, "output_case_tags": [], **r}
+        for i, r in enumerate(rules, start=1)
+    ]
+
+
+def _pick(rng: random.Random, weighted: list[tuple[str, int]]) -> str:
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def sample_contexts(mix: str, n: int, seed: int = 42) -> list[dict]:
+    """`determine()` 가 구성하는 것과 같은 형태의 컨텍스트 n 개를 생성한다."""
+    spec = MIXES[mix]
+    rng = random.Random(seed)
+    rate = spec["flag_rate"]
+    out = []
+    for _ in range(n):
+        out.append({
+            "customer_type": _pick(rng, spec["customer_type"]),
+            "account_type": _pick(rng, spec["account_type"]),
+            "applicant_type": _pick(rng, spec["applicant_type"]),
+            "business_status": _pick(rng, spec["business_status"]),
+            "domestic_flag": True,
+            "ubo_confirmable": rng.random() >= rate,
+            "ownership_simple": True,
+            "multi_layer_ownership": rng.random() < rate,
+            "ultimate_owner_unknown": rng.random() < rate,
+            "is_new_corp": rng.random() < spec["new_corp_rate"],
+            "risk_flags": {flag: rng.random() < rate for flag in RISK_FLAGS},
+        })
+    return out
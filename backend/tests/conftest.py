@@ -0,0 +1,64 @@
+"""
+공용 설정 — backend 디렉터리에서 `python -m pytest -q` 로 실행한다.
+
+엔진 테스트는 DB 를 쓰지 않지만, app 모듈 import 시 엔진이 만들어지므로
+저장소의 corp_account.db 대신 임시 SQLite 파일을 가리키게 한다.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parent.parent
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'corp_account_test.db'}")
+os.environ.setdefault("DEBUG", "false")
+
+
+# ── 엔진 적합성 코퍼스 (scripts.conformance_corpus) ──
+
+# 입력 공간(442,368 건)을 이 간격으로 고른다 — enum 조합마다 불리언 조합 수십 개가 걸린다
+CORPUS_STRIDE = 13
+
+
+@pytest.fixture(scope="session")
+def ruleset():
+    """시드 룰셋 (rules, 서류 코드 목록)."""
+    from scripts.conformance_corpus import load_ruleset
+
+    return load_ruleset("seed")
+
+
+@pytest.fixture(scope="session")
+def corpus(ruleset):
+    """
+    입력 공간 표본과 기준 구현(classify_case + evaluate_rules + finalize_determination)의
+    응답 필드별 정규 인코딩(`encode_fields`) — 최적화 경로는 바이트 단위로 같아야 한다.
+    """
+    from app.engine.document_catalog import DocumentCatalog
+    from scripts.conformance_corpus import decode_input, encode_fields, input_space, reference_determination
+
+    rules, codes = ruleset
+    space = input_space(rules, all_fields=False)
+    catalog = DocumentCatalog(codes)
+    contexts = [decode_input(space, i) for i in range(0, space["size"], CORPUS_STRIDE)]
+    expected = [encode_fields(reference_determination(ctx, rules, catalog)) for ctx in contexts]
+    return contexts, expected
+
+
+@pytest.fixture(scope="session")
+def corpus_mismatches(corpus):
+    """판정 결과 목록 → 기대값과 다른 (번호, 입력) 목록."""
+    from scripts.conformance_corpus import encode_fields
+
+    contexts, expected = corpus
+
+    def mismatches(results) -> list:
+        return [(i, contexts[i]) for i, result in enumerate(results) if encode_fields(result) != expected[i]]
+
+    return mismatches
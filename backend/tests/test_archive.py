@@ -0,0 +1,60 @@
+"""AUTOINCREMENT 없이 만든 옛 hot 테이블 재생성 (`ArchiveStore.ensure_monotonic_ids`)."""
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+
+from app.archive import _MONOTONIC_TABLES, ArchiveStore
+from app.models.account_request import AccountRequest
+from app.models.base import Base
+from app.models.customer import Customer
+from app.models.document_checklist import DocumentChecklist
+
+
+def _legacy_db(path):
+    """판정·감사 로그 테이블만 AUTOINCREMENT 없이 만든 (이전 버전) DB."""
+    engine = create_engine(f"sqlite:///{path}")
+    legacy = set(_MONOTONIC_TABLES)
+    Base.metadata.create_all(engine, tables=[t for t in Base.metadata.sorted_tables if t not in legacy])
+    with engine.begin() as conn:
+        for table in _MONOTONIC_TABLES:
+            ddl = str(CreateTable(table).compile(dialect=engine.dialect))
+            conn.exec_driver_sql(ddl.replace(" AUTOINCREMENT", ""))
+            for index in table.indexes:
+                index.create(conn)
+        conn.exec_driver_sql(
+            "CREATE TRIGGER account_requests_touch AFTER UPDATE OF status ON account_requests "
+            "BEGIN UPDATE account_requests SET updated_at = CURRENT_TIMESTAMP WHERE id = new.id; END"
+        )
+        conn.execute(Customer.__table__.insert(), {
+            "id": 1, "business_reg_no": "123-45-67890", "corp_name": "테스트", "customer_type": "CORPORATION",
+        })
+        for i in (1, 2, 3):
+            conn.execute(AccountRequest.__table__.insert(), {
+                "id": i, "customer_id": 1, "account_type": "DEPOSIT", "applicant_type": "REPRESENTATIVE",
+            })
+            conn.execute(DocumentChecklist.__table__.insert(), {"account_request_id": i})
+    return engine
+
+
+def test_rebuild_keeps_foreign_keys_triggers_and_rows(tmp_path):
+    engine = _legacy_db(tmp_path / "hot.db")
+    with Session(engine) as db:
+        ArchiveStore(str(tmp_path / "archive")).ensure_monotonic_ids(db)
+
+    with engine.connect() as conn:
+        schema = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE sql IS NOT NULL")).all())
+        for table in _MONOTONIC_TABLES:
+            assert "AUTOINCREMENT" in schema[table.name].upper()
+            assert not [name for name, sql in schema.items() if f"new_{table.name}" in sql]
+            for index in table.indexes:
+                assert index.name in schema
+        assert "account_requests_touch" in schema
+
+        for child in ("document_checklists", "checklist_items", "checklist_groups"):
+            targets = {row[2] for row in conn.exec_driver_sql(f"PRAGMA foreign_key_list({child})")}
+            assert {t for t in targets if t.startswith("account_requests")} == {"account_requests"}
+        assert conn.exec_driver_sql("PRAGMA foreign_key_check").all() == []
+
+        assert conn.execute(text("SELECT id FROM account_requests ORDER BY id")).scalars().all() == [1, 2, 3]
+        assert conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'account_requests'")).scalar() == 3
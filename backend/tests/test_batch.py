@@ -0,0 +1,14 @@
+"""일괄(열 단위) 평가기 `BatchEvaluator` ↔ 기준 구현 적합성."""
+
+from app.engine.batch import BatchEvaluator
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.rule_compiler import CompiledRuleSet
+
+
+def test_batch_evaluator_matches_reference(ruleset, corpus, corpus_mismatches):
+    rules, codes = ruleset
+    contexts, _ = corpus
+    rule_set = CompiledRuleSet(rules, adaptive=False, catalog=DocumentCatalog(codes))
+    batch = BatchEvaluator(rule_set).determine(contexts)
+    assert len(batch) == len(contexts)
+    assert corpus_mismatches(list(batch))[:5] == []
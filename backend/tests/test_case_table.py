@@ -0,0 +1,60 @@
+"""케이스 분류 테이블(`CaseTable`) ↔ 기준 구현 `classify_case` 일치 (§7)."""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.engine.case_classifier import classify_case
+from app.engine.case_table import DIMENSIONS, get_case_table
+from app.enums import ApplicantType, CustomerType
+from scripts.check_case_table_parity import BOOL_INPUTS, iter_input_space
+
+
+@pytest.fixture(scope="module")
+def table():
+    return get_case_table()
+
+
+def _plain(ctx: dict) -> dict:
+    """판정 API 는 enum 대신 문자열 값을 넘긴다."""
+    return {k: (v.value if hasattr(v, "value") else v) for k, v in ctx.items()}
+
+
+def test_table_matches_classifier_over_input_space(table):
+    checked = 0
+    mismatches = []
+    for ctx in iter_input_space():
+        expected = classify_case(ctx)
+        for got in (table.classify(ctx), table.classify(_plain(ctx))):
+            if got != expected:
+                mismatches.append((_plain(ctx), expected, got))
+        checked += 1
+    assert checked == 6 * 6 * 6 * 4 * (1 << len(BOOL_INPUTS))
+    assert mismatches[:5] == []
+
+
+@pytest.mark.parametrize("ctx", [
+    {},
+    {"customer_type": None, "applicant_type": None},
+    {"customer_type": "UNKNOWN", "applicant_type": ApplicantType.EXTERNAL_PROXY.value},
+    {"customer_type": CustomerType.NON_PROFIT_CORP.value, "risk_flags": {"pep_sanction": True}},
+    {"customer_type": CustomerType.FOREIGN_CORP.value, "ubo_confirmable": False, "business_status": None},
+])
+def test_missing_and_unknown_values(table, ctx):
+    assert table.classify(ctx) == classify_case(ctx)
+
+
+def test_classify_many_and_columns_match_classify(table):
+    rng = random.Random(7)
+    contexts = [_plain(ctx) for ctx in iter_input_space() if rng.random() < 0.01]
+    expected = [table.classify(ctx) for ctx in contexts]
+    assert table.classify_many(contexts) == expected
+
+    columns = [
+        np.array([table.ordinal(dim, ctx) for ctx in contexts], dtype=np.int64)
+        for dim in range(len(DIMENSIONS))
+    ]
+    flags = np.array([table.index(ctx) & ((1 << table.flag_bits) - 1) for ctx in contexts], dtype=np.int64)
+    ids = table.classify_columns(*columns, flags)
+    assert [(code, list(tags)) for code, tags in (table.outcomes[i] for i in ids.tolist())] == expected
@@ -0,0 +1,24 @@
+"""정규 인코딩(`EncodedResult`) ↔ 기존 response_model 직렬화 경로 바이트 일치."""
+
+import json
+
+from app.engine.case_table import get_case_table
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import run_determination
+from app.engine.rule_compiler import CompiledRuleSet
+from scripts.bench_serialization import canonical_serialize, legacy_serialize
+from scripts.traffic import MIXES, SEED_DIR, load_seed_rules, sample_contexts
+
+
+def test_canonical_body_matches_response_model_bytes():
+    with open(SEED_DIR / "document_types.json", encoding="utf-8") as f:
+        catalog = DocumentCatalog(d["code"] for d in json.load(f))
+    rule_set = CompiledRuleSet(load_seed_rules(), adaptive=False, catalog=catalog)
+    table = get_case_table()
+    checked = 0
+    for mix in MIXES:
+        for ctx in sample_contexts(mix, 200):
+            result = run_determination(ctx, rule_set, table)
+            assert canonical_serialize(result)[0] == legacy_serialize(result)[0]
+            checked += 1
+    assert checked == 200 * len(MIXES)
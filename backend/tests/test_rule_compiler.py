@@ -0,0 +1,22 @@
+"""컴파일 룰셋(+ 서류 비트셋, 결과 타입) ↔ 기준 구현 적합성 — 고정 순서 / 적응형 재정렬."""
+
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import run_determination
+from app.engine.rule_compiler import CompiledRuleSet
+
+
+def test_compiled_ruleset_matches_reference(ruleset, corpus, corpus_mismatches):
+    rules, codes = ruleset
+    contexts, _ = corpus
+    rule_set = CompiledRuleSet(rules, adaptive=False, catalog=DocumentCatalog(codes))
+    results = [run_determination(ctx, rule_set) for ctx in contexts]
+    assert corpus_mismatches(results)[:5] == []
+
+
+def test_adaptive_reordering_keeps_results(ruleset, corpus, corpus_mismatches):
+    rules, codes = ruleset
+    contexts, _ = corpus
+    rule_set = CompiledRuleSet(rules, adaptive=True, reorder_interval=50, catalog=DocumentCatalog(codes))
+    for _ in range(2):  # 두 번째 바퀴는 관측 통계로 재정렬된 순서로 평가한다
+        results = [run_determination(ctx, rule_set) for ctx in contexts]
+        assert corpus_mismatches(results)[:5] == []
@@ -0,0 +1,56 @@
+"""룰 1건 부분 재컴파일(`replace_rule`) ↔ 전체 재컴파일 — 적합성 코퍼스 표본에서 판정·번들이 같아야 한다."""
+
+import copy
+import json
+import random
+
+from app.engine.bundle import build_bundle
+from app.engine.document_catalog import DocumentCatalog
+from app.engine.pipeline import run_determination
+from app.engine.rule_compiler import CompiledRuleSet
+from app.enums import AccountType, ApplicantType
+from scripts.conformance_corpus import encode_fields
+
+
+def _edit(rule: dict, rng: random.Random) -> dict:
+    rule = copy.deepcopy(rule)
+    rule["priority"] = rng.randrange(1, 500)
+    rule["conditions"] = {"all": [
+        {"field": "account_type", "eq": rng.choice(list(AccountType)).value},
+        {"field": "applicant_type", "neq": rng.choice(list(ApplicantType)).value},
+    ]}
+    return rule
+
+
+def test_incremental_rule_update_matches_full_rebuild(ruleset, corpus):
+    rules, codes = ruleset
+    contexts, _ = corpus
+    sample = contexts[::20]
+    rng = random.Random(11)
+    by_id = {r["id"]: r for r in rules}
+    current = CompiledRuleSet(rules, adaptive=False, catalog=DocumentCatalog(codes))
+    next_id = max(by_id) + 1
+
+    for step in range(12):
+        action = rng.choice(("edit", "edit", "delete", "create"))
+        if action == "create":
+            rule_id, next_id = next_id, next_id + 1
+            rule = _edit({**rng.choice(list(by_id.values())), "id": rule_id, "rule_name": f"new #{rule_id}"}, rng)
+        else:
+            rule_id = rng.choice(sorted(by_id))
+            rule = _edit(by_id[rule_id], rng) if action == "edit" else None
+        if rule is None:
+            del by_id[rule_id]
+        else:
+            by_id[rule_id] = rule
+
+        current = current.replace_rule(rule_id, rule)
+        rebuilt = CompiledRuleSet(sorted(by_id.values(), key=lambda r: r["id"]), adaptive=False,
+                                  catalog=DocumentCatalog(codes))
+        assert current.version == rebuilt.version, (step, action, rule_id)
+        assert [r.rule["id"] for r in current.rules] == [r.rule["id"] for r in rebuilt.rules]
+        got = [encode_fields(run_determination(ctx, current)) for ctx in sample]
+        want = [encode_fields(run_determination(ctx, rebuilt)) for ctx in sample]
+        assert got == want, (step, action, rule_id)
+
+    assert json.dumps(build_bundle(current)) == json.dumps(build_bundle(rebuilt))
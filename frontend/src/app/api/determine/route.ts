@@ -2,7 +2,22 @@ import { NextRequest, NextResponse } from "next/server";
 import { classifyCase } from "@/lib/engine/caseClassifier";
 import { evaluateRules, compileDetermination } from "@/lib/engine/ruleEngine";
 import { resolveDocuments } from "@/lib/engine/documentResolver";
-import { rules } from "@/lib/engine/seedData";
+import { documentTypes, rules } from "@/lib/engine/seedData";
+
+// 서류는 카탈로그(DocumentType 마스터 id) 순서로 렌더링한다 — 백엔드 DocumentCatalog · 번들 판정과 같은 순서.
+// 마스터에 없는 코드(룰에만 등장)는 처음 나온 순서대로 뒤에 둔다.
+const catalogIndex = new Map(
+    [...documentTypes].sort((a, b) => a.id - b.id).map((d, i) => [d.code, i] as const)
+);
+
+function catalogOrder(codes: Iterable<string>): string[] {
+    const unique = [...new Set(codes)];
+    const rank = (code: string, i: number) => catalogIndex.get(code) ?? catalogIndex.size + i;
+    return unique
+        .map((code, i) => [rank(code, i), code] as const)
+        .sort((a, b) => a[0] - b[0])
+        .map(([, code]) => code);
+}
 
 export async function POST(req: NextRequest) {
     try {
@@ -34,9 +49,9 @@ export async function POST(req: NextRequest) {
         const docPkg = resolveDocuments(caseCode, tags, context.account_type);
 
         // Merge
-        const mergedRequired = [...new Set([...result.requiredDocuments, ...docPkg.required])];
+        const mergedRequired = catalogOrder([...result.requiredDocuments, ...docPkg.required]);
         const reqSet = new Set(mergedRequired);
-        const mergedOptional = [...new Set([...result.optionalDocuments, ...docPkg.conditional])].filter(
+        const mergedOptional = catalogOrder([...result.optionalDocuments, ...docPkg.conditional]).filter(
             d => !reqSet.has(d)
         );
         const mergedExplanations = [...new Set([...result.explanations, ...docPkg.explanations])];
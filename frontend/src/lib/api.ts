@@ -1,3 +1,5 @@
+import { determineFromBundle, loadBundle } from "@/lib/engine/bundle";
+
 export interface RiskFlags {
   high_risk_country: boolean;
   pep_sanction: boolean;
@@ -46,6 +48,11 @@ export interface DeterminationResult {
 }
 
 export async function determine(input: DeterminationInput): Promise<DeterminationResult> {
+  // 사전 계산 번들이 있으면 로컬에서 판정 (네트워크 왕복 없음)
+  const bundle = await loadBundle();
+  const local = bundle && determineFromBundle(bundle, input);
+  if (local) return local;
+
   const res = await fetch("/api/determine", {
     method: "POST",
     headers: { "Content-Type": "application/json" },
@@ -0,0 +1,212 @@
+// Determination Bundle — §11
+// 백엔드가 룰셋 버전마다 내보내는 사전 계산 번들로 네트워크 없이 판정한다.
+// 번들 형식은 backend/app/engine/bundle.py 참고. 응답 ETag 로 캐시를 갱신한다.
+
+import type { DeterminationInput, DeterminationResult } from "@/lib/api";
+
+export interface BundleRule {
+    name: number;
+    fields: number[];
+    truth: string;
+    required: number[];
+    optional: number[];
+    blocked: boolean;
+    escalate: boolean;
+    status: string | null;
+    tags: number[];
+    explanation: number | null;
+}
+
+export interface BundlePackage {
+    required: number[];
+    conditional: number[];
+    groups: { code: string; documents: number[]; min_required: number; description: number }[];
+    explanations: number[];
+}
+
+export interface DeterminationBundle {
+    format: number;
+    version: string;
+    rule_set_version: string;
+    fields: { name: string; values: (string | boolean)[] }[];
+    documents: string[];
+    texts: string[];
+    tags: string[];
+    status_priority: Record<string, number>;
+    cases: {
+        dimensions: number[];
+        radices: number[];
+        flags: { bit: number; field: string; negate: boolean }[];
+        flag_bits: number;
+        outcomes: [string, number[]][];
+        table: number[];
+    };
+    rules: BundleRule[];
+    packages: BundlePackage[];
+    package_table: number[];
+}
+
+const SUPPORTED_FORMAT = 1;
+const CACHE_KEY = "determination-bundle";
+
+export const BUNDLE_URL = process.env.NEXT_PUBLIC_DETERMINATION_BUNDLE_URL || "/determination-bundle.json";
+
+function resolveField(input: Record<string, any>, fieldPath: string): any {
+    let obj: any = input;
+    for (const part of fieldPath.split(".")) {
+        if (obj && typeof obj === "object") {
+            obj = obj[part];
+        } else {
+            return undefined;
+        }
+    }
+    return obj;
+}
+
+function unique<T>(values: T[]): T[] {
+    return [...new Set(values)];
+}
+
+/**
+ * 번들로 판정한다. 입력 값이 번들의 값 범위 밖이면 null (서버 판정으로 넘긴다).
+ * 백엔드 run_determination 과 같은 순서로 합친다: 케이스 분류 → 룰 → 서류 패키지 병합.
+ */
+export function determineFromBundle(bundle: DeterminationBundle, input: DeterminationInput): DeterminationResult | null {
+    const ordinals: number[] = [];
+    for (const field of bundle.fields) {
+        const ordinal = field.values.indexOf(resolveField(input, field.name));
+        if (ordinal < 0) return null;
+        ordinals.push(ordinal);
+    }
+
+    // 1. 케이스 분류 — 차원 서수 × 플래그 마스크
+    const cases = bundle.cases;
+    let index = 0;
+    cases.dimensions.forEach((field, d) => {
+        index = index * cases.radices[d] + ordinals[field];
+    });
+    let mask = 0;
+    for (const flag of cases.flags) {
+        const value = resolveField(input, flag.field);
+        if (value === undefined) continue;
+        if (flag.negate ? !value : !!value) mask |= 1 << flag.bit;
+    }
+    const outcomeId = cases.table[index * (1 << cases.flag_bits) + mask];
+    const [caseCode, caseTagIds] = cases.outcomes[outcomeId];
+
+    // 2. 룰 — 참조 필드 서수로 진리표 조회 (우선순위 순)
+    const higher = (current: string, incoming: string) =>
+        (bundle.status_priority[incoming] ?? 0) > (bundle.status_priority[current] ?? 0) ? incoming : current;
+    const required = new Set<number>();
+    const optional = new Set<number>();
+    const explanations: string[] = [];
+    const matchedRules: string[] = [];
+    const extraTags: string[] = [];
+    let status = "READY_FOR_REVIEW";
+    let blocked = false;
+    let escalate = false;
+    for (const rule of bundle.rules) {
+        let k = 0;
+        for (const f of rule.fields) k = k * bundle.fields[f].values.length + ordinals[f];
+        if (rule.truth[k] !== "1") continue;
+        rule.required.forEach(d => required.add(d));
+        rule.optional.forEach(d => optional.add(d));
+        if (rule.blocked) blocked = true;
+        if (rule.escalate) escalate = true;
+        if (rule.explanation !== null) explanations.push(bundle.texts[rule.explanation]);
+        matchedRules.push(bundle.texts[rule.name]);
+        rule.tags.forEach(t => extraTags.push(bundle.tags[t]));
+        if (rule.status) status = higher(status, rule.status);
+    }
+    if (blocked) {
+        status = "BLOCKED";
+    } else if (escalate) {
+        status = higher(status, "ESCALATION_REQUIRED");
+    }
+
+    // 3. 서류 패키지 병합 — 사전 인덱스 순서가 카탈로그 순서
+    const accountField = bundle.fields.findIndex(f => f.name === "account_type");
+    const accounts = bundle.fields[accountField].values.length;
+    const pkg = bundle.packages[bundle.package_table[outcomeId * accounts + ordinals[accountField]]];
+    pkg.required.forEach(d => required.add(d));
+    pkg.conditional.forEach(d => optional.add(d));
+    const render = (ids: Iterable<number>) => [...ids].sort((a, b) => a - b).map(d => bundle.documents[d]);
+    const packageExplanations = pkg.explanations.map(t => bundle.texts[t]);
+    const caseTags = caseTagIds.map(t => bundle.tags[t]);
+
+    return {
+        case_code: caseCode,
+        case_tags: extraTags.length ? unique([...caseTags, ...extraTags]) : caseTags,
+        status,
+        required_documents: render(required),
+        optional_documents: render([...optional].filter(d => !required.has(d))),
+        document_groups: pkg.groups.map(g => ({
+            group_code: g.code,
+            documents: g.documents.map(d => bundle.documents[d]),
+            min_required: g.min_required,
+            description: bundle.texts[g.description],
+        })),
+        blocked,
+        escalate,
+        explanations: explanations.length ? unique([...explanations, ...packageExplanations]) : packageExplanations,
+        matched_rules: matchedRules,
+    };
+}
+
+// ── 로드 / 캐시 ──
+// localStorage 에 (ETag, 번들) 을 두고 If-None-Match 로 갱신만 확인한다.
+// 네트워크가 없으면 마지막 번들을 쓴다.
+
+interface CachedBundle {
+    etag: string | null;
+    bundle: DeterminationBundle;
+}
+
+let loaded: Promise<DeterminationBundle | null> | null = null;
+
+function readCache(): CachedBundle | null {
+    try {
+        const raw = localStorage.getItem(CACHE_KEY);
+        const cached = raw ? (JSON.parse(raw) as CachedBundle) : null;
+        return cached && cached.bundle.format === SUPPORTED_FORMAT ? cached : null;
+    } catch {
+        return null;
+    }
+}
+
+function writeCache(entry: CachedBundle) {
+    try {
+        localStorage.setItem(CACHE_KEY, JSON.stringify(entry));
+    } catch {
+        // 저장 공간 부족 — 이번 세션에서만 쓴다
+    }
+}
+
+async function fetchBundle(url: string): Promise<DeterminationBundle | null> {
+    const cached = typeof localStorage === "undefined" ? null : readCache();
+    try {
+        const res = await fetch(url, {
+            cache: "no-cache",
+            headers: cached?.etag ? { "If-None-Match": cached.etag } : {},
+        });
+        if (res.status === 304 && cached) return cached.bundle;
+        if (res.ok) {
+            const bundle = (await res.json()) as DeterminationBundle;
+            if (bundle.format === SUPPORTED_FORMAT) {
+                if (bundle.version !== cached?.bundle.version || res.headers.get("ETag") !== cached?.etag) {
+                    writeCache({ etag: res.headers.get("ETag"), bundle });
+                }
+                return bundle;
+            }
+        }
+    } catch {
+        // 오프라인
+    }
+    return cached?.bundle ?? null;
+}
+
+/** 페이지 수명 동안 한 번 로드한다. 번들을 쓸 수 없으면 null. */
+export function loadBundle(url: string = BUNDLE_URL): Promise<DeterminationBundle | null> {
+    if (!loaded) loaded = fetchBundle(url);
+    return loaded;
+}